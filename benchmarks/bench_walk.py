@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark the directory walk: legacy os.walk pruning vs scan_project, serial, threaded
+and reusing the listings of a saved directory snapshot.
+
+  python benchmarks/bench_walk.py                       # synthetic tree, local disk
+  python benchmarks/bench_walk.py --latency-ms 2        # emulate an NFS/FUSE round trip per listing
+  python benchmarks/bench_walk.py /path/to/project --threads 1 4 16
+
+Local disks answer listings from the page cache, so threads mostly add overhead there;
+the latency option shows the case the threaded walk is meant for.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from projectdump.cache import load_listing_snapshot, save_listing_snapshot  # noqa: E402
+from projectdump.filters import ExcludeMatcher, get_exclude_patterns, should_exclude_path  # noqa: E402
+from projectdump.scanner import ListingCache, scan_project  # noqa: E402
+
+
+def make_tree(root, dirs_per_level, depth, files_per_dir):
+    """Create a synthetic tree of dirs_per_level ** depth leaf directories"""
+    def fill(path, level):
+        for i in range(files_per_dir):
+            with open(os.path.join(path, f"file{i}.py"), 'w') as f:
+                f.write("x = 1\n")
+        if level < depth:
+            for i in range(dirs_per_level):
+                sub = os.path.join(path, f"dir{i}")
+                os.mkdir(sub)
+                fill(sub, level + 1)
+    fill(root, 0)
+    # Directories modified in the last seconds are left out of snapshots, age them
+    old = time.time() - 60
+    for path, _, _ in os.walk(root):
+        os.utime(path, (old, old))
+
+
+def legacy_walk(project_path, exclude_dirs):
+    """The serial os.walk loop the aggregator used before scan_project"""
+    count = 0
+    for root, dirs, files in os.walk(project_path, topdown=True):
+        dirs[:] = [d for d in dirs if not should_exclude_path(os.path.relpath(os.path.join(root, d), project_path), exclude_dirs)]
+        count += len(files)
+    return count
+
+
+def emulate_latency(latency_ms):
+    """Make every directory listing pay a simulated network round trip"""
+    real_scandir = os.scandir
+
+    def slow_scandir(path='.'):
+        time.sleep(latency_ms / 1000.0)
+        return real_scandir(path)
+
+    os.scandir = slow_scandir
+
+
+def timed(label, func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best * 1000:>10.1f} ms")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('project_path', nargs='?', help='Tree to walk (default: a synthetic tree)')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4, 16])
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated latency per directory listing')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Keep the benchmark's snapshot out of the user's cache
+        os.environ['PROJECTDUMP_CACHE_DIR'] = os.path.join(tmp, 'cache')
+        project_path = args.project_path
+        if not project_path:
+            project_path = os.path.join(tmp, 'tree')
+            os.mkdir(project_path)
+            make_tree(project_path, dirs_per_level=6, depth=4, files_per_dir=5)
+        project_path = os.path.abspath(project_path)
+
+        if args.latency_ms:
+            emulate_latency(args.latency_ms)
+
+        exclude_dirs, exclude_files = get_exclude_patterns(project_path)
+        matcher = ExcludeMatcher(exclude_dirs, exclude_files)
+        dir_count = len(scan_project(project_path, matcher))
+        print(f"Walking {project_path}: {dir_count} directories, latency {args.latency_ms} ms/listing")
+
+        # os.walk lists directories through os.scandir too, so it pays the same simulated latency
+        baseline = timed("legacy os.walk", lambda: legacy_walk(project_path, exclude_dirs), args.repeat)
+        for threads in args.threads:
+            elapsed = timed(f"scan_project threads={threads}",
+                            lambda: scan_project(project_path, matcher, workers=threads), args.repeat)
+            print(f"{'':<28} {baseline / elapsed:>10.2f}x vs legacy")
+
+        listings = ListingCache()
+        scan_project(project_path, matcher, listings)
+        save_listing_snapshot(project_path, listings)
+        elapsed = timed("snapshot load + rescan",
+                        lambda: scan_project(project_path, matcher, load_listing_snapshot(project_path)), args.repeat)
+        print(f"{'':<28} {baseline / elapsed:>10.2f}x vs legacy")
+
+
+if __name__ == "__main__":
+    main()
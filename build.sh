@@ -34,6 +34,16 @@ pip install -e .
 echo "🧹 Cleaning previous builds..."
 rm -rf build/ dist/ *.spec
 
+# Generate the single-file script the binary is built from
+echo "📄 Generating single-file script..."
+python tools/build_single_file.py -o dist/projectdump_onefile.py
+
+# The modules are imported from memory by the script: list what they import for PyInstaller
+HIDDEN_IMPORTS=()
+for module in $(python tools/build_single_file.py --hidden-imports); do
+    HIDDEN_IMPORTS+=(--hidden-import "$module")
+done
+
 # Create the binary
 echo "🔨 Building binary with PyInstaller..."
 pyinstaller \
@@ -42,7 +52,8 @@ pyinstaller \
     --console \
     --clean \
     --noconfirm \
-    projectdump/cli.py
+    "${HIDDEN_IMPORTS[@]}" \
+    dist/projectdump_onefile.py
 
 # Check if build was successful
 if [ -f "dist/projectdump" ]; then
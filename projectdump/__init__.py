@@ -6,22 +6,35 @@ __version__ = "1.0.1"
 __author__ = "Henry Vo"
 __email__ = "levuthanhtung11@gmail.com"
 
-from projectdump.aggregator import aggregate_code
-from projectdump.detector import detect_project_tech, get_extensions_by_tech
-from projectdump.tree_generator import generate_directory_tree
-from projectdump.filters import get_essential_files, get_exclude_patterns, should_exclude_path, should_exclude_file
-from projectdump.constants import MAX_FILE_SIZE, TEXT_VI, TEXT_EN
-
-__all__ = [
-    'aggregate_code',
-    'detect_project_tech',
-    'get_extensions_by_tech',
-    'generate_directory_tree',
-    'get_essential_files',
-    'get_exclude_patterns',
-    'should_exclude_path',
-    'should_exclude_file',
-    'MAX_FILE_SIZE',
-    'TEXT_VI',
-    'TEXT_EN',
-]
\ No newline at end of file
+import importlib
+
+# Public names and the submodule defining them. They are imported on first access so
+# `import projectdump.cli` (and `projectdump --version`) doesn't load the dump engine.
+_LAZY_EXPORTS = {
+    'aggregate_code': 'aggregator',
+    'detect_project_tech': 'detector',
+    'get_extensions_by_tech': 'detector',
+    'generate_directory_tree': 'tree_generator',
+    'get_essential_files': 'filters',
+    'get_exclude_patterns': 'filters',
+    'should_exclude_path': 'filters',
+    'should_exclude_file': 'filters',
+    'MAX_FILE_SIZE': 'constants',
+    'TEXT_VI': 'constants',
+    'TEXT_EN': 'constants',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module('projectdump.' + module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,21 +1,351 @@
+import contextlib
+import json
 import os
+import time
+from projectdump.cache import (detect_project_tech_cached, load_listing_snapshot, load_outline_cache, read_text_file,
+                               save_listing_snapshot, save_outline_cache)
 from projectdump.constants import MAX_FILE_SIZE
-from projectdump.detector import detect_project_tech, get_extensions_by_tech
-from projectdump.filters import get_essential_files, get_exclude_patterns, should_exclude_path, should_exclude_file
-from projectdump.tree_generator import generate_directory_tree
+from projectdump.artifacts import drop_own_artifacts, is_own_artifact, output_file_ids
+from projectdump.closure import resolve_closure
+from projectdump.checkpoint import (CHECKPOINT_INTERVAL, checkpoint_path_for, journal_path_for, load_checkpoint,
+                                    read_journal, remove_checkpoint, save_checkpoint, tree_order_key)
+from projectdump.emit import EmitSpec, check_emit_paths, emit_spec_to_json
+from projectdump.detector import detect_tech_from_paths, get_extensions_by_tech
+from projectdump.filters import (AnyExcludeMatcher, ExcludeMatcher, IncludeMatcher, get_exclude_patterns, is_target_file,
+                                 read_dumpignore)
+from projectdump.scanner import ListingCache, iter_scan_files, scan_project
+from projectdump.tree_generator import generate_tree_from_paths, generate_tree_from_scan
+from projectdump.generated import SNIFF_BYTES, SNIFF_READ_THRESHOLD, generated_by_content, generated_by_name, read_head
+from projectdump.notebook import NOTEBOOK_EXTENSION, NotebookError, notebook_to_source
+from projectdump.outline import can_outline
+from projectdump.redact import redact_secrets
+from projectdump.strip import strip_content
+from projectdump.writers import create_writer
+from projectdump.dump_index import index_path_for, write_index
 from pathlib import Path
 
-def aggregate_code(project_path, text, output_filename="source_dump.txt"):
-    """Main function to aggregate project source code"""
+# Files named in the summary when some are dropped or skipped, the rest are only counted
+MAX_LISTED_FILES = 20
+
+def _iter_listed_files(project_path, rel_paths, matcher, include=None):
+    """Yield (filename, file_path, rel_path, entry) for an explicit file list, applying the exclusions"""
+    for rel_path in rel_paths:
+        if include is not None and not include.match(rel_path):
+            continue
+        rel_dir, file = os.path.split(rel_path)
+        if rel_dir and matcher.exclude_dir(rel_dir):
+            continue
+        if matcher.exclude_file(file, rel_path):
+            continue
+        yield file, os.path.join(project_path, rel_path), rel_path, None
+
+def _generated_reason(text, kind, detail):
+    if kind == 'name':
+        return text['generated_name'].format(pattern=detail)
+    if kind == 'header':
+        return text['generated_header'].format(marker=detail)
+    return text['generated_minified'].format(avg=detail[0], max=detail[1])
+
+def _print_file_list(text, files):
+    for rel_path, detail in files[:MAX_LISTED_FILES]:
+        print(text['listed_file'].format(file=rel_path, detail=detail))
+    if len(files) > MAX_LISTED_FILES:
+        print(text['listed_more'].format(count=len(files) - MAX_LISTED_FILES))
+
+def _inherit(value, default):
+    return default if value is None else value
+
+def _transform(content, lang_hint, strip, redact):
+    """Apply the strip/redact options of an output: (content, stripped chars, redactions per rule)"""
+    stripped_chars = 0
+    redactions = {}
+    if strip:
+        original_length = len(content)
+        content = strip_content(content, lang_hint, strip)
+        stripped_chars = original_length - len(content)
+    if redact:
+        content = redact_secrets(content, redactions)
+    return content, stripped_chars, redactions
+
+class _DumpOutput:
+    """One dump being written (an --emit target): its writer, budget, index entries and summary counters"""
+
+    # Summary counters saved in checkpoints
+    COUNTERS = ('file_count', 'total_size', 'stripped_chars', 'redactions', 'dropped_files', 'dropped_notes')
+
+    def __init__(self, project_path, spec):
+        self.spec = spec
+        self.path = os.path.join(project_path, spec.path)
+        self.output_format = spec.output_format
+        self.max_output_bytes = spec.max_output_bytes
+        self.strip = spec.strip
+        self.redact = spec.redact
+        self.writer = None
+        self.journal = None
+        self.index_path = None
+        self.index_entries = []
+        self.file_count = 0
+        self.total_size = 0
+        self.stripped_chars = 0
+        self.redactions = {}  # rule -> count
+        self.dropped_files = []  # (rel_path, size) of files left out to respect max_output_bytes
+        self.dropped_notes = 0  # read error and skipped file sections left out to respect max_output_bytes
+
+    def open(self, stack, project_path, detected_techs, tree, state=None):
+        """Start the dump, or with a checkpoint state truncate it to its last complete section and go on"""
+        journal_path = journal_path_for(self.path)
+        if state is None:
+            self.writer = create_writer(self.output_format, stack.enter_context(open(self.path, 'wb')))
+            self.journal = stack.enter_context(open(journal_path, 'wb'))
+            self.writer.write_header(project_path, detected_techs, tree)
+            return
+
+        out = stack.enter_context(open(self.path, 'r+b'))
+        out.truncate(state['writer']['offset'])
+        out.seek(0, os.SEEK_END)
+        self.writer = create_writer(self.output_format, out)
+        self.writer.restore_state(state['writer'])
+        self.index_entries = read_journal(journal_path, state['journal_offset'])
+        self.journal = stack.enter_context(open(journal_path, 'r+b'))
+        self.journal.truncate(state['journal_offset'])
+        self.journal.seek(0, os.SEEK_END)
+        for key in self.COUNTERS:
+            setattr(self, key, state[key])
+        self.dropped_files = [tuple(item) for item in self.dropped_files]
+
+    def checkpoint_state(self):
+        """Flush the dump and its index journal to disk and return what resuming needs"""
+        for f in (self.writer.f, self.journal):
+            f.flush()
+            os.fsync(f.fileno())
+        state = {key: getattr(self, key) for key in self.COUNTERS}
+        state.update(writer=self.writer.checkpoint_state(), journal_offset=self.journal.tell())
+        return state
+
+    def plan(self, rel_path, lang_hint, file_size, shrinks):
+        """
+        Whether the file may fit in the remaining budget, planned from its scanned size.
+        A file that cannot fit is dropped here, before anything reads it.
+        shrinks tells that the file is converted (notebook) or outlined before being written.
+        """
+        if self.max_output_bytes is None:
+            return True
+        # Stripping, redaction, notebook conversion and outlines shrink a file, its size on disk is not a lower bound then
+        shrinks = shrinks or self.strip or self.redact
+        planned = self.writer.section_size(rel_path, lang_hint, '') + (0 if shrinks else file_size)
+        if self.writer.offset + planned > self.max_output_bytes:
+            self.dropped_files.append((rel_path, file_size))
+            return False
+        return True
+
+    def _fits(self, size_method, *args):
+        """Whether the section measured by size_method(*args) fits, only measured when the dump is capped"""
+        return self.max_output_bytes is None or self.writer.offset + size_method(*args) <= self.max_output_bytes
+
+    def add_file(self, rel_path, lang_hint, file_size, outlined, content, stripped_chars, redactions):
+        if not self._fits(self.writer.section_size, rel_path, lang_hint, content, outlined):
+            self.dropped_files.append((rel_path, file_size))
+            return
+        index_entry = self.writer.write_file(rel_path, lang_hint, content, outlined)
+        self.index_entries.append((rel_path,) + index_entry)
+        self.journal.write((json.dumps((rel_path,) + index_entry, ensure_ascii=False) + '\n').encode('utf-8'))
+        self.file_count += 1
+        self.total_size += len(content) # Use actual content length for total_size
+        self.stripped_chars += stripped_chars
+        for rule, count in redactions.items():
+            self.redactions[rule] = self.redactions.get(rule, 0) + count
+
+    def add_error(self, rel_path, error):
+        if not self._fits(self.writer.error_size, rel_path, error):
+            self.dropped_notes += 1
+            return
+        self.writer.write_error(rel_path, error)
+
+    def add_skipped(self, rel_path, reason):
+        if not self._fits(self.writer.skipped_size, rel_path, reason):
+            self.dropped_notes += 1
+            return
+        self.writer.write_skipped(rel_path, reason)
+
+    def write_index(self):
+        """Write the sidecar index, once the dump file is closed"""
+        self.index_path = write_index(self.path, self.output_format, self.index_entries)
+        remove_checkpoint(self.path)
+
+    def print_summary(self, text):
+        print("")
+        print(text['success'] + self.path)
+        print(text['index_written'] + self.index_path)
+        print("")
+        print(text['summary'])
+        print(text['file_count'].format(count=self.file_count))
+        # Use written char count for output size, total_size for ~KB (sum of read content)
+        print(text['size'].format(size=self.writer.char_count, kb=self.total_size // 1024))
+        print(text['line_count'].format(lines=self.writer.line_count))
+        if self.strip:
+            read_chars = self.total_size + self.stripped_chars
+            percent = 100 * self.stripped_chars // read_chars if read_chars else 0
+            print(text['stripped'].format(chars=self.stripped_chars, percent=percent))
+        if self.redact:
+            rules = ', '.join(f"{rule}: {count}" for rule, count in sorted(self.redactions.items()))
+            print(text['redacted'].format(count=sum(self.redactions.values()), rules=rules or '-'))
+        if self.dropped_files:
+            print(text['dropped'].format(count=len(self.dropped_files),
+                                         size=sum(size for _, size in self.dropped_files), limit=self.max_output_bytes))
+            _print_file_list(text, [(rel_path, text['bytes'].format(size=size)) for rel_path, size in self.dropped_files])
+        if self.dropped_notes:
+            print(text['dropped_notes'].format(count=self.dropped_notes, limit=self.max_output_bytes))
+
+def _load_resume_state(dump_path, options, outputs, changed_files):
+    """Return (checkpoint state, None) if the dump can be resumed, else (None, text key of the reason)"""
+    if changed_files is not None:
+        return None, 'resume_diff_mode'
+    state = load_checkpoint(dump_path)
+    if state is None:
+        return None, 'resume_missing'
+    if any(state.get(key) != value for key, value in options.items()):
+        return None, 'resume_options'
+    for output, output_state in zip(outputs, state['outputs']):
+        try:
+            if (os.path.getsize(output.path) < output_state['writer']['offset']
+                    or os.path.getsize(journal_path_for(output.path)) < output_state['journal_offset']):
+                return None, 'resume_missing'
+        except OSError:
+            return None, 'resume_missing'
+    return state, None
+
+def _get_lang_hint(file, file_ext_with_dot):
+    """Determine language hint for markdown code block"""
+    lang_hint = file_ext_with_dot[1:] if file_ext_with_dot else Path(file).stem.lower()
+    if lang_hint == "dockerfile": # common case
+        lang_hint = "dockerfile"
+    elif not lang_hint: # if still no hint (e.g. file is 'Makefile' -> stem is 'makefile')
+        if file.lower() == 'makefile':
+            lang_hint = 'makefile'
+        # Add other common full filename hints if needed
+    return lang_hint
+
+def aggregate_code(project_path, text, output_filename="source_dump.txt", changed_files=None, output_format="text",
+                   cache=None, redetect=False, follow_symlinks=False, walk_threads=1, strip=None,
+                   include=None, max_output_bytes=None, rescan=False, notebook_markdown=False,
+                   generated='skip', redact=False, emit=None, resume=False, prune_dirs=None, entries=None,
+                   outline=None, project_root=None):
+    """
+    Main function to aggregate project source code.
+    When changed_files (project-relative paths) is given, only those files are dumped
+    and the directory tree is restricted to them, so the project is never walked.
+    output_format is one of writers.OUTPUT_FORMATS ('text' or 'jsonl').
+    cache is an optional cache.ProjectCache reused across dumps of the same project (server mode).
+    Tech detection results are cached per project; redetect forces a fresh detection.
+    follow_symlinks descends into symlinked directories (loops are broken); hardlinked or
+    symlinked copies of a file are dumped once either way.
+    walk_threads > 1 lists directories concurrently (useful on network file systems).
+    strip is a set of strip.STRIP_OPTIONS applied to every file as it is read.
+    include is a list of globs: only their literal prefixes are walked and only matching
+    files are dumped; techs are then detected from the included files alone.
+    max_output_bytes caps the dump size. Files are planned from their scanned size, so a
+    file that cannot fit in the remaining budget is dropped without being opened; the
+    dropped files are listed in the summary.
+    Without a cache, directory listings are reused from the snapshot saved by the previous
+    run whenever the directory mtime is unchanged; rescan lists every directory again.
+    Jupyter notebooks are reduced to their code cells (plus markdown cells with
+    notebook_markdown); outputs and metadata are never written.
+    Generated and minified files (by name, generator header or line lengths of their first
+    block) are skipped, replaced by a one line section (generated='summary') or dumped
+    (generated='keep'); large files are sniffed before being read in full.
+    redact replaces secrets (keys, tokens, private key blocks, high entropy values assigned
+    to password/secret/token names) by `[REDACTED:<rule>]` before a file is written.
+    emit is a list of emit.EmitSpec written from the same read pass instead of
+    output_filename: each file is read and decoded once, then fanned out to one writer per
+    spec with its own format, strip/redact options and max_output_bytes (None options
+    take the values given for the whole dump). Raises ValueError if two of them would write
+    the same file (emit.check_emit_paths).
+    A checkpoint (last completed path in tree order, output offsets and counters) is saved
+    every CHECKPOINT_INTERVAL seconds next to the first output, and the index entries are
+    journaled as they are written. resume truncates the outputs to the checkpoint and
+    continues after its path instead of starting over; both are removed once the dump is
+    complete.
+    prune_dirs lists project-relative directories left out entirely (the nested packages of
+    a package dumped with packages.split_packages).
+    project_root is the project project_path is a package of: the patterns of its
+    .dumpignore apply too, matched against paths relative to project_root.
+    entries lists entry files (project-relative or absolute): only the files they import,
+    directly or not, are read and dumped (closure.resolve_closure), and the directory tree
+    is restricted to them like for changed_files.
+    outline (a size in bytes, 0 for every file) replaces the content of the files at least
+    that large by their outline: docstring, imports, signatures and constants
+    (outline.outline_content), for the languages outline.can_outline supports; files with
+    nothing to outline (scripts, config objects) are kept in full. Outlines
+    are cached by content hash (in the cache in server mode, else persisted per project).
+    """
     if not os.path.isdir(project_path):
         print(text['not_found'].format(path=project_path))
         return False
+    if emit:
+        check_emit_paths(project_path, emit)
 
     print(text['analyzing'] + project_path)
     print(text['scanning'])
 
+    # Pass project_path to get_exclude_patterns to load .dumpignore
+    if cache is not None:
+        exclude_dirs, exclude_files, matcher = cache.get_exclude_patterns()
+    else:
+        exclude_dirs, exclude_files = get_exclude_patterns(project_path)
+        matcher = ExcludeMatcher(exclude_dirs, exclude_files)
+    if prune_dirs:
+        matcher = ExcludeMatcher(exclude_dirs, exclude_files, prune_dirs)
+    if project_root is not None:
+        root_dirs, root_files = read_dumpignore(project_root)
+        if root_dirs or root_files:
+            root_matcher = ExcludeMatcher(root_dirs, root_files, base=os.path.relpath(project_path, project_root))
+            matcher = AnyExcludeMatcher([matcher, root_matcher])
+
+    include_matcher = IncludeMatcher(include) if include else None
+    scan = None
+    raw_listings = {}
+    listed_files = changed_files
+    if entries:
+        entries = [os.path.relpath(os.path.join(project_path, entry), project_path) for entry in entries]
+        missing = [entry for entry in entries
+                   if entry.startswith(os.pardir + os.sep) or not os.path.isfile(os.path.join(project_path, entry))]
+        if missing:
+            print(text['entry_missing'].format(files=', '.join(missing)))
+            return False
+        listed_files = resolve_closure(project_path, entries, matcher)
+        print(text['entry_closure'].format(count=len(listed_files), entries=len(entries)))
+    if listed_files is not None:
+        # The tree only shows the affected files, so the listed candidates are materialized once
+        candidate_files = list(_iter_listed_files(project_path, listed_files, matcher, include_matcher))
+    else:
+        # A single walk feeds both the directory tree and the file contents
+        if cache is not None:
+            listings = cache.listings
+        else:
+            listings = ListingCache() if rescan else load_listing_snapshot(project_path)
+        scan = scan_project(project_path, matcher, listings, raw_listings,
+                            follow_symlinks=follow_symlinks, workers=walk_threads, include=include_matcher)
+        candidate_files = iter_scan_files(project_path, scan)
+        if cache is None:
+            if listings.hits:
+                print(text['snapshot_reused'].format(hits=listings.hits, total=listings.hits + listings.misses))
+            save_listing_snapshot(project_path, listings, keep_untouched=include_matcher is not None)
+
     # Detect tech
-    detected_techs = detect_project_tech(project_path)
+    if listed_files is not None:
+        if changed_files is not None:
+            print(text['diff_mode'].format(count=len(changed_files)))
+        detected_techs = detect_tech_from_paths(project_path, listed_files)
+    elif include_matcher is not None or prune_dirs:
+        # A full detection walk would list the parts of the tree the include scope (or pruning) avoids
+        included_paths = [rel_path for _, _, rel_path, _ in iter_scan_files(project_path, scan)]
+        detected_techs = detect_tech_from_paths(project_path, included_paths)
+    elif cache is not None:
+        detected_techs = cache.detect_tech(raw_listings, redetect)
+    else:
+        detected_techs, from_cache = detect_project_tech_cached(project_path, raw_listings, redetect)
+        if from_cache:
+            print(text['tech_cached'])
     target_extensions = set() # Initialize
 
     if detected_techs:
@@ -30,124 +360,212 @@ def aggregate_code(project_path, text, output_filename="source_dump.txt"):
         # If no tech detected, target_extensions remains empty.
         # Logic below will handle including files not explicitly excluded.
 
-    # Pass project_path to get_exclude_patterns to load .dumpignore
-    exclude_dirs, exclude_files = get_exclude_patterns(project_path)
+    if emit:
+        specs = [spec._replace(max_output_bytes=_inherit(spec.max_output_bytes, max_output_bytes),
+                               strip=_inherit(spec.strip, strip), redact=_inherit(spec.redact, redact))
+                 for spec in emit]
+    else:
+        specs = [EmitSpec(output_format, output_filename, max_output_bytes, strip, redact)]
+    outputs = [_DumpOutput(project_path, spec) for spec in specs]
+    own_outputs = {os.path.abspath(checkpoint_path_for(outputs[0].path))}
+    for output in outputs:
+        own_outputs |= {os.path.abspath(output.path), os.path.abspath(index_path_for(output.path)),
+                        os.path.abspath(journal_path_for(output.path))}
+    # A checkpoint is only resumed by the very same dump: same outputs, same file set, same tree
+    options = {'project_path': project_path, 'specs': [emit_spec_to_json(output.spec) for output in outputs],
+               'notebook_markdown': notebook_markdown, 'generated': generated, 'listed_files': listed_files,
+               'outline': outline, 'include': list(include) if include else None, 'follow_symlinks': follow_symlinks,
+               'prune_dirs': sorted(prune_dirs) if prune_dirs else None, 'project_root': project_root}
+    resume_state = None
+    if resume:
+        resume_state, reason = _load_resume_state(outputs[0].path, options, outputs, changed_files)
+        if reason:
+            print(text['resume_unusable'].format(reason=text[reason]))
+    read_file = cache.read_file if cache is not None else read_text_file
+    outlines = None
+    if outline is not None:
+        outlines = cache.outlines if cache is not None else load_outline_cache(project_path)
 
-    content_lines = []
-    content_lines.append("# " + "="*50)
-    content_lines.append(f"# Path: {project_path}")
-    content_lines.append(f"# Detected tech: {', '.join(detected_techs) if detected_techs else 'Unknown'}")
-    content_lines.append("# " + "="*50)
-    content_lines.append("")
+    # Dumps left in the project by earlier runs (any -o name) must not be dumped again
+    file_ids = output_file_ids(own_outputs)
+    if scan is None:
+        artifacts = [rel_path for _, file_path, rel_path, _ in candidate_files if is_own_artifact(file_path, file_ids)]
+        artifact_paths = set(artifacts)
+        candidate_files = [candidate for candidate in candidate_files if candidate[2] not in artifact_paths]
+    else:
+        artifacts = drop_own_artifacts(project_path, scan, file_ids)
+    if artifacts:
+        listed = ', '.join(artifacts[:MAX_LISTED_FILES]) + (', ...' if len(artifacts) > MAX_LISTED_FILES else '')
+        print(text['artifacts_skipped'].format(count=len(artifacts), files=listed))
 
     print(text['generating_tree'])
-    content_lines.append("## DIRECTORY STRUCTURE")
-    content_lines.append("```")
-    # Pass both exclude_dirs (as dir_patterns) and exclude_files (as file_patterns)
-    content_lines.append(generate_directory_tree(project_path, exclude_dirs, exclude_files))
-    content_lines.append("```")
-    content_lines.append("")
-
-
-    print(text['processing_files'])
-    content_lines.append("## FILE CONTENTS")
-    content_lines.append("")
-
-    file_count = 0
-    total_size = 0
-
-    for root, dirs, files in os.walk(project_path, topdown=True):
-        # Filter directories in place using should_exclude_path
-        # Pass the patterns obtained from get_exclude_patterns (which includes .dumpignore)
-        dirs[:] = [d for d in dirs if not should_exclude_path(os.path.relpath(os.path.join(root, d), project_path), exclude_dirs)]
-
-        for file in files:
-            file_path = os.path.join(root, file)
-            rel_path = os.path.relpath(file_path, project_path)
-
-            # Use should_exclude_file with filename, relative path, and combined exclude_files patterns
-            if should_exclude_file(file, rel_path, exclude_files):
-                continue
-
-            # File extension and name check logic revised
-            file_ext_with_dot = Path(file).suffix.lower() # e.g., '.py', '.txt', or '' for 'Makefile'
-            
-            process_this_file = False
-            if not detected_techs:
-                # If no specific tech detected, we attempt to include "all code files".
-                # This means we rely mainly on exclusion rules (size, exclude_dirs, exclude_files from .dumpignore)
-                # Files already passed should_exclude_file and should_exclude_path.
-                process_this_file = True
-            else:
-                # Techs detected, so filter by target_extensions
-                # Check for full filename match (e.g. "Dockerfile" in target_extensions)
-                if file in target_extensions:
-                    process_this_file = True
-                # Check for extension match (e.g. ".py" in target_extensions)
-                elif file_ext_with_dot and file_ext_with_dot in target_extensions:
-                    process_this_file = True
-            
-            if not process_this_file:
-                continue
-
-            try:
-                file_size = os.path.getsize(file_path)
-                if file_size > MAX_FILE_SIZE:
-                    print(text['skip_large'].format(file=rel_path, size=file_size, limit=MAX_FILE_SIZE))
+    if scan is None:
+        tree = generate_tree_from_paths(project_path, [rel for _, _, rel, _ in candidate_files])
+    else:
+        tree = generate_tree_from_scan(project_path, scan)
+
+    seen_files = {}  # (st_dev, st_ino) -> rel_path of the first hardlink/symlink dumped
+    notebook_count = 0
+    notebook_dropped_chars = 0
+    outline_count = 0
+    outline_dropped_chars = 0
+    generated_files = []  # (rel_path, reason) of generated/minified files not dumped
+    last_path = None  # last candidate fully written, in tree order
+    resume_after = None
+    if resume_state is not None:
+        notebook_count = resume_state['notebook_count']
+        notebook_dropped_chars = resume_state['notebook_dropped_chars']
+        outline_count = resume_state['outline_count']
+        outline_dropped_chars = resume_state['outline_dropped_chars']
+        generated_files = [tuple(item) for item in resume_state['generated_files']]
+        last_path = resume_state['last_path']
+        resume_after = tree_order_key(last_path)
+
+    def save():
+        save_checkpoint(outputs[0].path, dict(
+            options, last_path=last_path, outputs=[output.checkpoint_state() for output in outputs],
+            notebook_count=notebook_count, notebook_dropped_chars=notebook_dropped_chars,
+            outline_count=outline_count, outline_dropped_chars=outline_dropped_chars, generated_files=generated_files,
+        ))
+
+    def skip_generated(rel_path, generated_kind):
+        reason = _generated_reason(text, *generated_kind)
+        generated_files.append((rel_path, reason))
+        if generated == 'summary':
+            for output in outputs:
+                output.add_skipped(rel_path, reason)
+
+    try:
+        with contextlib.ExitStack() as stack:
+            # Sections are streamed to disk as files are read, nothing accumulates in memory.
+            # Every output gets its own writer, each file is read and decoded once for all of them.
+            for i, output in enumerate(outputs):
+                output.open(stack, project_path, detected_techs, tree,
+                            resume_state['outputs'][i] if resume_state is not None else None)
+            if resume_state is not None:
+                print(text['resumed'].format(path=last_path, count=outputs[0].file_count))
+
+            print(text['processing_files'])
+            next_checkpoint = time.monotonic() + CHECKPOINT_INTERVAL
+            for file, file_path, rel_path, entry in candidate_files:
+                if last_path is not None and time.monotonic() >= next_checkpoint:
+                    save()
+                    next_checkpoint = time.monotonic() + CHECKPOINT_INTERVAL
+
+                # Never read the dump (or its index) that is being written
+                if os.path.abspath(file_path) in own_outputs:
                     continue
 
-                print(text['processing'].format(file=rel_path))
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    file_content = f.read()
+                # File extension and name check logic revised
+                file_ext_with_dot = Path(file).suffix.lower() # e.g., '.py', '.txt', or '' for 'Makefile'
 
-                # Determine language hint for markdown code block
-                lang_hint = file_ext_with_dot[1:] if file_ext_with_dot else Path(file).stem.lower()
-                if lang_hint == "dockerfile": # common case
-                    lang_hint = "dockerfile" 
-                elif not lang_hint: # if still no hint (e.g. file is 'Makefile' -> stem is 'makefile')
-                    if file.lower() == 'makefile':
-                        lang_hint = 'makefile'
-                    # Add other common full filename hints if needed
+                if not is_target_file(file, file_ext_with_dot, detected_techs, target_extensions):
+                    continue
 
-                content_lines.append(f"### {rel_path}")
-                content_lines.append("```" + lang_hint)
-                content_lines.append(file_content)
-                content_lines.append("```")
-                content_lines.append("")
+                if resume_after is not None and tree_order_key(rel_path) <= resume_after:
+                    # Already in the resumed dump, only its inode is needed for the duplicate check
+                    if entry is not None and entry.ino:
+                        seen_files.setdefault((entry.dev, entry.ino), rel_path)
+                    continue
+                last_path = rel_path
 
-                file_count += 1
-                total_size += len(file_content) # Use actual content length for total_size
+                if entry is not None and entry.ino:
+                    file_id = (entry.dev, entry.ino)
+                    if file_id in seen_files:
+                        print(text['skip_duplicate'].format(file=rel_path, original=seen_files[file_id]))
+                        continue
+                    seen_files[file_id] = rel_path
 
-            except Exception as e:
-                content_lines.append(f"### {rel_path}")
-                content_lines.append(f"```\n# Error reading file: {str(e)}\n```")
-                content_lines.append("")
+                lang_hint = _get_lang_hint(file, file_ext_with_dot)
+                check_generated = generated != 'keep'
+                generated_kind = None
+                if check_generated:
+                    pattern = generated_by_name(file)
+                    if pattern:
+                        generated_kind = ('name', pattern)
+                # Outputs that get the error note if the file cannot be read: those planning to write it
+                targets = outputs
+                try:
+                    # Not entry.size: listings are reused while their directory mtime is unchanged,
+                    # which an in-place edit of the file doesn't change
+                    file_size = os.path.getsize(file_path)
+                    if generated_kind is None and file_size > MAX_FILE_SIZE:
+                        print(text['skip_large'].format(file=rel_path, size=file_size, limit=MAX_FILE_SIZE))
+                        continue
 
-    output_path = os.path.join(project_path, output_filename) # Use the output_filename from args
-    final_content = '\n'.join(content_lines)
+                    if generated_kind is None and check_generated and file_size > SNIFF_READ_THRESHOLD:
+                        # Look at the first block only, a bundle is not worth reading in full
+                        generated_kind = generated_by_content(read_head(file_path), file_ext_with_dot)
+                        check_generated = False
+                    if generated_kind is not None:
+                        skip_generated(rel_path, generated_kind)
+                        continue
 
-    try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(final_content)
+                    # A file is only read when at least one output may still have room for it
+                    shrinks = file_ext_with_dot == NOTEBOOK_EXTENSION or (
+                        outline is not None and file_size >= outline and can_outline(lang_hint))
+                    targets = [output for output in outputs if output.plan(rel_path, lang_hint, file_size, shrinks)]
+                    if not targets:
+                        continue
 
-        # Recalculate line_count from the final_content string to be accurate
-        # as content_lines might have empty strings that don't translate to lines in the file.
-        # Or, more simply, use the number of elements in content_lines if each is a line.
-        # However, reading the file back is most accurate for "lines in file".
-        # For performance on huge files, `len(final_content.splitlines())` is better than re-read.
-        line_count = len(final_content.splitlines())
+                    print(text['processing'].format(file=rel_path))
+                    file_content = read_file(file_path)
+                except Exception as e:
+                    for output in targets:
+                        output.add_error(rel_path, str(e))
+                    continue
 
+                if check_generated:
+                    generated_kind = generated_by_content(file_content[:SNIFF_BYTES], file_ext_with_dot)
+                    if generated_kind is not None:
+                        skip_generated(rel_path, generated_kind)
+                        continue
 
-        print("")
-        print(text['success'] + output_path)
-        print("")
-        print(text['summary'])
-        print(text['file_count'].format(count=file_count))
-        # Use final_content length for char count, total_size for ~KB (sum of read content)
-        print(text['size'].format(size=len(final_content), kb=total_size // 1024))
-        print(text['line_count'].format(lines=line_count))
+                if file_ext_with_dot == NOTEBOOK_EXTENSION:
+                    try:
+                        notebook_source, lang_hint = notebook_to_source(file_content, notebook_markdown)
+                    except NotebookError:
+                        pass  # not a real notebook, dumped as is
+                    else:
+                        notebook_count += 1
+                        notebook_dropped_chars += len(file_content) - len(notebook_source)
+                        file_content = notebook_source
+
+                # Outlined before strip/redact: those still apply to what is kept
+                outlined = False
+                if outline is not None and file_size >= outline and can_outline(lang_hint):
+                    file_outline = outlines.get(file_content, lang_hint)
+                    # An empty outline (a script, a config object) would drop the file: kept in full
+                    if file_outline and len(file_outline) < len(file_content):
+                        outline_count += 1
+                        outline_dropped_chars += len(file_content) - len(file_outline)
+                        file_content = file_outline
+                        outlined = True
+
+                # Outputs with the same strip/redact options share the transformed content
+                transformed = {}
+                for output in targets:
+                    key = (output.strip, output.redact)
+                    if key not in transformed:
+                        transformed[key] = _transform(file_content, lang_hint, output.strip, output.redact)
+                    output.add_file(rel_path, lang_hint, file_size, outlined, *transformed[key])
+
+        for output in outputs:
+            output.write_index()
+            output.print_summary(text)
+        if notebook_count:
+            print(text['notebooks'].format(count=notebook_count, chars=notebook_dropped_chars))
+        if outlines is not None:
+            print(text['outlined'].format(count=outline_count, chars=outline_dropped_chars, cached=outlines.hits))
+            outlines.finish()
+            if cache is None:
+                save_outline_cache(project_path, outlines)
+        if generated_files:
+            key = 'generated_summarized' if generated == 'summary' else 'generated_skipped'
+            print(text[key].format(count=len(generated_files)))
+            _print_file_list(text, generated_files)
         return True
 
     except Exception as e:
         print(text['write_error'].format(error=str(e)))
-        return False
\ No newline at end of file
+        return False
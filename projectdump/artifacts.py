@@ -0,0 +1,95 @@
+import json
+import os
+
+from projectdump.checkpoint import CHECKPOINT_SUFFIX, JOURNAL_SUFFIX
+from projectdump.dump_index import INDEX_SUFFIX
+from projectdump.trigram_index import TRIGRAM_SUFFIX
+from projectdump.writers import DUMP_GENERATOR, TEXT_SIGNATURE
+
+# Files next to a dump, named after it
+SIDECAR_SUFFIXES = (INDEX_SUFFIX, TRIGRAM_SUFFIX, CHECKPOINT_SUFFIX, JOURNAL_SUFFIX)
+# Extensions of files sniffed for a dump signature even without an index next to them
+DUMP_EXTENSIONS = {'.txt', '.md', '.jsonl'}
+
+_SIGNATURE_BYTES = 256
+# Headers of dumps written before the signature existed
+_LEGACY_TEXT_HEADERS = ("# SOURCE CODE DUMP\n", "# " + "=" * 50 + "\n# Path: ")
+_JSONL_HEADER_PREFIX = '{"type": "header", '
+
+
+def has_dump_signature(file_path):
+    """Whether the file starts like a text or JSONL dump written by projectdump"""
+    try:
+        with open(file_path, 'rb') as f:
+            head = f.read(_SIGNATURE_BYTES).decode('utf-8', errors='ignore').replace('\r\n', '\n')
+    except OSError:
+        return False
+    if head.startswith((TEXT_SIGNATURE + '\n',) + _LEGACY_TEXT_HEADERS):
+        return True
+    generator = json.dumps(DUMP_GENERATOR)
+    return head.startswith(_JSONL_HEADER_PREFIX) and head[len(_JSONL_HEADER_PREFIX):].startswith(
+        ('"generator": ' + generator, '"path": '))
+
+
+def output_file_ids(paths):
+    """(st_dev, st_ino) of the existing paths among paths, to recognize them under any name"""
+    file_ids = set()
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        file_ids.add((st.st_dev, st.st_ino))
+    return file_ids
+
+
+def is_own_artifact(file_path, file_ids=frozenset()):
+    """drop_own_artifacts for a single file outside of a scan (explicit file lists)"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return False
+    if (st.st_dev, st.st_ino) in file_ids:
+        return True
+    return os.path.splitext(file_path)[1].lower() in DUMP_EXTENSIONS and has_dump_signature(file_path)
+
+
+def _is_dump_in_listing(file_path, entry, names, file_ids):
+    if entry.ino and (entry.dev, entry.ino) in file_ids:
+        return True
+    if entry.name + INDEX_SUFFIX in names or os.path.splitext(entry.name)[1].lower() in DUMP_EXTENSIONS:
+        return has_dump_signature(file_path)
+    return False
+
+
+def drop_own_artifacts(project_path, scan, file_ids=frozenset()):
+    """
+    Remove projectdump's own outputs from a scan, in place: files whose inode is one of
+    file_ids (the outputs of the current run), files with a dump signature (sniffed when
+    they have a dump extension or an index next to them) and the sidecars of those dumps.
+    Returns the removed rel_paths.
+    """
+    removed = []
+    for rel_dir in sorted(scan):
+        entries = scan[rel_dir]
+        if not entries:
+            continue
+        names = {entry.name for entry in entries if not entry.is_dir}
+        dumps = {entry.name for entry in entries
+                 if not entry.is_dir and _is_dump_in_listing(os.path.join(project_path, rel_dir, entry.name),
+                                                             entry, names, file_ids)}
+        if not dumps:
+            continue
+        kept = []
+        for entry in entries:
+            if not entry.is_dir and (entry.name in dumps or _is_sidecar(entry.name, dumps)):
+                removed.append(os.path.join(rel_dir, entry.name) if rel_dir else entry.name)
+            else:
+                kept.append(entry)
+        scan[rel_dir] = kept
+    return removed
+
+
+def _is_sidecar(name, dumps):
+    name = name[:-len('.tmp')] if name.endswith('.tmp') else name
+    return any(name.endswith(suffix) and name[:-len(suffix)] in dumps for suffix in SIDECAR_SUFFIXES)
@@ -0,0 +1,309 @@
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import OrderedDict
+
+from projectdump.detector import TECH_INDICATORS, detect_tech_from_paths
+from projectdump.filters import ExcludeMatcher, get_exclude_patterns
+from projectdump.outline import OutlineCache
+from projectdump.scanner import DirEntry, ListingCache
+
+
+TECH_CACHE_VERSION = 2
+
+# Directory snapshot file: magic, byte order, directory count, entry count, string blob length
+_SNAPSHOT_MAGIC = b'PDSNAP01'
+_SNAPSHOT_HEADER = struct.Struct('<8sBQQQ')
+_SNAPSHOT_BYTEORDER = 0 if sys.byteorder == 'little' else 1
+# Directories modified this recently are not saved: a change in the same mtime tick would go unnoticed
+_SNAPSHOT_RACY_NS = 2 * 10**9
+
+# Names of the non-glob tech indicators (package.json, go.mod, .circleci/config.yml -> config.yml...)
+_INDICATOR_NAMES = {
+    pattern.rstrip('/').split('/')[-1].lower()
+    for patterns in TECH_INDICATORS.values() for pattern in patterns if '*' not in pattern
+}
+
+
+def get_cache_dir():
+    """Directory for projectdump's persistent caches ($PROJECTDUMP_CACHE_DIR or ~/.cache/projectdump)"""
+    cache_dir = os.environ.get('PROJECTDUMP_CACHE_DIR')
+    if not cache_dir:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cache_dir = os.path.join(base, 'projectdump')
+    return cache_dir
+
+
+def get_project_cache_path(project_path, kind, suffix='.json'):
+    """Path of the persistent cache file of one kind ('tech', 'scan'...) for a project"""
+    digest = hashlib.sha1(os.path.abspath(project_path).encode('utf-8', errors='surrogateescape')).hexdigest()
+    return os.path.join(get_cache_dir(), f"{kind}-{digest[:16]}{suffix}")
+
+
+def get_tech_cache_key(raw_listings):
+    """
+    Key of a tech detection result: paths and mtimes of the indicator files
+    plus the histogram of file extensions, taken from the scan's raw listings.
+    """
+    indicators = []
+    histogram = {}
+    for rel_dir in sorted(raw_listings):
+        for entry in raw_listings[rel_dir]:
+            if entry.is_dir:
+                continue
+            if entry.name.lower() in _INDICATOR_NAMES:
+                indicators.append([os.path.join(rel_dir, entry.name), entry.mtime_ns])
+            ext = os.path.splitext(entry.name)[1]
+            histogram[ext] = histogram.get(ext, 0) + 1
+    payload = json.dumps([TECH_CACHE_VERSION, indicators, sorted(histogram.items())])
+    return hashlib.sha256(payload.encode('utf-8', errors='surrogateescape')).hexdigest()
+
+
+def detect_tech_from_listings(project_path, raw_listings):
+    """
+    Detect techs from the files of the scan's raw listings, the same files the cache key
+    is built from: manifests under excluded (unwalked) directories never count.
+    """
+    rel_paths = [os.path.join(rel_dir, entry.name)
+                 for rel_dir, entries in raw_listings.items() for entry in entries if not entry.is_dir]
+    return detect_tech_from_paths(project_path, rel_paths)
+
+
+def detect_project_tech_cached(project_path, raw_listings, redetect=False):
+    """
+    Return (detected_techs, from_cache). Detection is skipped when the persisted result
+    for project_path has the same key; redetect forces a fresh detection. Both the key and
+    the detection come from raw_listings (see scanner.scan_project).
+    The cache is best effort: unreadable or unwritable cache files are ignored.
+    """
+    cache_path = get_project_cache_path(project_path, 'tech')
+    key = get_tech_cache_key(raw_listings)
+
+    if not redetect:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('key') == key:
+                return cached['techs'], True
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+
+    detected_techs = detect_tech_from_listings(project_path, raw_listings)
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'key': key, 'project_path': project_path, 'techs': detected_techs}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+    return detected_techs, False
+
+
+def save_listing_snapshot(project_path, listing_cache, keep_untouched=False):
+    """
+    Persist the directory listings of listing_cache as a compact binary snapshot:
+    one array per column (directory mtimes, child counts, entry flags, sizes, mtimes,
+    devices, inodes) plus a single NUL separated blob of directory paths and names.
+    Only the directories walked by this run are kept, so removed directories drop out
+    (keep_untouched also keeps the others, for runs that only walked part of the tree).
+    Best effort, like the tech cache: an unwritable cache directory is ignored.
+    """
+    racy_after = time.time_ns() - _SNAPSHOT_RACY_NS
+    dir_mtimes, child_counts = array('q'), array('Q')
+    flags = bytearray()
+    sizes, mtimes, devs, inos = array('Q'), array('q'), array('Q'), array('Q')
+    strings = []
+    for abs_dir, (mtime_ns, entries) in listing_cache.listings.items():
+        if mtime_ns >= racy_after or not (keep_untouched or abs_dir in listing_cache.touched):
+            continue
+        rel_dir = os.path.relpath(abs_dir, project_path)
+        if rel_dir == os.curdir:
+            rel_dir = ''
+        elif rel_dir == os.pardir or rel_dir.startswith(os.pardir + os.sep):
+            continue
+        strings.append(rel_dir)
+        dir_mtimes.append(mtime_ns)
+        child_counts.append(len(entries))
+        for entry in entries:
+            strings.append(entry.name)
+            flags.append(entry.is_dir | entry.is_link << 1)
+            sizes.append(entry.size)
+            mtimes.append(entry.mtime_ns)
+            devs.append(entry.dev)
+            inos.append(entry.ino)
+    blob = '\0'.join(strings).encode('utf-8', errors='surrogateescape')
+
+    snapshot_path = get_project_cache_path(project_path, 'scan', '.bin')
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        tmp_path = snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(_SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_BYTEORDER, len(dir_mtimes), len(flags), len(blob)))
+            for column in (dir_mtimes, child_counts, sizes, mtimes, devs, inos):
+                column.tofile(f)
+            f.write(flags)
+            f.write(blob)
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        pass
+
+
+def load_listing_snapshot(project_path):
+    """Return a ListingCache filled from the saved snapshot (empty if there is none or it is unreadable)"""
+    listing_cache = ListingCache()
+    try:
+        with open(get_project_cache_path(project_path, 'scan', '.bin'), 'rb') as f:
+            data = f.read()
+        magic, byteorder, dir_count, entry_count, blob_len = _SNAPSHOT_HEADER.unpack_from(data)
+        if magic != _SNAPSHOT_MAGIC or byteorder != _SNAPSHOT_BYTEORDER:
+            return listing_cache
+
+        pos = _SNAPSHOT_HEADER.size
+        columns = []
+        for typecode, count in (('q', dir_count), ('Q', dir_count), ('Q', entry_count),
+                                ('q', entry_count), ('Q', entry_count), ('Q', entry_count)):
+            column = array(typecode)
+            end = pos + column.itemsize * count
+            column.frombytes(data[pos:end])
+            columns.append(column)
+            pos = end
+        dir_mtimes, child_counts, sizes, mtimes, devs, inos = columns
+        flags = data[pos:pos + entry_count]
+        strings = data[pos + entry_count:pos + entry_count + blob_len].decode('utf-8', errors='surrogateescape').split('\0')
+        if len(flags) != entry_count or len(strings) != dir_count + entry_count:
+            return listing_cache
+    except (OSError, ValueError, struct.error):
+        return listing_cache
+
+    string_pos = entry_pos = 0
+    for dir_index in range(dir_count):
+        rel_dir = strings[string_pos]
+        string_pos += 1
+        entries = []
+        for i in range(entry_pos, entry_pos + child_counts[dir_index]):
+            entries.append(DirEntry(strings[string_pos], bool(flags[i] & 1), bool(flags[i] & 2),
+                                    sizes[i], mtimes[i], devs[i], inos[i]))
+            string_pos += 1
+        entry_pos += child_counts[dir_index]
+        abs_dir = os.path.join(project_path, rel_dir) if rel_dir else project_path
+        listing_cache.listings[abs_dir] = (dir_mtimes[dir_index], entries)
+    return listing_cache
+
+
+def load_outline_cache(project_path):
+    """Return an OutlineCache filled from the outlines saved by the previous run (empty if unreadable)"""
+    try:
+        with open(get_project_cache_path(project_path, 'outline'), 'r', encoding='utf-8') as f:
+            return OutlineCache(json.load(f)['outlines'])
+    except (OSError, ValueError, KeyError, TypeError):
+        return OutlineCache()
+
+
+def save_outline_cache(project_path, outlines):
+    """
+    Persist the outlines used by the dump that just ended (OutlineCache.finish), so
+    outlines of unchanged files are reused. Best effort, like the tech cache.
+    """
+    cache_path = get_project_cache_path(project_path, 'outline')
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'project_path': project_path, 'outlines': outlines.entries}, f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def read_text_file(file_path):
+    """Read a source file the way every dump does (UTF-8, undecodable bytes dropped)"""
+    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+
+class ContentCache:
+    """
+    LRU cache of decoded file contents bounded by total size.
+    Entries are validated against the size and mtime of the file being opened,
+    so a changed file is always read again.
+    """
+
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.entries = OrderedDict()  # file_path -> (size, mtime_ns, content)
+
+    def read(self, file_path):
+        with open(file_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            cached = self.entries.get(file_path)
+            if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+                self.entries.move_to_end(file_path)
+                return cached[2]
+            # Same result as a text mode read: UTF-8 with errors ignored, universal newlines
+            content = f.read().decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
+
+        self._put(file_path, st.st_size, st.st_mtime_ns, content)
+        return content
+
+    def _put(self, file_path, size, mtime_ns, content):
+        old = self.entries.pop(file_path, None)
+        if old is not None:
+            self.total_bytes -= old[0]
+        if size > self.max_bytes:
+            return
+        self.entries[file_path] = (size, mtime_ns, content)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (evicted_size, _, _) = self.entries.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+
+class ProjectCache:
+    """
+    Everything about one project that can be reused between dumps: exclusion patterns,
+    detected techs (refreshed when files were added, removed or renamed), file contents
+    and file outlines.
+    """
+
+    def __init__(self, project_path, content_cache=None):
+        self.project_path = project_path
+        self.listings = ListingCache()
+        self.contents = content_cache if content_cache is not None else ContentCache()
+        self.outlines = OutlineCache()
+        self._patterns_key = None
+        self._patterns = None
+        self._matcher = None
+        self._techs = None
+        self._techs_key = None
+
+    def get_exclude_patterns(self):
+        """Return (exclude_dirs, exclude_files, matcher), rebuilt only when .dumpignore changed"""
+        try:
+            st = os.stat(os.path.join(self.project_path, ".dumpignore"))
+            key = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            key = None
+        if self._patterns is None or key != self._patterns_key:
+            self._patterns = get_exclude_patterns(self.project_path)
+            self._matcher = ExcludeMatcher(*self._patterns)
+            self._patterns_key = key
+        return self._patterns[0], self._patterns[1], self._matcher
+
+    def detect_tech(self, raw_listings, redetect=False):
+        """
+        Return the techs detected from the scan's raw_listings, re-detected only if
+        file names changed since last time
+        """
+        if redetect or self._techs is None or self.listings.name_changes != self._techs_key:
+            self._techs = detect_tech_from_listings(self.project_path, raw_listings)
+            self._techs_key = self.listings.name_changes
+        return self._techs
+
+    def read_file(self, file_path):
+        return self.contents.read(file_path)
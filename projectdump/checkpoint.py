@@ -0,0 +1,69 @@
+import json
+import os
+
+CHECKPOINT_SUFFIX = '.ckpt'
+JOURNAL_SUFFIX = '.idx.part'
+CHECKPOINT_VERSION = 2
+
+# Seconds between two checkpoints of a running dump
+CHECKPOINT_INTERVAL = 10.0
+
+
+def checkpoint_path_for(dump_path):
+    """Return the checkpoint path of a dump being written (dump path + '.ckpt')"""
+    return dump_path + CHECKPOINT_SUFFIX
+
+
+def journal_path_for(dump_path):
+    """
+    Return the index journal path of a dump being written (dump path + '.idx.part'):
+    one JSON line per index entry, appended as sections are written.
+    """
+    return dump_path + JOURNAL_SUFFIX
+
+
+def tree_order_key(rel_path):
+    """
+    Sort key of a path in scan order: the tree is walked depth first with every directory
+    sorted by name, which is the order of the path components compared one by one.
+    """
+    return rel_path.split(os.sep)
+
+
+def save_checkpoint(dump_path, state):
+    """Atomically replace the checkpoint of dump_path with the state dict"""
+    ckpt_path = checkpoint_path_for(dump_path)
+    tmp_path = ckpt_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(state, version=CHECKPOINT_VERSION), f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, ckpt_path)
+
+
+def load_checkpoint(dump_path):
+    """Return the checkpoint state of dump_path, or None when there is no valid one"""
+    try:
+        with open(checkpoint_path_for(dump_path), 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+        return None
+    return state
+
+
+def read_journal(journal_path, length):
+    """Read the index entries of the first length bytes of a journal"""
+    with open(journal_path, 'rb') as f:
+        data = f.read(length)
+    return [tuple(json.loads(line)) for line in data.decode('utf-8').splitlines()]
+
+
+def remove_checkpoint(dump_path):
+    """Delete the checkpoint and index journal of a finished dump"""
+    for path in (checkpoint_path_for(dump_path), journal_path_for(dump_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
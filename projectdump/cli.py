@@ -4,9 +4,39 @@ ProjectDump CLI - Command Line Interface
 """
 import sys
 import os
+import re
 import argparse
-from projectdump.aggregator import aggregate_code
 from projectdump.constants import TEXT_VI, TEXT_EN
+from projectdump.generated import GENERATED_MODES
+from projectdump.strip import STRIP_OPTIONS, parse_strip_options
+from projectdump.writers import OUTPUT_FORMATS
+from projectdump.emit import check_emit_paths, emit_spec_to_json, parse_byte_size, parse_emit_spec
+# Only the modules needed to build the parsers are imported here: the dump engine
+# (aggregator, scanner, filters, cache...), the server and the index tools are imported
+# by the command using them, so --help/--version and subcommands start fast.
+# test_startup.py checks it with `python -X importtime`.
+
+# Subcommands are dispatched on the first argument so `projectdump [project_path]` keeps working.
+# Use `projectdump ./ls` to dump a project directory that happens to share a subcommand name.
+SUBCOMMANDS = ('extract', 'grep', 'index', 'ls', 'serve', 'stats')
+
+def _strip_option(value):
+    try:
+        return parse_strip_options(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _byte_size(value):
+    try:
+        return parse_byte_size(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def _emit_option(value):
+    try:
+        return parse_emit_spec(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
 
 def create_parser():
     """Create argument parser"""
@@ -19,8 +49,31 @@ Examples:
   projectdump                    # Use current directory, output to source_dump.txt
   projectdump /path/to/project   # Specify project path
   projectdump . -o dump.md       # Output to dump.md in current directory
+  projectdump --format jsonl -o dump.jsonl  # One JSON record per file
+  projectdump --strip comments,blank        # Drop comments and blank lines
+  projectdump --include 'services/payments/**' --include 'libs/common/**'
+  projectdump --entry services/api/main.py  # Only main.py and what it imports
+  projectdump --outline-min-bytes 8K        # Signatures only for files of 8 KiB and more
+  projectdump --max-output-bytes 50M        # Never write more than 50 MiB
+  projectdump --emit text:dump.txt --emit jsonl:dump.jsonl --emit text:llm.txt:max-bytes=200K,strip=comments+blank
   projectdump --lang en          # Use English language
+  projectdump --since main       # Only files changed since main (incl. uncommitted)
+  projectdump --diff HEAD~3..HEAD --with-neighbours
   projectdump --help             # Show this help message
+
+Subcommands (use the .idx index written next to every dump):
+  projectdump ls source_dump.txt                  # List the files stored in a dump
+  projectdump extract source_dump.txt src/app.py  # Print one file from a dump
+  projectdump index source_dump.txt               # Build the trigram index used by grep
+  projectdump grep 'def \\w+_handler' source_dump.txt
+
+Sizing a project before dumping it:
+  projectdump stats /path/to/project              # Files, bytes, lines and ~tokens per extension
+  projectdump stats . --json --top 20
+
+Server mode (keeps scans, matchers and file contents warm between runs):
+  projectdump serve --socket /tmp/projectdump.sock
+  projectdump . --server /tmp/projectdump.sock
         """
     )
     
@@ -40,10 +93,158 @@ Examples:
     
     parser.add_argument(
         '--output', '-o',
-        default='source_dump.txt',
         help='Output filename (default: source_dump.txt)'
     )
     
+    parser.add_argument(
+        '--format',
+        choices=OUTPUT_FORMATS,
+        default='text',
+        help='Output format: text (markdown-like sections) or jsonl (one JSON record per file) (default: text)'
+    )
+
+    diff_group = parser.add_mutually_exclusive_group()
+    diff_group.add_argument(
+        '--since',
+        metavar='REV',
+        help='Only dump files changed between REV and the working tree'
+    )
+    diff_group.add_argument(
+        '--diff',
+        metavar='A..B',
+        help='Only dump files changed in the git revision range A..B (read from the working tree)'
+    )
+
+    parser.add_argument(
+        '--with-neighbours',
+        action='store_true',
+        help='With --since/--diff, also dump the other files in the changed directories'
+    )
+
+    parser.add_argument(
+        '--generated',
+        choices=GENERATED_MODES,
+        default='skip',
+        help='What to do with generated/minified files (*.min.js, *_pb2.py, "generated by" headers...): '
+             'skip them, write a one line summary section, or keep them (default: skip)'
+    )
+
+    parser.add_argument(
+        '--redact',
+        action='store_true',
+        help='Replace secrets (API keys, tokens, private keys, high entropy passwords) by [REDACTED:<rule>]'
+    )
+
+    parser.add_argument(
+        '--notebook-markdown',
+        action='store_true',
+        help='Keep the markdown cells of Jupyter notebooks (code cells only by default)'
+    )
+
+    parser.add_argument(
+        '--outline',
+        action='store_true',
+        help='Write an outline of source files (docstring, imports, class/function signatures, constants) '
+             'instead of their full content'
+    )
+
+    parser.add_argument(
+        '--outline-min-bytes',
+        type=_byte_size,
+        metavar='SIZE',
+        help='Only outline files of at least SIZE bytes, smaller ones are dumped in full (implies --outline)'
+    )
+
+    parser.add_argument(
+        '--max-output-bytes',
+        type=_byte_size,
+        metavar='SIZE',
+        help='Stop adding files once the dump would exceed SIZE bytes (K/M/G suffixes allowed)'
+    )
+
+    parser.add_argument(
+        '--emit',
+        action='append',
+        type=_emit_option,
+        metavar='FORMAT:PATH[:OPTIONS]',
+        help='Write this output instead of -o/--format (repeatable, all from one read of the files). '
+             'OPTIONS: comma separated max-bytes=SIZE, strip=PART+PART, redact'
+    )
+
+    parser.add_argument(
+        '--include',
+        action='append',
+        metavar='GLOB',
+        help="Only walk and dump paths matching GLOB (repeatable), e.g. 'services/payments/**'"
+    )
+
+    parser.add_argument(
+        '--entry',
+        action='append',
+        metavar='FILE',
+        help='Only dump FILE and the project files it imports, directly or not (repeatable; '
+             'Python, JS/TS and Go imports are followed). FILE is relative to the project path'
+    )
+
+    parser.add_argument(
+        '--strip',
+        type=_strip_option,
+        metavar='PARTS',
+        help=f"Comma separated parts to drop from every file: {', '.join(STRIP_OPTIONS)}"
+    )
+
+    parser.add_argument(
+        '--follow-symlinks',
+        action='store_true',
+        help='Descend into symlinked directories (loops are detected); linked copies of a file are dumped once'
+    )
+
+    parser.add_argument(
+        '--walk-threads',
+        type=int,
+        default=1,
+        metavar='N',
+        help='List directories on N threads, mostly useful on NFS/FUSE mounts (default: 1)'
+    )
+
+    parser.add_argument(
+        '--redetect',
+        action='store_true',
+        help='Ignore the cached tech detection result and detect again'
+    )
+
+    parser.add_argument(
+        '--rescan',
+        action='store_true',
+        help='Ignore the saved directory snapshot and list every directory again'
+    )
+
+    parser.add_argument(
+        '--split-packages',
+        action='store_true',
+        help='Write one dump per package root (package.json, pyproject.toml, go.mod, Cargo.toml...) '
+             'into a directory named after -o, plus a packages.json index'
+    )
+
+    parser.add_argument(
+        '--split-workers',
+        type=int,
+        metavar='N',
+        help='Processes used by --split-packages (default: one per CPU)'
+    )
+
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue an interrupted dump from its last checkpoint instead of starting over'
+    )
+
+    parser.add_argument(
+        '--server',
+        metavar='SOCKET',
+        help='Send the dump request to a running `projectdump serve` instead of dumping in-process'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
@@ -52,10 +253,167 @@ Examples:
     
     return parser
 
-def main():
+def create_subcommand_parser():
+    """Create argument parser for the dump subcommands"""
+    parser = argparse.ArgumentParser(
+        prog='projectdump',
+        description='🚀 ProjectDump - Work with existing dumps'
+    )
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        '--lang', '--language',
+        choices=['en', 'vi'],
+        default='en',
+        help='Language for output messages (default: en)'
+    )
+    subparsers = parser.add_subparsers(dest='command')
+
+    extract_parser = subparsers.add_parser('extract', parents=[common], help='Print one file stored in a dump')
+    extract_parser.add_argument('dump_path', help='Path to the dump file')
+    extract_parser.add_argument('file_path', help='Project-relative path of the file to print')
+
+    ls_parser = subparsers.add_parser('ls', parents=[common], help='List the files stored in a dump')
+    ls_parser.add_argument('dump_path', help='Path to the dump file')
+
+    index_parser = subparsers.add_parser('index', parents=[common], help='Build the trigram index of a dump for grep')
+    index_parser.add_argument('dump_path', help='Path to the dump file')
+
+    grep_parser = subparsers.add_parser('grep', parents=[common], help='Search the files stored in a dump')
+    grep_parser.add_argument('pattern', help='Regular expression (Python syntax) matched against each line')
+    grep_parser.add_argument('dump_path', help='Path to the dump file')
+    grep_parser.add_argument('-i', '--ignore-case', action='store_true', help='Case insensitive search')
+    grep_parser.add_argument('--no-index', action='store_true',
+                             help='Read every file instead of using the trigram index')
+
+    stats_parser = subparsers.add_parser('stats', parents=[common],
+                                         help='Report what a dump would contain, without writing it')
+    stats_parser.add_argument('project_path', nargs='?', default=None,
+                              help='Path to the project directory (default: current directory)')
+    stats_parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    stats_parser.add_argument('--top', type=int, default=10, metavar='N', help='Number of largest files listed (default: 10)')
+    stats_parser.add_argument('--include', action='append', metavar='GLOB', help='Only count paths matching GLOB')
+    stats_parser.add_argument('--generated', choices=GENERATED_MODES, default='skip',
+                              help='Count generated/minified files (keep) or leave them out (default: skip)')
+    stats_parser.add_argument('--follow-symlinks', action='store_true', help='Descend into symlinked directories')
+    stats_parser.add_argument('--walk-threads', type=int, default=1, metavar='N', help='List directories on N threads')
+
+    serve_parser = subparsers.add_parser('serve', parents=[common], help='Run a local dump server on a Unix socket')
+    serve_parser.add_argument('--socket', required=True, help='Path of the Unix socket to listen on')
+    serve_parser.add_argument('--max-projects', type=int, default=8,
+                              help='Number of projects kept warm before the least recently used is dropped (default: 8)')
+    serve_parser.add_argument('--cache-mb', type=int, default=256,
+                              help='Size of the shared file content cache in MB (default: 256)')
+
+    return parser
+
+def run_subcommand(argv):
+    """Run a dump subcommand (argv[0] is the subcommand name)"""
+    args = create_subcommand_parser().parse_args(argv)
+    text = TEXT_EN if args.lang == 'en' else TEXT_VI
+
+    if args.command == 'serve':
+        from projectdump.server import ServerError, serve
+        print(text['serve_listening'] + args.socket)
+        try:
+            serve(args.socket, max_projects=args.max_projects, content_cache_bytes=args.cache_mb * 1024 * 1024)
+        except (ServerError, OSError) as e:
+            print(text['server_error'].format(error=str(e)), file=sys.stderr)
+            return 1
+        return 0
+
+    if args.command == 'stats':
+        from projectdump.stats import collect_stats, format_stats_json, format_stats_table
+        project_path = os.path.abspath(args.project_path or os.getcwd())
+        if not os.path.isdir(project_path):
+            print(text['not_found'].format(path=project_path), file=sys.stderr)
+            return 1
+        report = collect_stats(project_path, include=args.include, follow_symlinks=args.follow_symlinks,
+                               walk_threads=args.walk_threads, generated=args.generated, top=args.top)
+        print(format_stats_json(report) if args.json else format_stats_table(report, text))
+        return 0
+
+    from projectdump.dump_index import DumpIndexError, extract_file, list_files
+    from projectdump.trigram_index import build_trigram_index, grep_dump
+    try:
+        if args.command == 'extract':
+            sys.stdout.write(extract_file(args.dump_path, args.file_path))
+        elif args.command == 'ls':
+            for rel_path, size, sha256 in list_files(args.dump_path):
+                print(f"{size:>12}  {sha256[:12]}  {rel_path}")
+        elif args.command == 'index':
+            tri_path, file_count, trigram_count = build_trigram_index(args.dump_path)
+            print(text['trigram_written'].format(path=tri_path, files=file_count, trigrams=trigram_count))
+        elif args.command == 'grep':
+            found = False
+            for rel_path, line_number, line in grep_dump(args.dump_path, args.pattern, args.ignore_case,
+                                                         use_index=not args.no_index):
+                print(f"{rel_path}:{line_number}:{line}")
+                found = True
+            # Like grep: 1 when nothing matched
+            return 0 if found else 1
+    except re.error as e:
+        print(text['pattern_error'].format(error=str(e)), file=sys.stderr)
+        return 1
+    except (DumpIndexError, OSError) as e:
+        print(text['index_error'].format(error=str(e)), file=sys.stderr)
+        return 1
+    return 0
+
+def _outline_threshold(args):
+    """The outline argument of aggregate_code: minimum size of outlined files, None without --outline"""
+    if args.outline_min_bytes is not None:
+        return args.outline_min_bytes
+    return 0 if args.outline else None
+
+def _run_split_packages(project_path, text, args):
+    from projectdump.dump_index import list_files
+    from projectdump.packages import split_packages
+    # source_dump.txt -> <project>/source_dump/<package>.txt
+    output_dir = os.path.join(project_path, os.path.splitext(args.output)[0])
+    packages, index_path = split_packages(
+        project_path, text, output_dir, output_format=args.format, workers=args.split_workers,
+        follow_symlinks=args.follow_symlinks, walk_threads=args.walk_threads, redetect=args.redetect,
+        strip=args.strip, max_output_bytes=args.max_output_bytes, rescan=args.rescan,
+        notebook_markdown=args.notebook_markdown, generated=args.generated, redact=args.redact, resume=args.resume,
+        outline=_outline_threshold(args))
+    failed = 0
+    for root, ok, messages, dump_path in packages:
+        if not ok:
+            failed += 1
+            print(text['split_failed'].format(path=root or '.'))
+            sys.stdout.write(messages)
+            continue
+        print(text['split_package'].format(status='✅', path=root or '.', dump=os.path.relpath(dump_path, project_path),
+                                           files=len(list_files(dump_path))))
+    print(text['split_index'] + index_path)
+    if failed:
+        print(text['error'])
+        return 1
+    print(text['done'])
+    return 0
+
+def main(argv=None):
     """Main CLI entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in SUBCOMMANDS:
+        return run_subcommand(argv)
+
     parser = create_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.server and (args.since or args.diff):
+        parser.error('--server cannot be combined with --since/--diff')
+    if args.entry and (args.since or args.diff):
+        parser.error('--entry cannot be combined with --since/--diff')
+    if args.split_packages and (args.server or args.since or args.diff or args.emit or args.include or args.entry):
+        parser.error('--split-packages cannot be combined with --server, --since/--diff, --emit, --include or --entry')
+    if args.emit:
+        try:
+            check_emit_paths(os.path.abspath(args.project_path or os.getcwd()), args.emit, args.output)
+        except ValueError as e:
+            parser.error(f'--emit: {e}')
+    # None above: an -o given along with --emit is checked against the --emit paths
+    args.output = args.output or 'source_dump.txt'
     
     # Select language
     text = TEXT_EN if args.lang == 'en' else TEXT_VI
@@ -73,8 +431,49 @@ def main():
     print(text['app_title'])
     print("=" * 40)
     
-    # Run aggregation, passing the output filename from args
-    success = aggregate_code(project_path, text, output_filename=args.output)
+    changed_files = None
+    if args.since or args.diff:
+        from projectdump.git_diff import GitDiffError, add_directory_neighbours, get_changed_files
+        try:
+            changed_files = get_changed_files(project_path, since=args.since, diff_range=args.diff)
+        except GitDiffError as e:
+            print(text['git_error'].format(error=str(e)))
+            return 1
+        if args.with_neighbours:
+            changed_files = add_directory_neighbours(project_path, changed_files)
+        # A previous dump is usually untracked, don't feed it back into the new one
+        changed_files = [p for p in changed_files if p != os.path.normpath(args.output)]
+
+    if args.split_packages:
+        return _run_split_packages(project_path, text, args)
+
+    if args.server:
+        from projectdump.server import ServerError, request_dump
+        request = {'project_path': project_path, 'output': args.output, 'format': args.format, 'lang': args.lang,
+                   'redetect': args.redetect, 'follow_symlinks': args.follow_symlinks,
+                   'walk_threads': args.walk_threads, 'strip': sorted(args.strip or ()), 'include': args.include,
+                   'max_output_bytes': args.max_output_bytes, 'notebook_markdown': args.notebook_markdown,
+                   'generated': args.generated, 'redact': args.redact,
+                   'emit': [emit_spec_to_json(spec) for spec in args.emit or ()], 'resume': args.resume,
+                   'entry': args.entry, 'outline': _outline_threshold(args)}
+        try:
+            response = request_dump(args.server, request)
+        except (ServerError, OSError) as e:
+            print(text['server_error'].format(error=str(e)))
+            return 1
+        sys.stdout.write(response['messages'])
+        success = response['ok']
+    else:
+        from projectdump.aggregator import aggregate_code
+        # Run aggregation, passing the output filename from args
+        success = aggregate_code(project_path, text, output_filename=args.output,
+                                 changed_files=changed_files, output_format=args.format, redetect=args.redetect,
+                                 follow_symlinks=args.follow_symlinks, walk_threads=args.walk_threads,
+                                 strip=args.strip, include=args.include,
+                                 max_output_bytes=args.max_output_bytes, rescan=args.rescan,
+                                 notebook_markdown=args.notebook_markdown, generated=args.generated,
+                                 redact=args.redact, emit=args.emit, resume=args.resume, entries=args.entry,
+                                 outline=_outline_threshold(args))
     
     if success:
         print(text['done']) # The 'done' message in constants implies source_dump.txt
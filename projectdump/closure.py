@@ -0,0 +1,237 @@
+import ast
+import os
+import re
+
+from projectdump.cache import read_text_file
+from projectdump.checkpoint import tree_order_key
+
+PYTHON_EXTENSIONS = ('.py', '.pyi', '.pyw')
+# Tried in this order for extensionless specifiers (`import './util'`)
+JS_EXTENSIONS = ('.ts', '.tsx', '.js', '.jsx', '.mjs', '.cjs', '.mts', '.cts', '.vue', '.svelte', '.json')
+# TypeScript ESM code imports './util.js' for the file './util.ts'
+_TS_FOR_JS = {'.js': ('.ts', '.tsx'), '.jsx': ('.tsx',), '.mjs': ('.mts',), '.cjs': ('.cts',)}
+GO_EXTENSION = '.go'
+
+# `from 'x'` (import/export ... from), `import 'x'`, `require('x')` and `import('x')`.
+# A keyword followed by a string is enough: only relative specifiers that resolve to a
+# project file are kept, so the odd match in a comment costs at most one extra file.
+_JS_IMPORT_RE = re.compile(r'''\b(?:from|import|require)\s*\(?\s*(['"`])(\.{1,2}/[^'"`\n]*)\1''')
+_GO_IMPORT_BLOCK_RE = re.compile(r'^import\s*\((.*?)\)', re.M | re.S)
+_GO_IMPORT_LINE_RE = re.compile(r'^import\s+(?:[\w.]+\s+)?"([^"]+)"', re.M)
+_GO_IMPORT_SPEC_RE = re.compile(r'^\s*(?:[\w.]+\s+)?"([^"]+)"', re.M)
+_GO_MODULE_RE = re.compile(r'^module\s+"?([^\s"]+)"?', re.M)
+
+
+class _ProjectFiles:
+    """Existence checks on project-relative paths, with the dump's exclusions applied"""
+
+    def __init__(self, project_path, matcher):
+        self.project_path = project_path
+        self.matcher = matcher
+        self._files = {}
+        self._dirs = {}
+        self._go_modules = {}
+
+    def is_file(self, rel_path):
+        if rel_path not in self._files:
+            rel_dir, name = os.path.split(rel_path)
+            self._files[rel_path] = (not (rel_path == os.pardir or rel_path.startswith(os.pardir + os.sep))
+                                     and os.path.isfile(os.path.join(self.project_path, rel_path))
+                                     and not (rel_dir and self.matcher.exclude_dir(rel_dir))
+                                     and not self.matcher.exclude_file(name, rel_path))
+        return self._files[rel_path]
+
+    def is_dir(self, rel_dir):
+        if rel_dir not in self._dirs:
+            self._dirs[rel_dir] = (not (rel_dir == os.pardir or rel_dir.startswith(os.pardir + os.sep))
+                                   and os.path.isdir(os.path.join(self.project_path, rel_dir))
+                                   and not (rel_dir and self.matcher.exclude_dir(rel_dir)))
+        return self._dirs[rel_dir]
+
+    def list_files(self, rel_dir):
+        try:
+            names = sorted(os.listdir(os.path.join(self.project_path, rel_dir)))
+        except OSError:
+            return []
+        return [rel_path for rel_path in (os.path.join(rel_dir, name) for name in names) if self.is_file(rel_path)]
+
+    def go_module(self, rel_dir):
+        """(module path, directory of its go.mod) of the Go module holding rel_dir, or None"""
+        if rel_dir not in self._go_modules:
+            module = None
+            gomod_path = os.path.join(self.project_path, rel_dir, 'go.mod')
+            if os.path.isfile(gomod_path):
+                match = _GO_MODULE_RE.search(read_text_file(gomod_path))
+                module = (match.group(1), rel_dir) if match else None
+            elif rel_dir:
+                module = self.go_module(os.path.dirname(rel_dir))
+            self._go_modules[rel_dir] = module
+        return self._go_modules[rel_dir]
+
+
+def resolve_closure(project_path, entries, matcher):
+    """
+    Return the project-relative paths of the entry files and of every project file they
+    import, directly or not, in tree order. Files excluded from the dump are neither
+    returned nor followed.
+    Python imports are read with ast and resolved like sys.path would: relative imports
+    from the package of the file, absolute ones from the file's directory, then each parent
+    directory (and its src/). Parent packages' __init__.py are part of the closure.
+    JS/TS: relative specifiers of import/export/require/import(), with the usual extension
+    and index file lookup (bare package names live outside the project).
+    Go: imports under the module path of the nearest go.mod, a package being every non-test
+    .go file of its directory (the other files of a Go file's package come with it).
+    Files of other languages are kept without looking into them.
+    """
+    files = _ProjectFiles(project_path, matcher)
+    closure = set()
+    pending = [os.path.normpath(entry) for entry in entries]
+    while pending:
+        rel_path = pending.pop()
+        if rel_path in closure:
+            continue
+        closure.add(rel_path)
+        ext = os.path.splitext(rel_path)[1].lower()
+        if ext in PYTHON_EXTENSIONS:
+            pending.extend(_python_dependencies(files, rel_path))
+        elif ext in JS_EXTENSIONS:
+            pending.extend(_js_dependencies(files, rel_path))
+        elif ext == GO_EXTENSION:
+            pending.extend(_go_dependencies(files, rel_path))
+    return sorted(closure, key=tree_order_key)
+
+
+def _read(files, rel_path):
+    try:
+        return read_text_file(os.path.join(files.project_path, rel_path))
+    except OSError:
+        return ''
+
+
+def _python_dependencies(files, rel_path):
+    try:
+        tree = ast.parse(_read(files, rel_path), rel_path)
+    except (SyntaxError, ValueError):
+        return []
+    rel_dir = os.path.dirname(rel_path)
+    dependencies = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                dependencies.extend(_python_module(files, rel_dir, 0, alias.name.split('.'), ()))
+        elif isinstance(node, ast.ImportFrom):
+            parts = node.module.split('.') if node.module else []
+            names = [alias.name for alias in node.names if alias.name != '*']
+            dependencies.extend(_python_module(files, rel_dir, node.level, parts, names))
+    return dependencies
+
+
+def _python_roots(rel_dir):
+    """Directories an absolute import is looked up from: rel_dir, then its parents and their src/"""
+    roots = []
+    while True:
+        roots.append(rel_dir)
+        roots.append(os.path.join(rel_dir, 'src'))
+        if not rel_dir:
+            return roots
+        rel_dir = os.path.dirname(rel_dir)
+
+
+def _python_module(files, rel_dir, level, parts, names):
+    """Files run by an import of the module parts (plus the submodules among names), or []"""
+    if level:
+        base = rel_dir
+        for _ in range(level - 1):
+            if not base:
+                return []
+            base = os.path.dirname(base)
+        roots = [base]
+    else:
+        roots = _python_roots(rel_dir)
+    for root in roots:
+        found = _python_module_from(files, root, parts, names)
+        if found is not None:
+            if level:
+                # The package the relative import starts from is initialized first
+                package_init = _python_file(files, roots[0], package_only=True)
+                found = ([package_init] if package_init else []) + found
+            return found
+    return []
+
+
+def _python_module_from(files, root, parts, names):
+    found = []
+    path = root
+    for i, part in enumerate(parts):
+        path = os.path.join(path, part)
+        last = i == len(parts) - 1
+        module_file = _python_file(files, path, package_only=not last)
+        if module_file:
+            found.append(module_file)
+        elif not files.is_dir(path) or (last and not names):
+            # Neither a module nor a (namespace) package: the import is not from here
+            return None
+    for name in names:
+        module_file = _python_file(files, os.path.join(path, name))
+        if module_file:
+            found.append(module_file)
+    return found if found else (None if parts else [])
+
+
+def _python_file(files, path, package_only=False):
+    init_path = os.path.join(path, '__init__.py')
+    if files.is_file(init_path):
+        return init_path
+    if not package_only:
+        for ext in PYTHON_EXTENSIONS:
+            if files.is_file(path + ext):
+                return path + ext
+    return None
+
+
+def _js_dependencies(files, rel_path):
+    rel_dir = os.path.dirname(rel_path)
+    dependencies = []
+    for match in _JS_IMPORT_RE.finditer(_read(files, rel_path)):
+        specifier = match.group(2).split('?', 1)[0].split('#', 1)[0]
+        target = _js_file(files, os.path.normpath(os.path.join(rel_dir, specifier)))
+        if target:
+            dependencies.append(target)
+    return dependencies
+
+
+def _js_file(files, path):
+    base, ext = os.path.splitext(path)
+    candidates = [path] if ext else []
+    candidates += [base + ts_ext for ts_ext in _TS_FOR_JS.get(ext.lower(), ())]
+    candidates += [path + js_ext for js_ext in JS_EXTENSIONS]
+    candidates += [os.path.join(path, 'index' + js_ext) for js_ext in JS_EXTENSIONS]
+    for candidate in candidates:
+        if files.is_file(candidate):
+            return candidate
+    return None
+
+
+def _go_package_files(files, rel_dir):
+    return [rel_path for rel_path in files.list_files(rel_dir)
+            if rel_path.endswith(GO_EXTENSION) and not rel_path.endswith('_test.go')]
+
+
+def _go_dependencies(files, rel_path):
+    rel_dir = os.path.dirname(rel_path)
+    dependencies = _go_package_files(files, rel_dir)
+    module = files.go_module(rel_dir)
+    if module is None:
+        return dependencies
+    module_path, module_dir = module
+    source = _read(files, rel_path)
+    imports = _GO_IMPORT_LINE_RE.findall(source)
+    for block in _GO_IMPORT_BLOCK_RE.findall(source):
+        imports.extend(_GO_IMPORT_SPEC_RE.findall(block))
+    for import_path in imports:
+        if import_path == module_path or import_path.startswith(module_path + '/'):
+            package_dir = os.path.normpath(os.path.join(module_dir, *import_path[len(module_path):].split('/')))
+            if package_dir == '.':
+                package_dir = ''
+            dependencies.extend(_go_package_files(files, package_dir))
+    return dependencies
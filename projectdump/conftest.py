@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep persistent caches written during tests out of the user's ~/.cache"""
+    monkeypatch.setenv('PROJECTDUMP_CACHE_DIR', str(tmp_path_factory.mktemp('projectdump-cache')))
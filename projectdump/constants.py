@@ -14,13 +14,60 @@ TEXT_VI = {
     'processing_files': "📄 Đang xử lý các tệp...",
     'skip_large': "⚠️  Bỏ qua {file} (kích thước {size} byte > giới hạn {limit} byte)",
     'processing': "  📝 Xử lý: {file}",
+    'skip_duplicate': "⏭️  Bỏ qua {file} (cùng file với {original})",
     'success': "✅ Thành công! Đã tạo file: ",
     'summary': "📊 Thống kê:",
     'file_count': "   - Số file đã xử lý: {count}",
     'size': "   - Kích thước file đầu ra: {size} ký tự (~{kb} KB)",
     'line_count': "   - Tổng số dòng: {lines} dòng",
+    'stripped': "   - Đã lược bỏ: {chars} ký tự ({percent}% nội dung đã đọc)",
+    'notebooks': "   - Notebook: {count} file chỉ giữ lại các cell (đã bỏ {chars} ký tự output/metadata)",
+    'outlined': "   - Outline: {count} file chỉ giữ lại chữ ký và import (đã bỏ {chars} ký tự, {cached} outline lấy từ cache)",
+    'redacted': "   - Bí mật đã che: {count} ({rules})",
+    'dropped': "   - Bỏ qua để không vượt quá {limit} byte: {count} file ({size} byte)",
+    'dropped_notes': "   - Bỏ qua để không vượt quá {limit} byte: {count} mục lỗi đọc file/file bị bỏ qua",
+    'listed_file': "       {file} ({detail})",
+    'listed_more': "       ... và {count} file khác",
+    'bytes': "{size} byte",
+    'generated_skipped': "   - File sinh tự động/minified đã bỏ qua: {count} (dùng --generated keep để giữ lại)",
+    'generated_summarized': "   - File sinh tự động/minified chỉ ghi tóm tắt: {count}",
+    'generated_name': "tên khớp {pattern}",
+    'generated_header': "header \"{marker}\"",
+    'generated_minified': "minified, dòng trung bình {avg} / dài nhất {max} ký tự",
     'write_error': "❌ Lỗi ghi file: {error}",
     'not_found': "❌ Lỗi: Thư mục '{path}' không tồn tại!",
+    'tech_cached': "🛠️  Dùng kết quả phát hiện công nghệ đã lưu (dùng --redetect để phát hiện lại)",
+    'snapshot_reused': "♻️  Dùng lại {hits}/{total} thư mục từ lần quét trước (dùng --rescan để quét lại)",
+    'split_found': "📦 Tìm thấy {count} package, đang dump song song trên {workers} tiến trình",
+    'split_package': "   {status} {path} → {dump} ({files} file)",
+    'split_failed': "❌ Dump package {path} thất bại:",
+    'split_index': "🗂️  Chỉ mục package: ",
+    'artifacts_skipped': "🧹 Bỏ qua {count} file đầu ra của projectdump trong dự án: {files}",
+    'resumed': "⏩ Tiếp tục sau {path} ({count} file đã có trong bản dump)",
+    'resume_unusable': "⚠️  Không thể tiếp tục ({reason}), bắt đầu lại từ đầu",
+    'resume_missing': "không có checkpoint hợp lệ",
+    'resume_options': "checkpoint được tạo với tùy chọn khác",
+    'resume_diff_mode': "không hỗ trợ với --since/--diff",
+    'diff_mode': "🔀 Chế độ diff: {count} file thay đổi",
+    'entry_closure': "🧭 Chế độ entry: {count} file truy cập được từ {entries} file entry",
+    'entry_missing': "❌ Không tìm thấy file entry trong dự án: {files}",
+    'git_error': "❌ Lỗi git: {error}",
+    'index_written': "🗂️  Đã tạo file chỉ mục: ",
+    'index_error': "❌ Lỗi chỉ mục: {error}",
+    'trigram_written': "🔎 Đã tạo chỉ mục trigram: {path} ({files} file, {trigrams} trigram)",
+    'pattern_error': "❌ Biểu thức chính quy không hợp lệ: {error}",
+    'serve_listening': "📡 Server đang lắng nghe tại: ",
+    'stats_techs': "🛠️  Công nghệ: ",
+    'stats_extension': "Phần mở rộng",
+    'stats_files': "File",
+    'stats_bytes': "Byte",
+    'stats_lines': "Dòng",
+    'stats_tokens': "~Token",
+    'stats_tech': "Công nghệ",
+    'stats_total': "Tổng",
+    'stats_largest': "📦 File lớn nhất:",
+    'stats_skipped': "⏭️  Sẽ bị bỏ qua: {generated} file sinh tự động/minified, {large} file quá lớn, {duplicates} bản sao",
+    'server_error': "❌ Lỗi server: {error}",
 }
 
 TEXT_EN = {
@@ -37,11 +84,58 @@ TEXT_EN = {
     'processing_files': "📄 Processing files...",
     'skip_large': "⚠️  Skipping {file} (size {size} bytes > limit {limit} bytes)",
     'processing': "  📝 Processing: {file}",
+    'skip_duplicate': "⏭️  Skipping {file} (same file as {original})",
     'success': "✅ Success! File created: ",
     'summary': "📊 Summary:",
     'file_count': "   - Files processed: {count}",
     'size': "   - Output size: {size} characters (~{kb} KB)",
     'line_count': "   - Total lines: {lines}",
+    'stripped': "   - Stripped: {chars} characters ({percent}% of the content read)",
+    'notebooks': "   - Notebooks: {count} reduced to their cells ({chars} characters of outputs/metadata dropped)",
+    'outlined': "   - Outlines: {count} file(s) reduced to their signatures and imports ({chars} characters dropped, {cached} outline(s) from cache)",
+    'redacted': "   - Secrets redacted: {count} ({rules})",
+    'dropped': "   - Dropped to stay under {limit} bytes: {count} file(s) ({size} bytes)",
+    'dropped_notes': "   - Dropped to stay under {limit} bytes: {count} read error/skipped file section(s)",
+    'listed_file': "       {file} ({detail})",
+    'listed_more': "       ... and {count} more",
+    'bytes': "{size} bytes",
+    'generated_skipped': "   - Generated/minified files skipped: {count} (pass --generated keep to dump them)",
+    'generated_summarized': "   - Generated/minified files summarized: {count}",
+    'generated_name': "name matches {pattern}",
+    'generated_header': "header \"{marker}\"",
+    'generated_minified': "minified, average line {avg} / longest {max} characters",
     'write_error': "❌ Error writing file: {error}",
     'not_found': "❌ Error: Folder '{path}' not found!",
+    'tech_cached': "🛠️  Using cached tech detection (pass --redetect to refresh)",
+    'snapshot_reused': "♻️  Reused {hits}/{total} directory listings from the last scan (pass --rescan to list all)",
+    'split_found': "📦 Found {count} packages, dumping them on {workers} processes",
+    'split_package': "   {status} {path} → {dump} ({files} files)",
+    'split_failed': "❌ Dumping package {path} failed:",
+    'split_index': "🗂️  Package index: ",
+    'artifacts_skipped': "🧹 Left out {count} projectdump output file(s) found in the project: {files}",
+    'resumed': "⏩ Resuming after {path} ({count} files already in the dump)",
+    'resume_unusable': "⚠️  Cannot resume ({reason}), starting from scratch",
+    'resume_missing': "no valid checkpoint",
+    'resume_options': "the checkpoint was made with different options",
+    'resume_diff_mode': "not supported with --since/--diff",
+    'diff_mode': "🔀 Diff mode: {count} changed file(s)",
+    'entry_closure': "🧭 Entry mode: {count} file(s) reachable from {entries} entry file(s)",
+    'entry_missing': "❌ Entry file(s) not found in the project: {files}",
+    'git_error': "❌ Git error: {error}",
+    'index_written': "🗂️  Index created: ",
+    'index_error': "❌ Index error: {error}",
+    'trigram_written': "🔎 Trigram index created: {path} ({files} files, {trigrams} trigrams)",
+    'pattern_error': "❌ Invalid regular expression: {error}",
+    'serve_listening': "📡 Server listening on: ",
+    'stats_techs': "🛠️  Technologies: ",
+    'stats_extension': "Extension",
+    'stats_files': "Files",
+    'stats_bytes': "Bytes",
+    'stats_lines': "Lines",
+    'stats_tokens': "~Tokens",
+    'stats_tech': "Techs",
+    'stats_total': "Total",
+    'stats_largest': "📦 Largest files:",
+    'stats_skipped': "⏭️  Would be skipped: {generated} generated/minified, {large} too large, {duplicates} duplicate(s)",
+    'server_error': "❌ Server error: {error}",
 }
@@ -1,74 +1,107 @@
 import os
 import fnmatch
 
+TECH_INDICATORS = {
+    'python': ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile', '*.py', '*.ipynb'],
+    'jupyter': ['*.ipynb'],
+    'javascript': ['package.json', '*.js'],
+    'typescript': ['tsconfig.json', '*.ts'],
+    'react': ['*.jsx', '*.tsx', 'react.config.js'],
+    'vue': ['vue.config.js', '*.vue'],
+    'svelte': ['svelte.config.js', '*.svelte'],
+    'nextjs': ['next.config.js', 'pages/**/*.js', 'pages/**/*.jsx', 'pages/**/*.ts', 'pages/**/*.tsx'],
+    'nuxt': ['nuxt.config.js'],
+    'angular': ['angular.json', 'main.ts'],
+
+    'flutter': ['pubspec.yaml', '*.dart'],
+    'android': ['build.gradle', 'AndroidManifest.xml'],
+    'ios': ['*.xcodeproj', '*.xcworkspace'],
+
+    'java': ['pom.xml', '*.java'],
+    'kotlin': ['*.kt'],
+    'csharp': ['*.csproj', 'Program.cs'],
+    'php': ['composer.json'],
+    'ruby': ['Gemfile'],
+    'go': ['go.mod', '*.go'],
+    'rust': ['Cargo.toml'],
+    'elixir': ['mix.exs'],
+    'dart': ['pubspec.yaml'],
+    'r': ['*.R', '*.Rproj'],
+    'scala': ['build.sbt'],
+    'docker': ['Dockerfile'],
+    'kubernetes': ['k8s/', 'helm/'],
+    'terraform': ['*.tf'],
+    'ansible': ['ansible.cfg'],
+    'github_actions': ['.github/workflows/'],
+    'gitlab_ci': ['.gitlab-ci.yml'],
+    'circleci': ['.circleci/config.yml'],
+    'deno': ['deno.json'],
+    'bun': ['bun.lockb'],
+
+    'c': ['.c', '.h'],
+    'cpp': ['.cpp', '.hpp'], 
+}
+
+
 def detect_project_tech(project_path):
     """Tự động phát hiện công nghệ dự án dựa trên các file đặc trưng, hỗ trợ glob"""
-    tech_indicators = {
-        'python': ['requirements.txt', 'setup.py', 'pyproject.toml', 'Pipfile', '*.py', '*.ipynb'],
-        'javascript': ['package.json', '*.js'],
-        'typescript': ['tsconfig.json', '*.ts'],
-        'react': ['*.jsx', '*.tsx', 'react.config.js'],
-        'vue': ['vue.config.js', '*.vue'],
-        'svelte': ['svelte.config.js', '*.svelte'],
-        'nextjs': ['next.config.js', 'pages/**/*.js', 'pages/**/*.jsx', 'pages/**/*.ts', 'pages/**/*.tsx'],
-        'nuxt': ['nuxt.config.js'],
-        'angular': ['angular.json', 'main.ts'],
-
-        'flutter': ['pubspec.yaml', '*.dart'],
-        'android': ['build.gradle', 'AndroidManifest.xml'],
-        'ios': ['*.xcodeproj', '*.xcworkspace'],
-
-        'java': ['pom.xml', '*.java'],
-        'kotlin': ['*.kt'],
-        'csharp': ['*.csproj', 'Program.cs'],
-        'php': ['composer.json'],
-        'ruby': ['Gemfile'],
-        'go': ['go.mod', '*.go'],
-        'rust': ['Cargo.toml'],
-        'elixir': ['mix.exs'],
-        'dart': ['pubspec.yaml'],
-        'r': ['*.R', '*.Rproj'],
-        'scala': ['build.sbt'],
-        'docker': ['Dockerfile'],
-        'kubernetes': ['k8s/', 'helm/'],
-        'terraform': ['*.tf'],
-        'ansible': ['ansible.cfg'],
-        'github_actions': ['.github/workflows/'],
-        'gitlab_ci': ['.gitlab-ci.yml'],
-        'circleci': ['.circleci/config.yml'],
-        'deno': ['deno.json'],
-        'bun': ['bun.lockb'],
-
-        'c': ['.c', '.h'],
-        'cpp': ['.cpp', '.hpp'], 
-    }
-
     detected_techs = set()
 
     for root, dirs, files in os.walk(project_path):
         rel_root = os.path.relpath(root, project_path)
-        for tech, patterns in tech_indicators.items():
-            for pattern in patterns:
-                if "**" in pattern or "*" in pattern:
-                    full_path = os.path.join(rel_root, '').replace("\\", "/")
-                    for file in files:
-                        file_path = os.path.join(full_path, file)
-                        if fnmatch.fnmatchcase(file_path, pattern):
-                            detected_techs.add(tech)
-                else:
-                    for file in files:
-                        if file.lower() == pattern.lower():
-                            detected_techs.add(tech)
-
-        # Extra logic: add implied techs
-        if 'nextjs' in detected_techs:
-            detected_techs.update(['react', 'javascript', 'typescript'])
-        if 'nuxt' in detected_techs:
-            detected_techs.update(['vue', 'javascript', 'typescript'])
+        _match_tech_indicators(TECH_INDICATORS, rel_root, files, detected_techs)
+
+    _add_implied_techs(detected_techs)
+    return sorted(detected_techs)
 
+
+def detect_tech_from_paths(project_path, rel_paths):
+    """
+    Detect techs from an explicit list of project-relative file paths instead of a full walk.
+    Files at the project root are always considered so top-level manifests (package.json, go.mod...) still count.
+    """
+    files_by_dir = {}
+    for rel_path in rel_paths:
+        rel_dir, name = os.path.split(rel_path)
+        files_by_dir.setdefault(rel_dir or '.', set()).add(name)
+    try:
+        root_files = [n for n in os.listdir(project_path) if os.path.isfile(os.path.join(project_path, n))]
+    except OSError:
+        root_files = []
+    files_by_dir.setdefault('.', set()).update(root_files)
+
+    detected_techs = set()
+    for rel_root, files in files_by_dir.items():
+        _match_tech_indicators(TECH_INDICATORS, rel_root, sorted(files), detected_techs)
+
+    _add_implied_techs(detected_techs)
     return sorted(detected_techs)
 
 
+def _match_tech_indicators(tech_indicators, rel_root, files, detected_techs):
+    """Add to detected_techs every tech whose indicators match a file of one directory"""
+    for tech, patterns in tech_indicators.items():
+        for pattern in patterns:
+            if "**" in pattern or "*" in pattern:
+                full_path = os.path.join(rel_root, '').replace("\\", "/")
+                for file in files:
+                    file_path = os.path.join(full_path, file)
+                    if fnmatch.fnmatchcase(file_path, pattern):
+                        detected_techs.add(tech)
+            else:
+                for file in files:
+                    if file.lower() == pattern.lower():
+                        detected_techs.add(tech)
+
+
+def _add_implied_techs(detected_techs):
+    # Extra logic: add implied techs
+    if 'nextjs' in detected_techs:
+        detected_techs.update(['react', 'javascript', 'typescript'])
+    if 'nuxt' in detected_techs:
+        detected_techs.update(['vue', 'javascript', 'typescript'])
+
+
 def get_extensions_by_tech(techs):
     tech_extensions = {
         # Python & Data Science
@@ -0,0 +1,99 @@
+import json
+import os
+
+INDEX_SUFFIX = '.idx'
+INDEX_VERSION = 1
+
+
+class DumpIndexError(Exception):
+    """Raised when a dump index is missing, stale or does not contain the requested path"""
+
+
+def index_path_for(dump_path):
+    """Return the sidecar index path of a dump (dump path + '.idx')"""
+    return dump_path + INDEX_SUFFIX
+
+
+def write_index(dump_path, output_format, entries):
+    """
+    Write the sidecar index of a finished dump.
+
+    entries: list of (rel_path, offset, length, size, sha256) where offset/length locate
+    the file content (text format) or the file record (jsonl format) in the dump, and
+    size/sha256 describe the original content bytes.
+    The dump size is recorded so a dump rewritten without its index is detected.
+    """
+    index = {
+        'version': INDEX_VERSION,
+        'format': output_format,
+        'dump_size': os.path.getsize(dump_path),
+        'files': {rel_path: [offset, length, size, sha256] for rel_path, offset, length, size, sha256 in entries},
+    }
+    index_path = index_path_for(dump_path)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+    return index_path
+
+
+def load_index(dump_path):
+    """Load and validate the sidecar index of dump_path"""
+    index_path = index_path_for(dump_path)
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        raise DumpIndexError(f"No index found for {dump_path} (expected {index_path})")
+    except ValueError as e:
+        raise DumpIndexError(f"Invalid index {index_path}: {e}")
+
+    if index.get('version') != INDEX_VERSION:
+        raise DumpIndexError(f"Unsupported index version in {index_path}")
+    if index.get('dump_size') != os.path.getsize(dump_path):
+        raise DumpIndexError(f"Index {index_path} is stale, regenerate the dump")
+    return index
+
+
+def list_files(dump_path):
+    """Return [(rel_path, size, sha256)] for every file of the dump, in dump order"""
+    index = load_index(dump_path)
+    files = sorted(index['files'].items(), key=lambda item: item[1][0])
+    return [(rel_path, size, sha256) for rel_path, (_, _, size, sha256) in files]
+
+
+def read_section(dump_path, offset, length):
+    """Read length bytes at offset without scanning the rest of the dump"""
+    with open(dump_path, 'rb') as f:
+        f.seek(offset)
+        return f.read(length)
+
+
+def extract_file(dump_path, rel_path):
+    """Return the content of rel_path stored in the dump, located through the index"""
+    index = load_index(dump_path)
+    entry = index['files'].get(os.path.normpath(rel_path))
+    if entry is None:
+        raise DumpIndexError(f"{rel_path} is not in {dump_path}")
+
+    offset, length = entry[0], entry[1]
+    return _decode_section(index, read_section(dump_path, offset, length))
+
+
+def iter_file_contents(dump_path, index, rel_paths=None):
+    """
+    Yield (rel_path, content) for the files of a loaded index in dump order,
+    or only for rel_paths, reading every section through one file handle.
+    """
+    files = index['files']
+    wanted = files if rel_paths is None else rel_paths
+    ordered = sorted(wanted, key=lambda rel_path: files[rel_path][0])
+    with open(dump_path, 'rb') as f:
+        for rel_path in ordered:
+            offset, length = files[rel_path][0], files[rel_path][1]
+            f.seek(offset)
+            yield rel_path, _decode_section(index, f.read(length))
+
+
+def _decode_section(index, data):
+    if index['format'] == 'jsonl':
+        return json.loads(data)['content']
+    return data.decode('utf-8')
@@ -0,0 +1,83 @@
+import os
+from collections import namedtuple
+
+from projectdump.checkpoint import checkpoint_path_for, journal_path_for
+from projectdump.dump_index import index_path_for
+from projectdump.strip import parse_strip_options
+from projectdump.writers import OUTPUT_FORMATS
+
+# One output of a fan-out dump (--emit format:path[:options]). None options inherit the
+# value given for the whole dump (--max-output-bytes, --strip, --redact).
+EmitSpec = namedtuple('EmitSpec', ['output_format', 'path', 'max_output_bytes', 'strip', 'redact'])
+
+_SIZE_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_byte_size(value):
+    """Parse a byte count with an optional K/M/G suffix (powers of 1024)"""
+    number, multiplier = value.strip(), 1
+    if number[-1:].upper() in _SIZE_UNITS:
+        number, multiplier = number[:-1], _SIZE_UNITS[number[-1].upper()]
+    try:
+        size = int(float(number) * multiplier)
+    except ValueError:
+        raise ValueError(f"invalid size: {value!r} (e.g. 500000, 200K, 50M, 2G)")
+    if size <= 0:
+        raise ValueError(f"size must be positive: {value!r}")
+    return size
+
+
+def emit_spec_to_json(spec):
+    """JSON friendly form of an EmitSpec, for dump server requests"""
+    return dict(spec._asdict(), strip=sorted(spec.strip) if spec.strip is not None else None)
+
+
+def emit_spec_from_json(fields):
+    spec = EmitSpec(**fields)
+    return spec._replace(strip=frozenset(spec.strip)) if spec.strip is not None else spec
+
+
+def parse_emit_spec(value):
+    """
+    Parse `format:path[:options]`, options being comma separated `max-bytes=SIZE`,
+    `strip=PART+PART` and `redact` (or `redact=no`). Raises ValueError.
+    """
+    output_format, sep, rest = value.partition(':')
+    if not sep or not rest:
+        raise ValueError(f"expected format:path[:options], got {value!r}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"unknown format {output_format!r} (choose from {', '.join(OUTPUT_FORMATS)})")
+    path, _, options = rest.partition(':')
+    if not path:
+        raise ValueError(f"missing output path in {value!r}")
+
+    max_output_bytes = strip = redact = None
+    for option in filter(None, (o.strip() for o in options.split(','))):
+        key, has_value, option_value = option.partition('=')
+        if key == 'max-bytes' and has_value:
+            max_output_bytes = parse_byte_size(option_value)
+        elif key == 'strip' and has_value:
+            strip = parse_strip_options(option_value.replace('+', ','))
+        elif key == 'redact' and option_value in ('', 'yes', 'no'):
+            redact = option_value != 'no'
+        else:
+            raise ValueError(f"unknown emit option {option!r} (max-bytes=SIZE, strip=PART+PART, redact)")
+    return EmitSpec(output_format, path, max_output_bytes, strip, redact)
+
+
+def check_emit_paths(project_path, specs, output_filename=None):
+    """
+    Raise ValueError when two outputs would write the same file: the same path given twice
+    (relative to project_path or not), or a path that is the index, index journal or
+    checkpoint of another output. output_filename is an -o given along with --emit.
+    """
+    written = {}  # resolved path -> path given by the user
+    for number, path in enumerate([spec.path for spec in specs] + ([output_filename] if output_filename else [])):
+        dump_path = os.path.normcase(os.path.abspath(os.path.join(project_path, path)))
+        files = [dump_path, index_path_for(dump_path), journal_path_for(dump_path)]
+        if number == 0:
+            files.append(checkpoint_path_for(dump_path))
+        for file_path in files:
+            if file_path in written:
+                raise ValueError(f"{path!r} and {written[file_path]!r} would write the same file")
+            written[file_path] = path
@@ -1,7 +1,8 @@
 from pathlib import Path
 from typing import Union, Iterable
 import os
-import fnmatch 
+import fnmatch
+import re
 
 def get_essential_files():
     return set()
@@ -69,6 +70,15 @@ def get_exclude_patterns(project_path: str):
         '*.env', '*.env.*', '*.ini', '*.toml', '*.bak', '*.swp', '*.swo',
     }
 
+    custom_exclude_dirs, custom_exclude_files = read_dumpignore(project_path)
+
+    exclude_dirs = default_exclude_dirs.union(custom_exclude_dirs)
+    exclude_files = default_exclude_files.union(custom_exclude_files)
+    
+    return exclude_dirs, exclude_files
+
+def read_dumpignore(project_path: str):
+    """Return the (exclude_dirs, exclude_files) patterns of the .dumpignore in project_path alone"""
     custom_exclude_dirs = set()
     custom_exclude_files = set()
 
@@ -91,10 +101,7 @@ def get_exclude_patterns(project_path: str):
         except Exception as e:
             print(f"Warning: Could not read or parse .dumpignore file at {dumpignore_path}: {e}")
 
-    exclude_dirs = default_exclude_dirs.union(custom_exclude_dirs)
-    exclude_files = default_exclude_files.union(custom_exclude_files)
-    
-    return exclude_dirs, exclude_files
+    return custom_exclude_dirs, custom_exclude_files
 
 def should_exclude_path(rel_dir_path: str, exclude_dir_patterns: Iterable[str]) -> bool:
     """
@@ -167,3 +174,170 @@ def should_exclude_file(filename: str, rel_filepath: str, exclude_file_patterns:
                 
     return False
 
+
+def is_target_file(file, file_ext_with_dot, detected_techs, target_extensions):
+    """Whether a file that passed the exclusions belongs to the detected techs"""
+    if not detected_techs:
+        # If no specific tech detected, we attempt to include "all code files".
+        # This means we rely mainly on exclusion rules (size, exclude_dirs, exclude_files from .dumpignore)
+        # Files already passed the exclusion matcher during the scan.
+        return True
+    # Techs detected, so filter by target_extensions
+    # Check for full filename match (e.g. "Dockerfile" in target_extensions)
+    # or for extension match (e.g. ".py" in target_extensions)
+    return file in target_extensions or bool(file_ext_with_dot and file_ext_with_dot in target_extensions)
+
+
+class ExcludeMatcher:
+    """
+    Precompiled equivalent of should_exclude_path / should_exclude_file.
+    All patterns are folded into a few combined regexes once, instead of re-normalizing
+    and fnmatch-ing every pattern for every path.
+    """
+
+    def __init__(self, exclude_dir_patterns: Iterable[str], exclude_file_patterns: Iterable[str],
+                 prune_dirs: Iterable[str] = (), base: str = ''):
+        # Project-relative directories excluded as a whole (only that exact path, unlike dir names)
+        self.prune_dirs = {_to_posix(rel_dir) for rel_dir in prune_dirs}
+        # Patterns relative to an ancestor of the matched paths: base is the path of their
+        # root from that ancestor (the patterns of a project applied to one of its packages)
+        self.base = _to_posix(base) + '/' if base and base != os.curdir else ''
+        self.dir_names = set()
+        dir_globs = []
+        for pattern in exclude_dir_patterns:
+            normalized_pattern = Path(pattern).as_posix()
+            if "/" not in normalized_pattern and "*" not in normalized_pattern and \
+               "?" not in normalized_pattern and "[" not in normalized_pattern:
+                self.dir_names.add(normalized_pattern.lower())
+            else:
+                dir_globs.append(normalized_pattern)
+                if not normalized_pattern.endswith('*'):
+                    dir_globs.append(normalized_pattern + '/*')
+        self._dir_re = _combine_globs(dir_globs)
+
+        # Slash-free '*.ext' and literal patterns match the same files by path or by name,
+        # so they become a suffix tuple and a name set instead of regex alternatives
+        self.file_names = set()
+        file_suffixes = set()
+        file_patterns = []
+        for pattern in exclude_file_patterns:
+            normalized_pattern = Path(pattern).as_posix()
+            if "/" in normalized_pattern or _has_glob(normalized_pattern[1:]):
+                file_patterns.append(normalized_pattern)
+            elif normalized_pattern.startswith('*'):
+                file_suffixes.add(normalized_pattern[1:])
+            elif not _has_glob(normalized_pattern):
+                self.file_names.add(normalized_pattern)
+            else:
+                file_patterns.append(normalized_pattern)
+        self.file_suffixes = tuple(sorted(file_suffixes))
+        self._file_path_re = _combine_globs(file_patterns)
+        self._file_name_re = _combine_globs([p for p in file_patterns if "/" not in p])
+
+    def exclude_dir(self, rel_dir_path: str) -> bool:
+        normalized_rel_dir_path = _to_posix(rel_dir_path)
+        if normalized_rel_dir_path in self.prune_dirs:
+            return True
+        normalized_rel_dir_path = self.base + normalized_rel_dir_path
+        if self.dir_names and any(part.lower() in self.dir_names for part in normalized_rel_dir_path.split('/')):
+            return True
+        return self._dir_re is not None and self._dir_re.match(normalized_rel_dir_path) is not None
+
+    def exclude_file(self, filename: str, rel_filepath: str) -> bool:
+        if filename in self.file_names or filename.endswith(self.file_suffixes):
+            return True
+        normalized_rel_filepath = self.base + _to_posix(rel_filepath)
+        if self._file_path_re is not None and self._file_path_re.match(normalized_rel_filepath):
+            return True
+        return self._file_name_re is not None and self._file_name_re.match(filename) is not None
+
+
+class AnyExcludeMatcher:
+    """Several exclude matchers applied together: a path is excluded when any of them excludes it"""
+
+    def __init__(self, matchers):
+        self.matchers = list(matchers)
+
+    def exclude_dir(self, rel_dir_path: str) -> bool:
+        return any(matcher.exclude_dir(rel_dir_path) for matcher in self.matchers)
+
+    def exclude_file(self, filename: str, rel_filepath: str) -> bool:
+        return any(matcher.exclude_file(filename, rel_filepath) for matcher in self.matchers)
+
+
+def _to_posix(rel_path):
+    # Scanned paths are already normalized, building a Path per entry dominated warm scans
+    return rel_path.replace(os.sep, '/') if os.sep != '/' else rel_path
+
+
+def _combine_globs(patterns):
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{fnmatch.translate(p)})' for p in sorted(set(patterns))))
+
+
+class IncludeMatcher:
+    """
+    --include globs (relative to the project root). `**` spans any number of directories,
+    `*` and `?` stay within one path component, and a pattern without wildcards selects
+    that file or everything below that directory.
+    roots holds the literal directory prefixes of the patterns: only those are walked.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [Path(p).as_posix().strip('/') for p in patterns]
+        self._re = re.compile('|'.join(f'(?:{_include_to_regex(p)})' for p in self.patterns))
+        self.roots = _include_roots(self.patterns)
+
+    def match(self, rel_filepath: str) -> bool:
+        return self._re.fullmatch(Path(rel_filepath).as_posix()) is not None
+
+
+def _has_glob(component):
+    return any(c in component for c in '*?[')
+
+
+def _include_to_regex(pattern):
+    if not _has_glob(pattern):
+        return re.escape(pattern) + '(?:/.*)?'
+    out = []
+    i = 0
+    while i < len(pattern):
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            out.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            out.append('[^/]')
+            i += 1
+        elif pattern[i] == '[' and ']' in pattern[i + 2:]:
+            end = pattern.index(']', i + 2)
+            body = pattern[i + 1:end]
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            out.append('[' + body.replace('\\', '\\\\') + ']')
+            i = end + 1
+        else:
+            out.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(out)
+
+
+def _include_roots(patterns):
+    """Literal leading components of every pattern, without roots nested in other roots"""
+    roots = set()
+    for pattern in patterns:
+        literal = []
+        for component in pattern.split('/'):
+            if _has_glob(component):
+                break
+            literal.append(component)
+        roots.add('/'.join(literal))
+    if '' in roots:
+        return ['']
+    return sorted(r for r in roots if not any(r.startswith(other + '/') for other in roots))
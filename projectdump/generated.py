@@ -0,0 +1,79 @@
+import fnmatch
+import re
+
+# What --generated does with generated/minified files
+GENERATED_MODES = ('skip', 'summary', 'keep')
+
+# Bytes looked at from the start of a file: header comment and first lines
+SNIFF_BYTES = 8192
+# Files larger than this are sniffed from disk before being read in full
+SNIFF_READ_THRESHOLD = 64 * 1024
+
+# Minified or bundled code: a very long line, or long lines on average over enough content.
+# Only checked for web assets, prose (markdown...) legitimately has long lines.
+MINIFIED_MAX_LINE = 1000
+MINIFIED_AVG_LINE = 250
+MINIFIED_MIN_CHARS = 2048
+MINIFIABLE_EXTENSIONS = {'.js', '.mjs', '.cjs', '.jsx', '.ts', '.tsx', '.css', '.scss', '.json', '.html'}
+
+GENERATED_NAME_PATTERNS = (
+    '*.min.js', '*.min.mjs', '*.min.css', '*.map', '*.bundle.js', '*.chunk.js', '*.chunk.css',
+    '*_pb2.py', '*_pb2.pyi', '*_pb2_grpc.py', '*.pb.go', '*.pb.gw.go', '*.pb.cc', '*.pb.h',
+    '*_pb.js', '*_pb.d.ts', '*_grpc_pb.js', '*.pb.swift', '*.pb.dart', '*.pbenum.dart',
+    '*.g.dart', '*.freezed.dart', '*.g.cs', '*.designer.cs', '*.generated.*', '*_generated.go',
+)
+
+# Marker comments of code generators (protoc, openapi-generator, go generate, Django, Flutter...).
+# Only comment lines count (and a docstring opening with "Generated by"): the phrases are
+# common in prose, e.g. "primary keys are auto-generated by the database". "generated
+# by/from" and "auto-generated" must open the comment, "@generated", "do not edit" and
+# "this file is generated" may be anywhere in it.
+_COMMENT_MARKER = r'(?:#|//|/\*|\*|--|;|<!--|%|\{-|\(\*)'
+_HEADER_RE = re.compile(
+    r'^[ \t]*(?:' + _COMMENT_MARKER + r'|"""|' + r"''')[^\w\n]*(?:code |file )?"
+    r'(?:(?:automatically |auto-?)generated\b|generated (?:by|from)\b)'
+    r'|^[ \t]*' + _COMMENT_MARKER + r'.*?(?P<marker>@generated\b|\bdo not edit\b'
+    r'|\bthis (?:file|code) (?:is|was|has been) (?:automatically |auto-?)?generated\b)',
+    re.IGNORECASE | re.MULTILINE,
+)
+_HEADER_LINES = 10
+
+
+def generated_by_name(filename):
+    """Return the generated-file name pattern matching filename, or None"""
+    filename = filename.lower()
+    for pattern in GENERATED_NAME_PATTERNS:
+        if fnmatch.fnmatchcase(filename, pattern):
+            return pattern
+    return None
+
+
+def generated_by_content(head, file_ext):
+    """
+    Look at the first SNIFF_BYTES characters of a file. Return ('header', marker) for a
+    generator comment in the first lines, ('minified', (avg, max)) for minified code,
+    or None.
+    """
+    head = head[:SNIFF_BYTES]
+    lines = head.split('\n')
+    match = _HEADER_RE.search('\n'.join(lines[:_HEADER_LINES]))
+    if match:
+        return 'header', match.group('marker') or match.group(0).lstrip(' \t#/*;!-%<{(\'"')
+
+    if file_ext.lower() not in MINIFIABLE_EXTENSIONS:
+        return None
+    if len(lines) > 1 and len(head) == SNIFF_BYTES:
+        lines.pop()  # cut by the sniff block, its length is unknown
+    if not lines:
+        return None
+    longest = max(len(line) for line in lines)
+    average = sum(len(line) for line in lines) // len(lines)
+    if longest >= MINIFIED_MAX_LINE or (average >= MINIFIED_AVG_LINE and len(head) >= MINIFIED_MIN_CHARS):
+        return 'minified', (average, longest)
+    return None
+
+
+def read_head(file_path):
+    """Read the first SNIFF_BYTES bytes of a file, decoded like a full read"""
+    with open(file_path, 'rb') as f:
+        return f.read(SNIFF_BYTES).decode('utf-8', errors='ignore').replace('\r\n', '\n').replace('\r', '\n')
@@ -0,0 +1,88 @@
+import os
+import subprocess
+
+
+class GitDiffError(Exception):
+    """Raised when the list of changed files cannot be obtained from git"""
+
+
+def _run_git(project_path, args):
+    """Run a git command inside project_path and return its raw stdout"""
+    try:
+        result = subprocess.run(
+            ['git'] + args,
+            cwd=project_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise GitDiffError("git executable not found")
+
+    if result.returncode != 0:
+        raise GitDiffError(result.stderr.decode('utf-8', errors='replace').strip())
+    return result.stdout
+
+
+def _split_nul(output):
+    # -z output: NUL separated, paths are never quoted or escaped
+    return [p for p in output.decode('utf-8', errors='surrogateescape').split('\0') if p]
+
+
+def get_changed_files(project_path, since=None, diff_range=None):
+    """
+    Return the sorted project-relative paths of files changed between two revisions.
+
+    Args:
+        project_path: Project directory, may be a subdirectory of the git work tree.
+        since: Revision to compare the working tree against (`git diff <rev>`).
+               Untracked files that are not git-ignored count as changed too.
+        diff_range: Commit range such as "A..B" or "A...B".
+
+    Raises GitDiffError when git fails, or for a revision starting with '-'.
+
+    Only paths inside project_path are returned (`git diff --relative`). Deleted
+    files and paths that no longer exist in the working tree are left out since
+    there is nothing to dump for them; contents are always read from the
+    working tree.
+    """
+    if bool(since) == bool(diff_range):
+        raise ValueError("Exactly one of 'since' or 'diff_range' must be given")
+    revision = since or diff_range
+    if revision.startswith('-'):
+        # git would take it for an option (--output=<file> writes anywhere)
+        raise GitDiffError(f"invalid revision: {revision!r}")
+
+    diff_args = ['diff', '--name-only', '-z', '--relative', '--diff-filter=d']
+    if since:
+        paths = _split_nul(_run_git(project_path, diff_args + [since, '--']))
+        paths += _split_nul(_run_git(project_path, ['ls-files', '-z', '--others', '--exclude-standard']))
+    else:
+        paths = _split_nul(_run_git(project_path, diff_args + [diff_range, '--']))
+
+    changed = set()
+    for posix_path in paths:
+        rel_path = os.path.join(*posix_path.split('/'))
+        if os.path.isfile(os.path.join(project_path, rel_path)):
+            changed.add(rel_path)
+    return sorted(changed)
+
+
+def add_directory_neighbours(project_path, rel_paths):
+    """
+    Extend rel_paths with the other files living in the same directories.
+
+    Only the affected directories are listed (not walked), so the cost stays
+    proportional to the size of the change. Exclusion rules are applied later
+    by the aggregator like for any other candidate file.
+    """
+    result = set(rel_paths)
+    for rel_dir in {os.path.dirname(p) for p in rel_paths}:
+        abs_dir = os.path.join(project_path, rel_dir)
+        try:
+            names = os.listdir(abs_dir)
+        except OSError:
+            continue
+        for name in names:
+            if os.path.isfile(os.path.join(abs_dir, name)):
+                result.add(os.path.join(rel_dir, name) if rel_dir else name)
+    return sorted(result)
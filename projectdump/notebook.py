@@ -0,0 +1,82 @@
+import json
+
+NOTEBOOK_EXTENSION = '.ipynb'
+
+# Kernel language -> (lang hint of the dump section, line comment used for cell markers)
+_KERNEL_LANGS = {
+    'python': ('py', '#'),
+    'r': ('r', '#'),
+    'julia': ('jl', '#'),
+    'scala': ('scala', '//'),
+    'javascript': ('js', '//'),
+    'typescript': ('ts', '//'),
+    'c++': ('cpp', '//'),
+    'go': ('go', '//'),
+    'rust': ('rs', '//'),
+}
+
+
+class NotebookError(ValueError):
+    """Raised when a .ipynb file is not a notebook that can be converted"""
+
+
+def notebook_to_source(content, include_markdown=False):
+    """
+    Convert the JSON of a Jupyter notebook (nbformat 3 or 4) to a script in the
+    "percent" format: each code cell under a `# %%` marker, markdown cells (only with
+    include_markdown) commented out under `# %% [markdown]`. Outputs, execution counts
+    and metadata are dropped. Returns (source, lang_hint).
+    """
+    try:
+        notebook = json.loads(content)
+    except ValueError as e:
+        raise NotebookError(f"invalid notebook JSON: {e}")
+    if not isinstance(notebook, dict):
+        raise NotebookError("not a notebook")
+
+    if 'worksheets' in notebook:  # nbformat 3
+        sheets = notebook['worksheets']
+        if not isinstance(sheets, list) or not all(isinstance(sheet, dict) for sheet in sheets):
+            raise NotebookError("invalid notebook worksheets")
+        cells = []
+        for sheet in sheets:
+            sheet_cells = sheet.get('cells', [])
+            if not isinstance(sheet_cells, list):
+                raise NotebookError("notebook has no cells")
+            cells.extend(sheet_cells)
+    else:
+        cells = notebook.get('cells')
+    if not isinstance(cells, list):
+        raise NotebookError("notebook has no cells")
+
+    lang_hint, comment = _KERNEL_LANGS.get(_kernel_language(notebook), ('py', '#'))
+    blocks = []
+    for cell in cells:
+        if not isinstance(cell, dict):
+            raise NotebookError("invalid notebook cell")
+        cell_type = cell.get('cell_type')
+        source = cell.get('source', cell.get('input', ''))
+        if isinstance(source, list) and all(isinstance(line, str) for line in source):
+            source = ''.join(source)
+        if not isinstance(source, str):
+            raise NotebookError("invalid notebook cell source")
+        source = source.rstrip('\n')
+        if cell_type == 'code':
+            blocks.append(f"{comment} %%\n{source}" if source else f"{comment} %%")
+        elif cell_type in ('markdown', 'heading') and include_markdown and source:
+            commented = '\n'.join(f"{comment} {line}".rstrip() for line in source.split('\n'))
+            blocks.append(f"{comment} %% [markdown]\n{commented}")
+    return '\n\n'.join(blocks) + '\n' if blocks else '', lang_hint
+
+
+def _kernel_language(notebook):
+    metadata = _dict(notebook.get('metadata'))
+    language = _dict(metadata.get('kernelspec')).get('language') or _dict(metadata.get('language_info')).get('name')
+    if not language:
+        language = metadata.get('language', 'python')  # nbformat 3
+    return str(language).lower()
+
+
+def _dict(value):
+    # Metadata is optional: a malformed value counts as missing
+    return value if isinstance(value, dict) else {}
@@ -0,0 +1,236 @@
+import ast
+import hashlib
+import re
+
+# Bump when outlines change, so cached outlines of older versions are not reused
+OUTLINE_VERSION = 2
+
+# Lines longer than this are cut in outlines (minified code, long literals)
+MAX_OUTLINE_LINE = 200
+# Assignments kept in an outline show at most this many lines
+MAX_ASSIGNMENT_LINES = 3
+
+PYTHON_LANGS = {'py', 'pyi', 'pyw', 'pyx'}
+
+# Rules stay on their line ([ \t], not \s), except parameter lists, which stop at the next
+# bracket: a rule scanning on to the end of the file at each line start (`[^;]*`) makes the
+# outline quadratic.
+_ACCESS = r'(?:public|private|protected|internal)'
+_MODIFIERS = (r'(?:export|default|declare|abstract|static|final|sealed|open|override|async|virtual|readonly|'
+              r'inline|extern|unsafe|data|inner|companion|partial|const|pub(?:\([\w:]+\))?)')
+_C_LIKE_RULES = [
+    # Imports and packages
+    r'(?:import|package|using|use|#include|#import|require_once|require|include_once)\b',
+    r'export\s+(?:\*|\{[^}]*\}|type\s+\{[^}]*\})\s+from\b',
+    # Declarations, with their modifiers
+    rf'(?:{_ACCESS}[ \t]+|{_MODIFIERS}[ \t]+)*(?:class|interface|struct|enum|trait|impl|type|typedef|namespace|'
+    r'module|object|record|protocol|extension|mixin|func|fun|fn|function\*?|def|macro_rules!)\s',
+    # Go import specs inside `import (...)` blocks
+    r'(?!return\b)(?:[\w.]+[ \t]+)?"[^"\s]+"[ \t]*$',
+    # Members starting with an access modifier (methods, fields, properties)
+    rf'{_ACCESS}\b',
+    # Class methods without modifiers: name(args) {   (control statements excluded)
+    r'(?:(?:static|async|get|set)[ \t]+)*\*?#?(?!(?:if|for|while|switch|catch|with|return|function|else)\b)'
+    r'[A-Za-z_$][\w$]*(?:[ \t]*<[^>\n]*>)?[ \t]*\([^;()]*(?:\([^;()]*\)[^;()]*)*\)\s*(?::[^;{=\n]+)?'
+    r'\{[ \t]*$',
+]
+# Only at the top level: constants and variables (inside functions they are local)
+_C_LIKE_TOP_LEVEL = r'(?:export[ \t]+)?(?:const|let|var|val|static|final|#define)\b'
+# C/C++ function definitions and prototypes start at column 0 with their return type
+_C_FUNCTION = (r'(?!(?:if|for|while|switch|return|else|do|case|goto)\b)[A-Za-z_][\w \t\*&:<>,~]*[ \t][\*&]*'
+               r'[A-Za-z_~][\w:~]*[ \t]*\([^;\n]*$')
+
+_RUBY_RULES = [
+    r'(?:require|require_relative|load|include|extend|module|class|def|attr_reader|attr_writer|attr_accessor|'
+    r'private|protected|public)\b',
+    r'[A-Z][A-Z0-9_]*[ \t]*=',
+]
+_ELIXIR_RULES = [
+    r'(?:defmodule|def|defp|defmacro|defmacrop|defstruct|defprotocol|defimpl|defdelegate|defexception|import|'
+    r'alias|use|require)\b',
+    r'@(?:moduledoc|type|typep|opaque|spec|callback|behaviour)\b',
+]
+_R_RULES = [r'(?:library|require|source)\(', r'[\w.]+[ \t]*(?:<-|=)[ \t]*function\b']
+_SHELL_RULES = [r'function[ \t]+[\w-]+', r'[\w-]+[ \t]*\(\)', r'(?:export[ \t]+)?[A-Z_][A-Z0-9_]*=', r'(?:source|\.)[ \t]']
+_TERRAFORM_RULES = [r'(?:resource|data|module|variable|output|provider|locals|terraform)\b']
+
+
+def _line_regex(rules, top_level_rules=()):
+    """
+    One regex for a language: rules match at any indentation, top level rules at column 0.
+    The indentation is matched once, without backtracking ((?=(...))\1 stands for the
+    possessive [ \t]*+ of Python 3.11).
+    """
+    indented = r'(?=([ \t]*))\1(?:' + '|'.join(rules) + ')'
+    return re.compile('^(?:' + '|'.join([indented] + ['(?:' + rule + ')' for rule in top_level_rules]) + ')', re.M)
+
+
+_C_LIKE_RE = _line_regex(_C_LIKE_RULES, [_C_LIKE_TOP_LEVEL])
+_C_RE = _line_regex(_C_LIKE_RULES, [_C_LIKE_TOP_LEVEL, _C_FUNCTION])
+# lang_hint (file extension) -> regex matching the lines kept in the outline
+LINE_OUTLINES = {lang: _C_LIKE_RE for lang in (
+    'js', 'jsx', 'mjs', 'cjs', 'ts', 'tsx', 'mts', 'cts', 'vue', 'svelte', 'java', 'kt', 'kts', 'cs', 'go', 'rs',
+    'swift', 'dart', 'scala', 'sc', 'php')}
+LINE_OUTLINES.update({lang: _C_RE for lang in ('c', 'h', 'cc', 'cpp', 'cxx', 'hpp', 'hh', 'm', 'mm')})
+LINE_OUTLINES.update({lang: _line_regex(_RUBY_RULES) for lang in ('rb',)})
+LINE_OUTLINES.update({lang: _line_regex(_ELIXIR_RULES) for lang in ('ex', 'exs')})
+LINE_OUTLINES.update({lang: _line_regex(_R_RULES) for lang in ('r',)})
+LINE_OUTLINES.update({lang: _line_regex(_SHELL_RULES) for lang in ('sh', 'bash', 'zsh')})
+LINE_OUTLINES.update({lang: _line_regex(_TERRAFORM_RULES) for lang in ('tf',)})
+
+
+def can_outline(lang_hint):
+    """Whether files with this language hint (their extension) get an outline"""
+    lang_hint = lang_hint.lower()
+    return lang_hint in PYTHON_LANGS or lang_hint in LINE_OUTLINES
+
+
+def outline_content(content, lang_hint):
+    """
+    Structural summary of a source file: module docstring, imports, class and function
+    signatures (bodies replaced by `...`) and constants, or None when the language is not
+    supported or the file does not parse.
+    Python is read with ast; the other languages keep the lines that look like imports
+    and declarations (one regex per language, see LINE_OUTLINES).
+    """
+    lang_hint = lang_hint.lower()
+    if lang_hint in PYTHON_LANGS:
+        return _outline_python(content)
+    line_re = LINE_OUTLINES.get(lang_hint)
+    if line_re is None:
+        return None
+    lines = []
+    for match in line_re.finditer(content):
+        end = content.find('\n', match.start())
+        lines.append(_cut(content[match.start():end if end != -1 else len(content)].rstrip()))
+    return '\n'.join(lines) + '\n' if lines else ''
+
+
+def _cut(line):
+    return line if len(line) <= MAX_OUTLINE_LINE else line[:MAX_OUTLINE_LINE] + ' ...'
+
+
+def _outline_python(content):
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return None
+    lines = content.splitlines()
+    out = []
+    body = tree.body
+    if body and _is_docstring(body[0]):
+        out.extend(_node_lines(lines, body[0]))
+        body = body[1:]
+    _outline_python_body(lines, body, out, top_level=True)
+    return '\n'.join(_cut(line) for line in out) + '\n' if out else ''
+
+
+def _outline_python_body(lines, body, out, top_level):
+    for node in body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            out.extend(_node_lines(lines, node))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            if top_level and out and out[-1]:
+                out.append('')
+            first = node.decorator_list[0].lineno if node.decorator_list else node.lineno
+            colon_line, colon_col = _signature_colon(lines, node)
+            header = lines[first - 1:colon_line]
+            if node.body[0].lineno == colon_line:
+                # One-line body (def f(): return 1): replaced after the colon
+                out.extend(header[:-1] + [header[-1][:colon_col + 1] + ' ...'])
+                continue
+            out.extend(header)
+            indent = ' ' * (len(lines[node.lineno - 1]) - len(lines[node.lineno - 1].lstrip()) + 4)
+            members = node.body[1:] if _is_docstring(node.body[0]) else node.body
+            if _is_docstring(node.body[0]):
+                summary = node.body[0].value.value.strip().split('\n', 1)[0]
+                out.append(f'{indent}"""{summary}"""')
+            if isinstance(node, ast.ClassDef):
+                size = len(out)
+                _outline_python_body(lines, members, out, top_level=False)
+                if len(out) == size:
+                    out.append(indent + '...')
+            else:
+                out.append(indent + '...')
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)) and _is_declaration(node, top_level):
+            node_lines = _node_lines(lines, node)
+            if len(node_lines) > MAX_ASSIGNMENT_LINES:
+                node_lines = node_lines[:1] + [node_lines[0][:len(node_lines[0]) - len(node_lines[0].lstrip())] + '    ...']
+            out.extend(node_lines)
+        elif top_level and isinstance(node, (ast.If, ast.Try)):
+            # Conditional imports (try: import x / except ImportError, if TYPE_CHECKING:)
+            for child in ast.walk(node):
+                if isinstance(child, (ast.Import, ast.ImportFrom)):
+                    out.extend(line[child.col_offset:] for line in _node_lines(lines, child))
+
+
+def _signature_colon(lines, node):
+    """(line number, column) of the colon closing the signature of a def or class"""
+    if isinstance(node, ast.ClassDef):
+        parts = node.bases + node.keywords
+    else:
+        args = node.args
+        parts = (args.posonlyargs + args.args + args.kwonlyargs + args.defaults
+                 + [part for part in (args.vararg, args.kwarg, node.returns) if part is not None]
+                 + [default for default in args.kw_defaults if default is not None])
+    parts += getattr(node, 'type_params', [])
+    line, col = node.lineno, node.col_offset
+    for part in parts:
+        line, col = max((line, col), (part.end_lineno, part.end_col_offset))
+    # ast columns are UTF-8 byte offsets
+    col = len(lines[line - 1].encode('utf-8')[:col].decode('utf-8', errors='ignore'))
+    # Only brackets, commas, `->` and comments are left before the colon
+    while line <= len(lines):
+        text = lines[line - 1]
+        comment = text.find('#', col)
+        colon = text.find(':', col, comment if comment != -1 else len(text))
+        if colon != -1:
+            return line, colon
+        line, col = line + 1, 0
+    return node.body[0].lineno - 1, len(lines[node.body[0].lineno - 2])
+
+
+def _is_docstring(node):
+    return (isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant)
+            and isinstance(node.value.value, str))
+
+
+def _is_declaration(node, top_level):
+    """Class attributes, and module level constants, dunders, type aliases and annotated names"""
+    if not top_level or isinstance(node, ast.AnnAssign):
+        return True
+    names = [target.id for target in node.targets if isinstance(target, ast.Name)]
+    return bool(names) and all(name.lstrip('_')[:1].isupper() or (name.startswith('__') and name.endswith('__'))
+                               for name in names)
+
+
+def _node_lines(lines, node):
+    return lines[node.lineno - 1:getattr(node, 'end_lineno', node.lineno)]
+
+
+class OutlineCache:
+    """
+    Outlines by content hash, so unchanged files are not parsed again. Only the entries
+    used since the last finish() are kept (and persisted, see cache.save_outline_cache).
+    """
+
+    def __init__(self, entries=None):
+        self.entries = entries or {}  # content hash -> outline (None when the file has none)
+        self.used = {}
+        self.hits = 0
+
+    def get(self, content, lang_hint):
+        key = hashlib.sha1(f'{OUTLINE_VERSION}:{lang_hint.lower()}\0{content}'.encode('utf-8')).hexdigest()
+        if key in self.used:
+            return self.used[key]
+        if key in self.entries:
+            self.hits += 1
+            outline = self.entries[key]
+        else:
+            outline = outline_content(content, lang_hint)
+        self.used[key] = outline
+        return outline
+
+    def finish(self):
+        """Keep the entries used by the dump that just ended, and start counting again"""
+        self.entries, self.used, self.hits = self.used, {}, 0
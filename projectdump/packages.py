@@ -0,0 +1,114 @@
+import contextlib
+import io
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from projectdump.aggregator import aggregate_code
+from projectdump.detector import TECH_INDICATORS, detect_tech_from_paths
+from projectdump.dump_index import list_files
+from projectdump.filters import ExcludeMatcher, get_exclude_patterns, read_dumpignore
+from projectdump.scanner import scan_project
+
+# Manifests that make a directory a package root, among the indicators of TECH_INDICATORS
+PACKAGE_MANIFESTS = tuple(name for name in (
+    'package.json', 'pyproject.toml', 'setup.py', 'go.mod', 'Cargo.toml', 'pom.xml',
+    'composer.json', 'Gemfile', 'mix.exs', 'pubspec.yaml', 'build.sbt', 'deno.json',
+) if any(name in indicators for indicators in TECH_INDICATORS.values()))
+
+# Excluded by default, but where monorepos keep their workspaces (packages/*, lib/*)
+WORKSPACE_DIRS = {'packages', 'lib'}
+
+PACKAGE_INDEX_NAME = 'packages.json'
+ROOT_DUMP_NAME = '_root'
+
+
+def find_package_roots(project_path, follow_symlinks=False, walk_threads=1):
+    """
+    Return the project-relative directories holding a package manifest, sorted, always
+    starting with '' (the project root, which also gets the files outside every package).
+    Excluded directories (node_modules, build outputs, .dumpignore...) are not searched,
+    except for the default exclusion of WORKSPACE_DIRS.
+    """
+    exclude_dirs, exclude_files = get_exclude_patterns(project_path)
+    exclude_dirs = (exclude_dirs - WORKSPACE_DIRS) | read_dumpignore(project_path)[0]
+    raw_listings = {}
+    # Manifests such as pyproject.toml are excluded files, the unfiltered listings still have them
+    scan_project(project_path, ExcludeMatcher(exclude_dirs, exclude_files), raw_listings=raw_listings,
+                 follow_symlinks=follow_symlinks, workers=walk_threads)
+    roots = {''}
+    for rel_dir, entries in raw_listings.items():
+        if any(not entry.is_dir and entry.name in PACKAGE_MANIFESTS for entry in entries or ()):
+            roots.add(rel_dir)
+    return sorted(roots)
+
+
+def nested_roots(root, roots):
+    """Package roots directly or indirectly inside root, relative to root"""
+    prefix = root + os.sep if root else ''
+    return [other[len(prefix):] for other in roots if other != root and other.startswith(prefix)]
+
+
+def package_dump_name(root, output_format):
+    name = root.replace(os.sep, '__') if root else ROOT_DUMP_NAME
+    return name + ('.jsonl' if output_format == 'jsonl' else '.txt')
+
+
+def _dump_package(job):
+    """Dump one package in a worker process, returning (root, ok, messages, files, bytes)"""
+    root, package_path, output_path, prune_dirs, text, options = job
+    messages = io.StringIO()
+    with contextlib.redirect_stdout(messages):
+        ok = aggregate_code(package_path, text, output_filename=output_path, prune_dirs=prune_dirs, **options)
+    files = list_files(output_path) if ok else []
+    return root, ok, messages.getvalue(), [rel_path for rel_path, _, _ in files], sum(size for _, size, _ in files)
+
+
+def split_packages(project_path, text, output_dir, output_format='text', workers=None, follow_symlinks=False,
+                   walk_threads=1, **options):
+    """
+    Dump every package of a monorepo separately: one dump per package root (nested
+    packages are left out of their parent's dump) written to output_dir, the packages
+    being dumped concurrently on a pool of `workers` processes. Then write
+    output_dir/packages.json, the index of the package dumps.
+    The project's .dumpignore applies to every package dump, on top of the package's own.
+    options are passed to aggregate_code. Returns (packages, index_path), packages being
+    a list of (root, ok, messages, dump_path).
+    """
+    roots = find_package_roots(project_path, follow_symlinks, walk_threads)
+    workers = workers or min(len(roots), os.cpu_count() or 1)
+    print(text['split_found'].format(count=len(roots), workers=workers))
+    os.makedirs(output_dir, exist_ok=True)
+    output_rel = os.path.relpath(output_dir, project_path)
+
+    jobs = []
+    for root in roots:
+        prune_dirs = nested_roots(root, roots)
+        if not root and not (output_rel == os.pardir or output_rel.startswith(os.pardir + os.sep)):
+            prune_dirs.append(output_rel)  # the package dumps themselves
+        output_path = os.path.join(output_dir, package_dump_name(root, output_format))
+        jobs.append((root, os.path.join(project_path, root), output_path, prune_dirs, text,
+                     dict(options, output_format=output_format, follow_symlinks=follow_symlinks,
+                          walk_threads=walk_threads, project_root=project_path if root else None)))
+
+    packages = []
+    index = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for (root, ok, messages, rel_paths, size), job in zip(executor.map(_dump_package, jobs), jobs):
+            dump_path = job[2]
+            packages.append((root, ok, messages, dump_path))
+            if ok:
+                package_path = job[1]
+                index.append({
+                    'path': root.replace(os.sep, '/') or '.',
+                    'dump': os.path.relpath(dump_path, output_dir).replace(os.sep, '/'),
+                    'techs': detect_tech_from_paths(package_path, rel_paths) if rel_paths else [],
+                    'files': len(rel_paths),
+                    'bytes': size,
+                })
+
+    index_path = os.path.join(output_dir, PACKAGE_INDEX_NAME)
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump({'project_path': project_path, 'format': output_format, 'packages': index}, f,
+                  ensure_ascii=False, indent=2)
+    return packages, index_path
@@ -0,0 +1,142 @@
+import math
+import re
+
+# Token rules: (name, triggers, lookbehind, pattern). Every match holds one of the trigger
+# literals, at most lookbehind characters after its start on the same line. re has no
+# literal prefilter for an alternation (it is tried at every position), so each trigger is
+# searched with str.find, and the combined pattern is only tried at the few positions
+# before the hits. A find costs about as much as a read of the content: triggers are kept
+# few and short, the pattern rejects the false hits (`gh` in "high").
+# A private key is a BEGIN line ending its line, optional encryption headers and base64
+# lines (escaped `\n` count, for keys in JSON strings), up to the END line. Without an END
+# line (a truncated file) only the base64 lines are redacted; a BEGIN line alone (a PEM
+# header constant) is not a key.
+_NEWLINE = r'(?:\r?\n|\\n)'
+_BASE64_LINE = r'[ \t]*[A-Za-z0-9+/=]+[ \t]*'
+SECRET_RULES = (
+    ('private_key', ('PRIVATE KEY',), 48,
+     r'-----BEGIN[A-Z ]{0,32} PRIVATE KEY(?: BLOCK)?-----' + _NEWLINE
+     + r'(?:[\w-]+: [^\r\n\\]*' + _NEWLINE + r')*(?:' + _NEWLINE + r')?'
+     + _BASE64_LINE + r'(?:' + _NEWLINE + _BASE64_LINE + r')*'
+     + r'(?:' + _NEWLINE + r'[ \t]*-----END[A-Z ]{0,32} PRIVATE KEY(?: BLOCK)?-----)?'),
+    ('aws_access_key', ('IA', 'ACCA'), 2, r'\b(?:AKIA|ASIA|ABIA|ACCA)[0-9A-Z]{16}\b'),
+    ('github_token', ('gh', 'github_pat_'), 0, r'\bgh[pousr]_[A-Za-z0-9]{36,255}\b|\bgithub_pat_[A-Za-z0-9_]{82}\b'),
+    ('slack_token', ('xox',), 0, r'\bxox[abposr]-[A-Za-z0-9-]{10,250}'),
+    ('google_api_key', ('AIza',), 0, r'\bAIza[0-9A-Za-z_-]{35}'),
+    ('stripe_key', ('k_live_',), 1, r'\b[rs]k_live_[0-9A-Za-z]{24,99}\b'),
+    ('jwt', ('eyJ',), 0, r'\beyJ[A-Za-z0-9_-]{10,}\.eyJ[A-Za-z0-9_-]{10,}\.[A-Za-z0-9_-]{10,}'),
+)
+ASSIGNMENT_RULE = 'secret_assignment'
+
+_TRIGGERS = tuple((trigger, lookbehind) for _, triggers, lookbehind, _ in SECRET_RULES for trigger in triggers)
+_TOKEN_RE = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, _, _, pattern in SECRET_RULES))
+
+# Secret assignments (`API_KEY = "..."`, `"password": "..."`) are found key word first: the
+# words are searched with str.find in the lowercased content, and only the `:`/`=` right
+# after a word (the key may go on with [\w.-] characters and a quote) is tried as the start
+# of a value. Values without a digit are rejected by the lookahead, the whole key is then
+# checked on the few remaining candidates.
+_ASSIGNED_VALUE_RE = re.compile(
+    r'[:=][ \t]*["\']?(?P<value>(?=[^\s"\'`,;()\[\]{}<>$0-9]{0,511}[0-9])[^\s"\'`,;()\[\]{}<>$]{16,512})'
+)
+_KEY_TAIL_RE = re.compile(r'[\w.-]{0,40}["\']?[ \t]*(?=[:=])')
+_SECRET_KEY_RE = re.compile(
+    r'(?:secret|token|passw(?:or)?d|pwd|api[_-]?key|access[_-]?key|auth[_-]?key|credentials?)'
+    r'[\w.-]{0,40}["\']?[ \t]*\Z',
+    re.IGNORECASE,
+)
+_KEY_LOOKBEHIND = 64
+# Substrings of every key matched by _SECRET_KEY_RE
+_SECRET_KEY_WORDS = ('secret', 'token', 'passw', 'pwd', 'key', 'credential')
+
+# Assigned values are only redacted when they look random: identifiers and placeholders
+# ("settings.SECRET_KEY", "your-password-here") have low entropy or no digits
+MIN_ASSIGNMENT_ENTROPY = 3.5
+
+
+def shannon_entropy(value):
+    """Bits of entropy per character of value"""
+    counts = {}
+    for char in value:
+        counts[char] = counts.get(char, 0) + 1
+    length = len(value)
+    return -sum(count / length * math.log2(count / length) for count in counts.values())
+
+
+def _looks_random(value):
+    return (any(c.isdigit() for c in value) and any(c.isalpha() for c in value)
+            and shannon_entropy(value) >= MIN_ASSIGNMENT_ENTROPY)
+
+
+def _find_all(content, literal):
+    pos = content.find(literal)
+    while pos != -1:
+        yield pos
+        pos = content.find(literal, pos + 1)
+
+
+def _iter_token_matches(content):
+    hits = sorted((pos, lookbehind) for trigger, lookbehind in _TRIGGERS for pos in _find_all(content, trigger))
+    end = 0
+    for pos, lookbehind in hits:
+        if pos < end:
+            continue
+        window = max(0, pos - lookbehind)
+        candidate = max(end, window, content.rfind('\n', window, pos) + 1)
+        while candidate <= pos:
+            match = _TOKEN_RE.match(content, candidate)
+            if match:
+                yield match
+                candidate = end = match.end()
+            else:
+                candidate += 1
+
+
+def _iter_assigned_values(content):
+    lowered = content.lower()
+    if len(lowered) != len(content):
+        # A few non-ASCII characters change length when lowercased: positions would not match
+        yield from _ASSIGNED_VALUE_RE.finditer(content)
+        return
+    separators = set()
+    for word in _SECRET_KEY_WORDS:
+        for pos in _find_all(lowered, word):
+            tail = _KEY_TAIL_RE.match(content, pos + len(word))
+            if tail and tail.end() not in separators:
+                separators.add(tail.end())
+                match = _ASSIGNED_VALUE_RE.match(content, tail.end())
+                if match:
+                    yield match
+
+
+def redact_secrets(content, counts):
+    """
+    Replace the secrets found in content by `[REDACTED:<rule>]` and add the number of
+    redactions per rule to the counts dict. Token rules replace the whole token, secret
+    assignments only the value (the key name stays readable). Returns the new content.
+    """
+    spans = []
+    for match in _iter_token_matches(content):
+        spans.append((match.start(), match.end(), match.lastgroup))
+    for match in _iter_assigned_values(content):
+        start = match.start()
+        window = max(0, start - _KEY_LOOKBEHIND)
+        key_start = max(window, content.rfind('\n', window, start) + 1)
+        key = content[key_start:start].lower()
+        if (any(word in key for word in _SECRET_KEY_WORDS) and _SECRET_KEY_RE.search(key)
+                and _looks_random(match.group('value'))):
+            spans.append((match.start('value'), match.end('value'), ASSIGNMENT_RULE))
+    if not spans:
+        return content
+
+    pieces = []
+    last = 0
+    # Stable sort: a token rule wins over an assignment of the same value
+    for start, end, rule in sorted(spans, key=lambda span: span[0]):
+        if start < last:
+            continue  # inside a secret already redacted
+        counts[rule] = counts.get(rule, 0) + 1
+        pieces += [content[last:start], f"[REDACTED:{rule}]"]
+        last = end
+    pieces.append(content[last:])
+    return ''.join(pieces)
@@ -0,0 +1,230 @@
+import os
+import threading
+from collections import namedtuple
+
+# One child of a scanned directory. size/mtime_ns/dev/ino are 0 for directories;
+# for files (and symlinks to files) they describe the target, so (dev, ino) identifies
+# hardlinked and symlinked copies of the same file.
+DirEntry = namedtuple('DirEntry', ['name', 'is_dir', 'is_link', 'size', 'mtime_ns', 'dev', 'ino'])
+
+
+class ListingCache:
+    """
+    Directory listings keyed by absolute path and validated by the directory mtime.
+    A directory mtime only changes when entries are added, removed or renamed, so an
+    unchanged directory is never listed again. Children sizes/mtimes may lag behind
+    in-place edits, so the dump and stats take the size of a file from the file itself.
+    """
+
+    def __init__(self):
+        self.listings = {}
+        self.hits = 0
+        self.misses = 0
+        self.name_changes = 0  # re-listings that found a different set of names
+        self.touched = set()  # directories looked up or listed through this cache
+        self._lock = threading.Lock()  # parallel scans list directories from several threads
+
+    def get(self, abs_dir, mtime_ns):
+        with self._lock:
+            self.touched.add(abs_dir)
+            cached = self.listings.get(abs_dir)
+            if cached is not None and cached[0] == mtime_ns:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+            return None
+
+    def put(self, abs_dir, mtime_ns, entries):
+        with self._lock:
+            previous = self.listings.get(abs_dir)
+            if previous is None or [e.name for e in previous[1]] != [e.name for e in entries]:
+                self.name_changes += 1
+            self.listings[abs_dir] = (mtime_ns, entries)
+
+
+def list_directory(abs_dir, listing_cache=None):
+    """Return the children of abs_dir as a name-sorted list of DirEntry"""
+    if listing_cache is not None:
+        mtime_ns = os.stat(abs_dir).st_mtime_ns
+        entries = listing_cache.get(abs_dir, mtime_ns)
+        if entries is not None:
+            return entries
+
+    entries = []
+    with os.scandir(abs_dir) as it:
+        for entry in it:
+            try:
+                # Whether symlinked directories are descended into is decided by scan_project
+                if entry.is_dir():
+                    entries.append(DirEntry(entry.name, True, entry.is_symlink(), 0, 0, 0, 0))
+                elif entry.is_file():
+                    st = entry.stat()
+                    entries.append(DirEntry(entry.name, False, entry.is_symlink(), st.st_size, st.st_mtime_ns,
+                                            st.st_dev, st.st_ino))
+            except OSError:
+                continue
+    entries.sort()
+
+    if listing_cache is not None:
+        listing_cache.put(abs_dir, mtime_ns, entries)
+    return entries
+
+
+def _list_scan_dir(abs_dir, listing_cache, follow_symlinks):
+    """Return ((st_dev, st_ino) or None, entries), entries being None if the directory cannot be read"""
+    try:
+        dir_id = None
+        if follow_symlinks:
+            st = os.stat(abs_dir)
+            dir_id = (st.st_dev, st.st_ino)
+        return dir_id, list_directory(abs_dir, listing_cache)
+    except OSError:
+        return None, None
+
+
+def _seed_include_roots(project_path, roots, scan):
+    """
+    Put the ancestors of every include root in scan (each listing only the child leading
+    to a root) and return the root directories to walk. A root naming a file is added as
+    a single entry of its parent directory.
+    """
+    children = {}
+    walk_roots = []
+    for root in roots:
+        if not root:
+            return ['']
+        rel_root = os.path.join(*root.split('/'))
+        abs_root = os.path.join(project_path, rel_root)
+        try:
+            st = os.stat(abs_root)
+        except OSError:
+            continue
+        is_link = os.path.islink(abs_root)
+        parts = rel_root.split(os.sep)
+        for i in range(len(parts) - 1):
+            parent = os.path.join(*parts[:i]) if i else ''
+            children.setdefault(parent, {})[parts[i]] = DirEntry(parts[i], True, False, 0, 0, 0, 0)
+        parent = os.path.dirname(rel_root)
+        if os.path.isdir(abs_root):
+            children.setdefault(parent, {})[parts[-1]] = DirEntry(parts[-1], True, is_link, 0, 0, 0, 0)
+            walk_roots.append(rel_root)
+        else:
+            children.setdefault(parent, {})[parts[-1]] = DirEntry(parts[-1], False, is_link, st.st_size,
+                                                                  st.st_mtime_ns, st.st_dev, st.st_ino)
+    for rel_dir, entries in children.items():
+        scan[rel_dir] = sorted(entries.values())
+    return walk_roots
+
+
+def _apply_include(scan, include, rel_dir=''):
+    """Keep only included files and the directories leading to them; True if anything is left"""
+    entries = scan.get(rel_dir)
+    if not entries:
+        scan.pop(rel_dir, None)
+        return False
+    kept = []
+    for entry in entries:
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        if entry.is_dir:
+            if rel_path in scan and _apply_include(scan, include, rel_path):
+                kept.append(entry)
+        elif include.match(rel_path):
+            kept.append(entry)
+    scan[rel_dir] = kept
+    return bool(kept)
+
+
+def scan_project(project_path, matcher, listing_cache=None, raw_listings=None, follow_symlinks=False, workers=1,
+                 include=None):
+    """
+    Walk project_path once and return {rel_dir: [DirEntry] or None}.
+
+    rel_dir is '' for the project root. Excluded directories are pruned and excluded
+    files dropped using matcher (a filters.ExcludeMatcher); None marks a directory
+    that could not be listed. The result feeds both the tree and the file contents.
+    If raw_listings is a dict, it receives the unfiltered listing of every walked directory.
+
+    The walk goes one depth level at a time. With workers > 1 the directories of a level
+    are listed concurrently on a thread pool (each listing is a round trip on NFS/FUSE
+    mounts); results are always applied in sorted order, so the scan is identical to a
+    serial one.
+
+    Symlinked directories are always listed as entries but only descended into when
+    follow_symlinks is set. Each walked directory is then identified by (st_dev, st_ino)
+    and a directory reached a second time (symlink loop or second link to the same
+    target) is not walked again, so the walk always terminates. Symlinked directories are
+    walked after every real one, so a directory reached both directly and through a
+    symlink keeps its real path; between symlink paths, the shallowest one is kept, ties
+    going to the first in sorted order.
+
+    include (a filters.IncludeMatcher) restricts the walk to the literal roots of the
+    include globs; the rest of the tree is never listed. Only the included files, their
+    directories and the ancestors of the roots are kept (the root of a glob is walked even
+    if an exclusion rule would prune it, since it was asked for explicitly).
+    """
+    scan = {}
+    visited_dirs = set()
+    deferred_links = []  # symlinked directories, walked once the real directories are done
+    level = _seed_include_roots(project_path, include.roots, scan) if include is not None else ['']
+    executor = None
+    if workers > 1:
+        # Imported here: concurrent.futures (and the logging it pulls in) is a good part of
+        # the startup time of a small serial dump
+        from concurrent.futures import ThreadPoolExecutor
+        executor = ThreadPoolExecutor(max_workers=workers)
+
+    def list_rel_dir(rel_dir):
+        abs_dir = os.path.join(project_path, rel_dir) if rel_dir else project_path
+        return _list_scan_dir(abs_dir, listing_cache, follow_symlinks)
+
+    try:
+        while level:
+            results = executor.map(list_rel_dir, level) if executor else map(list_rel_dir, level)
+            next_level = []
+            for rel_dir, (dir_id, entries) in zip(level, results):
+                if entries is None:
+                    scan[rel_dir] = None
+                    continue
+                if follow_symlinks:
+                    if dir_id in visited_dirs:
+                        continue
+                    visited_dirs.add(dir_id)
+                if raw_listings is not None:
+                    raw_listings[rel_dir] = entries
+
+                kept = []
+                for entry in entries:
+                    rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+                    if entry.is_dir:
+                        if matcher.exclude_dir(rel_path):
+                            continue
+                        kept.append(entry)
+                        if not entry.is_link:
+                            next_level.append(rel_path)
+                        elif follow_symlinks:
+                            deferred_links.append(rel_path)
+                    elif not matcher.exclude_file(entry.name, rel_path):
+                        kept.append(entry)
+                scan[rel_dir] = kept
+            if not next_level:
+                next_level, deferred_links = deferred_links, []
+            level = next_level
+    finally:
+        if executor:
+            executor.shutdown()
+
+    if include is not None:
+        if not _apply_include(scan, include):
+            scan[''] = []
+    return scan
+
+
+def iter_scan_files(project_path, scan, rel_dir=''):
+    """Yield (filename, file_path, rel_path, entry) for every scanned file, in tree order"""
+    for entry in scan.get(rel_dir) or ():
+        rel_path = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        if entry.is_dir:
+            if rel_path in scan:
+                yield from iter_scan_files(project_path, scan, rel_path)
+        else:
+            yield entry.name, os.path.join(project_path, rel_path), rel_path, entry
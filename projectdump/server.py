@@ -0,0 +1,133 @@
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+
+from projectdump.aggregator import aggregate_code
+from projectdump.cache import ContentCache, ProjectCache
+from projectdump.constants import TEXT_EN, TEXT_VI
+from projectdump.emit import emit_spec_from_json
+
+DEFAULT_MAX_PROJECTS = 8
+DEFAULT_CONTENT_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class ServerError(Exception):
+    """Raised when the dump server cannot be started or reached"""
+
+
+class DumpServer(socketserver.UnixStreamServer):
+    """
+    Local dump daemon. Requests are handled one at a time so the per-project caches
+    never need locking; each request is one JSON line answered by one JSON line.
+    """
+
+    def __init__(self, socket_path, max_projects=DEFAULT_MAX_PROJECTS,
+                 content_cache_bytes=DEFAULT_CONTENT_CACHE_BYTES):
+        self.max_projects = max_projects
+        self.projects = OrderedDict()  # project_path -> ProjectCache, least recently used first
+        self.contents = ContentCache(content_cache_bytes)
+        super().__init__(socket_path, DumpRequestHandler)
+        # Only the owner may ask the daemon to read and write files
+        os.chmod(socket_path, 0o600)
+
+    def get_project_cache(self, project_path):
+        cache = self.projects.pop(project_path, None)
+        if cache is None:
+            cache = ProjectCache(project_path, self.contents)
+        self.projects[project_path] = cache
+        while len(self.projects) > self.max_projects:
+            self.projects.popitem(last=False)
+        return cache
+
+    def handle_dump(self, request):
+        """Run one dump and return the response dict (messages are captured, not printed)"""
+        project_path = os.path.abspath(request['project_path'])
+        text = TEXT_EN if request.get('lang', 'en') == 'en' else TEXT_VI
+        messages = io.StringIO()
+        with contextlib.redirect_stdout(messages):
+            success = aggregate_code(
+                project_path, text,
+                output_filename=request.get('output', 'source_dump.txt'),
+                output_format=request.get('format', 'text'),
+                cache=self.get_project_cache(project_path),
+                redetect=request.get('redetect', False),
+                follow_symlinks=request.get('follow_symlinks', False),
+                walk_threads=request.get('walk_threads', 1),
+                strip=frozenset(request.get('strip') or ()),
+                include=request.get('include'),
+                max_output_bytes=request.get('max_output_bytes'),
+                notebook_markdown=request.get('notebook_markdown', False),
+                generated=request.get('generated', 'skip'),
+                redact=request.get('redact', False),
+                emit=[emit_spec_from_json(spec) for spec in request.get('emit') or ()],
+                resume=request.get('resume', False),
+                entries=request.get('entry'),
+                outline=request.get('outline'),
+            )
+        return {'ok': success, 'messages': messages.getvalue()}
+
+
+class DumpRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.handle_dump(request)
+        except Exception as e:
+            response = {'ok': False, 'messages': f"{type(e).__name__}: {e}\n"}
+        self.wfile.write(json.dumps(response, ensure_ascii=False).encode('utf-8') + b'\n')
+
+
+def _remove_stale_socket(socket_path):
+    """Remove a socket file left behind by a dead server, refuse to start over a live one"""
+    if not os.path.exists(socket_path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            os.remove(socket_path)
+            return
+    raise ServerError(f"A server is already listening on {socket_path}")
+
+
+def _raise_keyboard_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def serve(socket_path, max_projects=DEFAULT_MAX_PROJECTS, content_cache_bytes=DEFAULT_CONTENT_CACHE_BYTES):
+    """Serve dump requests on socket_path until interrupted"""
+    _remove_stale_socket(socket_path)
+    server = DumpServer(socket_path, max_projects, content_cache_bytes)
+    if threading.current_thread() is threading.main_thread():
+        # `kill` should clean up the socket file like Ctrl+C does
+        signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+
+
+def request_dump(socket_path, request):
+    """Send one dump request to a running server and return its response dict"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError as e:
+            raise ServerError(f"Cannot connect to {socket_path}: {e}")
+        with sock.makefile('rwb') as f:
+            f.write(json.dumps(request, ensure_ascii=False).encode('utf-8') + b'\n')
+            f.flush()
+            line = f.readline()
+    if not line:
+        raise ServerError(f"No response from {socket_path}")
+    return json.loads(line)
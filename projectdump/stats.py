@@ -0,0 +1,164 @@
+import json
+import os
+from pathlib import Path
+
+from projectdump.artifacts import drop_own_artifacts
+from projectdump.cache import detect_project_tech_cached, load_listing_snapshot, save_listing_snapshot
+from projectdump.constants import MAX_FILE_SIZE
+from projectdump.detector import detect_tech_from_paths, get_extensions_by_tech
+from projectdump.filters import ExcludeMatcher, IncludeMatcher, get_exclude_patterns, is_target_file
+from projectdump.generated import SNIFF_BYTES, generated_by_content, generated_by_name
+from projectdump.notebook import NOTEBOOK_EXTENSION, NotebookError, notebook_to_source
+from projectdump.scanner import iter_scan_files, scan_project
+
+# Rough size of a token of source code for LLM tokenizers
+BYTES_PER_TOKEN = 4
+_CHUNK_SIZE = 1024 * 1024
+
+
+def count_file(file_path, file_ext):
+    """
+    Return (bytes, lines, head) of one file as it would be dumped, reading it in chunks.
+    head is the decoded first block, used to recognize generated files.
+    Notebooks are measured after reduction to their cells.
+    """
+    if file_ext == NOTEBOOK_EXTENSION:
+        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+            content = f.read()
+        try:
+            content = notebook_to_source(content)[0]
+        except NotebookError:
+            pass
+        data = content.encode('utf-8')
+        return len(data), _count_lines(data.count(b'\n'), data[-1:]), content[:SNIFF_BYTES]
+
+    size = newlines = 0
+    head = None
+    last = b''
+    with open(file_path, 'rb') as f:
+        while True:
+            chunk = f.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            if head is None:
+                head = chunk[:SNIFF_BYTES].decode('utf-8', errors='ignore')
+            size += len(chunk)
+            newlines += chunk.count(b'\n')
+            last = chunk[-1:]
+    return size, _count_lines(newlines, last), head or ''
+
+
+def _count_lines(newlines, last_byte):
+    # Same as len(content.splitlines()) for '\n' separated content
+    return newlines if not last_byte or last_byte == b'\n' else newlines + 1
+
+
+def collect_stats(project_path, include=None, follow_symlinks=False, walk_threads=1, generated='skip', top=10):
+    """
+    Run the scan and file selection of aggregate_code without writing anything and return
+    a report dict: per extension file counts, bytes, lines and estimated tokens, the
+    largest files and the files the dump would skip.
+    """
+    exclude_dirs, exclude_files = get_exclude_patterns(project_path)
+    matcher = ExcludeMatcher(exclude_dirs, exclude_files)
+    include_matcher = IncludeMatcher(include) if include else None
+
+    listings = load_listing_snapshot(project_path)
+    raw_listings = {}
+    scan = scan_project(project_path, matcher, listings, raw_listings, follow_symlinks=follow_symlinks,
+                        workers=walk_threads, include=include_matcher)
+    save_listing_snapshot(project_path, listings, keep_untouched=include_matcher is not None)
+    drop_own_artifacts(project_path, scan)
+
+    if include_matcher is not None:
+        included_paths = [rel_path for _, _, rel_path, _ in iter_scan_files(project_path, scan)]
+        detected_techs = detect_tech_from_paths(project_path, included_paths)
+    else:
+        detected_techs, _ = detect_project_tech_cached(project_path, raw_listings)
+    target_extensions = get_extensions_by_tech(detected_techs) if detected_techs else set()
+    techs_by_extension = {}
+    for tech in detected_techs:
+        for ext in get_extensions_by_tech([tech]):
+            techs_by_extension.setdefault(ext, []).append(tech)
+
+    extensions = {}
+    files = []
+    skipped = {'generated': 0, 'large': 0, 'duplicates': 0}
+    seen_files = set()
+    for file, file_path, rel_path, entry in iter_scan_files(project_path, scan):
+        file_ext = Path(file).suffix.lower()
+        if not is_target_file(file, file_ext, detected_techs, target_extensions):
+            continue
+        if entry.ino:
+            if (entry.dev, entry.ino) in seen_files:
+                skipped['duplicates'] += 1
+                continue
+            seen_files.add((entry.dev, entry.ino))
+        if generated != 'keep' and generated_by_name(file):
+            skipped['generated'] += 1
+            continue
+        try:
+            # The listing may predate an in-place edit, the size is taken from the file itself
+            if os.path.getsize(file_path) > MAX_FILE_SIZE:
+                skipped['large'] += 1
+                continue
+            size, lines, head = count_file(file_path, file_ext)
+        except OSError:
+            continue
+        if generated != 'keep' and generated_by_content(head, file_ext):
+            skipped['generated'] += 1
+            continue
+
+        key = file_ext or file
+        row = extensions.setdefault(key, {'extension': key, 'files': 0, 'bytes': 0, 'lines': 0, 'tokens': 0,
+                                          'techs': techs_by_extension.get(key, [])})
+        row['files'] += 1
+        row['bytes'] += size
+        row['lines'] += lines
+        row['tokens'] += size // BYTES_PER_TOKEN
+        files.append((size, lines, rel_path))
+
+    rows = sorted(extensions.values(), key=lambda row: (-row['bytes'], row['extension']))
+    total = {key: sum(row[key] for row in rows) for key in ('files', 'bytes', 'lines', 'tokens')}
+    files.sort(key=lambda item: (-item[0], item[2]))
+    return {
+        'project_path': project_path,
+        'techs': detected_techs,
+        'extensions': rows,
+        'total': total,
+        'largest': [{'path': rel_path, 'bytes': size, 'lines': lines} for size, lines, rel_path in files[:top]],
+        'skipped': skipped,
+    }
+
+
+def format_stats_table(report, text):
+    """Render a stats report as a plain text table"""
+    lines = [text['stats_techs'] + (', '.join(report['techs']) or '-'), '']
+    header = ('extension', 'files', 'bytes', 'lines', 'tokens')
+    widths = [max([len(text['stats_' + header[0]]), len(text['stats_total'])]
+                  + [len(row['extension']) for row in report['extensions']])]
+    widths += [max(len(text['stats_' + key]), len(f"{report['total'][key]:,}")) for key in header[1:]]
+
+    def format_row(cells, techs=''):
+        first = cells[0].ljust(widths[0])
+        rest = '  '.join(cell.rjust(width) for cell, width in zip(cells[1:], widths[1:]))
+        return f"{first}  {rest}  {techs}".rstrip()
+
+    lines.append(format_row([text['stats_' + key] for key in header], text['stats_tech']))
+    for row in report['extensions']:
+        lines.append(format_row([row['extension']] + [f"{row[key]:,}" for key in header[1:]], ', '.join(row['techs'])))
+    lines.append(format_row([text['stats_total']] + [f"{report['total'][key]:,}" for key in header[1:]]))
+
+    if report['largest']:
+        lines += ['', text['stats_largest']]
+        size_width = len(f"{report['largest'][0]['bytes']:,}")
+        for item in report['largest']:
+            lines.append(f"  {item['bytes']:>{size_width},}  {item['path']}")
+    skipped = report['skipped']
+    if any(skipped.values()):
+        lines += ['', text['stats_skipped'].format(**skipped)]
+    return '\n'.join(lines)
+
+
+def format_stats_json(report):
+    return json.dumps(report, ensure_ascii=False, indent=2)
@@ -0,0 +1,163 @@
+import io
+import re
+
+# Parts of a file that --strip can drop
+STRIP_OPTIONS = ('comments', 'blank', 'docstrings')
+
+# Lexer families, keyed by the lang hint of aggregator._get_lang_hint
+PYTHON_LANGS = {'py', 'pyi', 'pyw', 'pyx'}
+C_STYLE_LANGS = {
+    'c', 'h', 'cc', 'cpp', 'cxx', 'hpp', 'hh', 'm', 'mm',
+    'js', 'jsx', 'mjs', 'cjs', 'ts', 'tsx',
+    'go', 'java', 'kt', 'kts', 'rs', 'cs', 'swift', 'scala', 'sc', 'dart', 'php',
+    'groovy', 'gradle', 'proto',
+}
+HASH_LANGS = {
+    'sh', 'bash', 'zsh', 'yml', 'yaml', 'toml', 'rb', 'r', 'pl', 'ex', 'exs', 'tf',
+    'dockerfile', 'makefile', 'gemfile', 'cmake',
+}
+
+# Comments are replaced by this marker first so comment-only lines can be told apart
+# from lines that were already blank
+_MARK = '\x00'
+
+# Strings are matched (and kept) so comment markers inside them are ignored
+_C_STYLE_RE = re.compile(
+    r'"(?:\\.|[^"\\\n])*"'
+    r"|'(?:\\.|[^'\\\n])*'"
+    r'|`(?:\\.|[^`\\])*`'
+    r'|(?P<comment>//[^\n]*|/\*.*?\*/)',
+    re.DOTALL,
+)
+# '#' only starts a comment at the start of a line or after whitespace ($#, ${#x}, url#frag stay)
+_HASH_RE = re.compile(
+    r'"(?:\\.|[^"\\\n])*"'
+    r"|'[^'\n]*'"
+    r'|(?P<comment>(?:^|(?<=\s))#(?!!)[^\n]*)',
+    re.MULTILINE,
+)
+_CODING_RE = re.compile(r'^[ \t\f]*#.*?coding[:=]')
+
+
+def parse_strip_options(value):
+    """Parse a comma separated --strip value into a frozenset, raising ValueError on unknown parts"""
+    options = frozenset(part.strip() for part in value.split(',') if part.strip())
+    unknown = options - set(STRIP_OPTIONS)
+    if unknown:
+        raise ValueError(f"unknown strip option(s): {', '.join(sorted(unknown))} (choose from {', '.join(STRIP_OPTIONS)})")
+    return options
+
+
+def strip_content(content, lang_hint, options):
+    """
+    Drop comments, docstrings and/or blank lines from one file's content.
+    Languages without a lexer only get blank lines removed; sources that cannot be
+    lexed are returned with their comments untouched rather than risk corrupting them.
+    """
+    if not options:
+        return content
+    lang_hint = lang_hint.lower()
+    if lang_hint in PYTHON_LANGS:
+        return _strip_python(content, options)
+
+    if 'comments' in options and _MARK not in content:
+        if lang_hint in C_STYLE_LANGS:
+            content = _strip_with_regex(content, _C_STYLE_RE)
+        elif lang_hint in HASH_LANGS:
+            content = _strip_with_regex(content, _HASH_RE)
+    if 'blank' in options:
+        content = _drop_blank_lines(content)
+    return content
+
+
+def _strip_with_regex(content, comment_re):
+    marked = comment_re.sub(lambda m: _MARK if m.group('comment') is not None else m.group(0), content)
+    lines = []
+    for line in marked.splitlines(keepends=True):
+        if _MARK in line:
+            line_body = line.replace(_MARK, '').rstrip()
+            if not line_body:
+                continue  # the line only held a comment
+            line = line_body + ('\n' if line.endswith('\n') else '')
+        lines.append(line)
+    return ''.join(lines)
+
+
+def _drop_blank_lines(content, protected_rows=()):
+    return ''.join(
+        line for row, line in enumerate(content.splitlines(keepends=True), 1)
+        if line.strip() or row in protected_rows
+    )
+
+
+def _strip_python(content, options):
+    import tokenize  # not at module level: the CLI imports this module to build its parser
+    lines = content.splitlines(keepends=True)
+    drop_rows = set()
+    cut_columns = {}   # row -> column where a trailing comment starts
+    protected_rows = set()  # rows inside multi-line strings, never treated as blank
+
+    try:
+        tokens = list(tokenize.generate_tokens(io.StringIO(content).readline))
+    except (tokenize.TokenError, SyntaxError):
+        tokens = None
+
+    if tokens is None:
+        return _drop_blank_lines(content) if 'blank' in options else content
+
+    for tok in tokens:
+        (srow, scol), (erow, _) = tok.start, tok.end
+        if erow > srow and tok.type not in (tokenize.NEWLINE, tokenize.NL):
+            protected_rows.update(range(srow + 1, erow + 1))
+        if tok.type != tokenize.COMMENT or 'comments' not in options:
+            continue
+        if srow == 1 and tok.string.startswith('#!'):
+            continue  # shebang
+        if srow <= 2 and _CODING_RE.match(tok.string):
+            continue  # encoding declaration
+        if lines[srow - 1][:scol].strip():
+            cut_columns[srow] = scol
+        else:
+            drop_rows.add(srow)
+
+    if 'docstrings' in options:
+        drop_rows.update(_python_docstring_rows(content, lines))
+
+    result = []
+    for row, line in enumerate(lines, 1):
+        if row in drop_rows:
+            continue
+        if row in cut_columns:
+            line = line[:cut_columns[row]].rstrip() + ('\n' if line.endswith('\n') else '')
+        elif 'blank' in options and not line.strip() and row not in protected_rows:
+            continue
+        result.append(line)
+    return ''.join(result)
+
+
+def _python_docstring_rows(content, lines):
+    """Rows of docstrings that can be removed without leaving an empty body (Python 3.8+)"""
+    import ast
+    try:
+        tree = ast.parse(content)
+    except (SyntaxError, ValueError):
+        return set()
+
+    rows = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+            continue
+        body = node.body
+        if len(body) < 2 or not isinstance(body[0], ast.Expr):
+            continue
+        value = body[0].value
+        if not isinstance(value, ast.Constant) or not isinstance(value.value, str):
+            continue
+        expr = body[0]
+        end_lineno = getattr(expr, 'end_lineno', None)
+        if end_lineno is None or end_lineno >= body[1].lineno:
+            continue  # no end position (Python 3.7) or shares a line with the next statement
+        if lines[expr.lineno - 1][:expr.col_offset].strip():
+            continue
+        rows.update(range(expr.lineno, end_lineno + 1))
+    return rows
@@ -0,0 +1,193 @@
+import os
+
+import pytest
+
+from projectdump.aggregator import aggregate_code
+from projectdump.cache import read_text_file
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import extract_file, list_files
+from projectdump.cli import main
+from projectdump.emit import check_emit_paths, parse_emit_spec
+
+
+def test_max_output_bytes_drops_files_without_reading_them(tmp_path, monkeypatch):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'a.py').write_text("a = 1\n")
+    (project / 'big.py').write_text("b = 2\n" * 2000)
+    (project / 'c.py').write_text("c = 3\n")
+    output = str(tmp_path / 'dump.txt')
+
+    opened = []
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', lambda path: opened.append(path) or read_text_file(path))
+    assert aggregate_code(str(project), TEXT_EN, output_filename=output, max_output_bytes=400)
+    assert os.path.getsize(output) <= 400
+    assert [rel_path for rel_path, _, _ in list_files(output)] == ['a.py', 'c.py']
+    assert str(project / 'big.py') not in opened
+
+
+def test_max_output_bytes_drops_skipped_and_error_sections(tmp_path, monkeypatch, capsys):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'a.py').write_text("a = 1\n")
+    (project / 'api.js').write_text("// @generated\n")
+    (project / 'b.py').write_text("b = 2\n")
+    output = str(tmp_path / 'dump.txt')
+
+    # Room for a.py and either small file, but not for the longer notes replacing them
+    assert aggregate_code(str(project), TEXT_EN, output_filename=output, generated='keep')
+    with open(output, encoding='utf-8') as f:
+        dump = f.read()
+    start, middle = dump.index('### api.js'), dump.index('### b.py')
+    limit = len(dump[:start].encode('utf-8')) + max(middle - start, len(dump) - middle)
+
+    def read_or_fail(path):
+        if path.endswith('b.py'):
+            raise OSError('the disk could not be read, please check the drive')
+        return read_text_file(path)
+
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', read_or_fail)
+    capsys.readouterr()
+    assert aggregate_code(str(project), TEXT_EN, output_filename=output, generated='summary', max_output_bytes=limit)
+    assert os.path.getsize(output) <= limit
+    with open(output, encoding='utf-8') as f:
+        dump = f.read()
+    assert '### a.py' in dump and '### api.js' not in dump and '### b.py' not in dump
+    assert f'Dropped to stay under {limit} bytes: 2 read error/skipped file section(s)' in capsys.readouterr().out
+
+    assert aggregate_code(str(project), TEXT_EN, output_filename=output, generated='summary')
+    with open(output, encoding='utf-8') as f:
+        dump = f.read()
+    assert '# Skipped: header "@generated"' in dump and 'the disk could not be read' in dump
+
+
+def test_emit_writes_every_output_from_one_read(tmp_path, monkeypatch):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'a.py').write_text("# comment\na = 1\n")
+    (project / 'big.py').write_text("b = 2\n" * 2000)
+    emit = [parse_emit_spec('text:full.txt'), parse_emit_spec('jsonl:full.jsonl:strip=comments'),
+            parse_emit_spec('text:small.txt:max-bytes=400')]
+
+    opened = []
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', lambda path: opened.append(path) or read_text_file(path))
+    assert aggregate_code(str(project), TEXT_EN, emit=emit)
+    assert sorted(opened) == [str(project / 'a.py'), str(project / 'big.py')]
+    assert not (project / 'source_dump.txt').exists()
+
+    assert [rel_path for rel_path, _, _ in list_files(str(project / 'full.txt'))] == ['a.py', 'big.py']
+    assert extract_file(str(project / 'full.jsonl'), 'a.py') == "a = 1\n"
+    assert [rel_path for rel_path, _, _ in list_files(str(project / 'small.txt'))] == ['a.py']
+    assert os.path.getsize(project / 'small.txt') <= 400
+
+
+def test_emit_outputs_must_not_write_the_same_file(tmp_path):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'a.py').write_text("a = 1\n")
+    check_emit_paths(str(project), [parse_emit_spec('text:dump.txt'), parse_emit_spec('jsonl:dump.jsonl')], 'other.txt')
+    for second in (f'jsonl:{project}/dump.txt', 'jsonl:./dump.txt', 'jsonl:dump.txt.idx', 'text:dump.txt.ckpt'):
+        with pytest.raises(ValueError, match='would write the same file'):
+            check_emit_paths(str(project), [parse_emit_spec('text:dump.txt'), parse_emit_spec(second)])
+    with pytest.raises(ValueError):
+        check_emit_paths(str(project), [parse_emit_spec('jsonl:dump.jsonl')], 'dump.jsonl')
+
+    with pytest.raises(ValueError):
+        aggregate_code(str(project), TEXT_EN, emit=[parse_emit_spec('text:dump.txt'), parse_emit_spec('jsonl:dump.txt')])
+    assert not (project / 'dump.txt').exists()
+    with pytest.raises(SystemExit):
+        main([str(project), '-o', 'dump.jsonl', '--emit', 'text:dump.txt', '--emit', 'jsonl:dump.jsonl'])
+
+
+def test_read_errors_only_go_to_outputs_with_room_for_the_file(tmp_path, monkeypatch):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'a.py').write_text("a = 1\n")
+    (project / 'big.py').write_text("b = 2\n" * 2000)
+    emit = [parse_emit_spec('text:full.txt'), parse_emit_spec('jsonl:small.jsonl:max-bytes=1000')]
+
+    def read_or_fail(path):
+        if path.endswith('big.py'):
+            raise OSError('disk error')
+        return read_text_file(path)
+
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', read_or_fail)
+    assert aggregate_code(str(project), TEXT_EN, emit=emit)
+    assert '# Error reading file: disk error' in (project / 'full.txt').read_text(encoding='utf-8')
+    assert 'disk error' not in (project / 'small.jsonl').read_text(encoding='utf-8')
+
+
+def test_resume_continues_an_interrupted_dump(tmp_path, monkeypatch):
+    project = tmp_path / 'proj'
+    (project / 'pkg').mkdir(parents=True)
+    for name in ('a.py', 'pkg/b.py', 'pkg/c.py', 'z.py'):
+        (project / name).write_text(f"# {name}\nvalue = {name!r}\n")
+    emit = [parse_emit_spec('text:dump.txt'), parse_emit_spec('jsonl:dump.jsonl:strip=comments')]
+    assert aggregate_code(str(project), TEXT_EN, emit=emit)
+    expected = {name: (project / name).read_bytes() for name in ('dump.txt', 'dump.txt.idx', 'dump.jsonl.idx')}
+
+    # Checkpoint after every file and die while reading pkg/c.py
+    monkeypatch.setattr('projectdump.aggregator.CHECKPOINT_INTERVAL', 0)
+
+    def read_or_die(path):
+        if path.endswith('c.py'):
+            raise KeyboardInterrupt
+        return read_text_file(path)
+
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', read_or_die)
+    with pytest.raises(KeyboardInterrupt):
+        aggregate_code(str(project), TEXT_EN, emit=emit)
+    assert (project / 'dump.txt.ckpt').exists()
+
+    opened = []
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', lambda path: opened.append(path) or read_text_file(path))
+    assert aggregate_code(str(project), TEXT_EN, emit=emit, resume=True)
+    assert sorted(opened) == [str(project / 'pkg' / 'c.py'), str(project / 'z.py')]
+    assert {name: (project / name).read_bytes() for name in expected} == expected
+    assert [rel_path for rel_path, _, _ in list_files(str(project / 'dump.jsonl'))] == [
+        'a.py', os.path.join('pkg', 'b.py'), os.path.join('pkg', 'c.py'), 'z.py']
+    assert not (project / 'dump.txt.ckpt').exists()
+
+
+@pytest.mark.parametrize('changed', [{'include': None}, {'follow_symlinks': True}, {'prune_dirs': ['pkg']}])
+def test_resume_rejects_a_different_file_set(tmp_path, monkeypatch, capsys, changed):
+    project = tmp_path / 'proj'
+    (project / 'pkg').mkdir(parents=True)
+    for name in ('a.py', 'pkg/b.py', 'pkg/c.py'):
+        (project / name).write_text(f"value = {name!r}\n")
+    options = {'include': ['pkg/**'], 'follow_symlinks': False, 'prune_dirs': None}
+    monkeypatch.setattr('projectdump.aggregator.CHECKPOINT_INTERVAL', 0)
+
+    def read_or_die(path):
+        if path.endswith('c.py'):
+            raise KeyboardInterrupt
+        return read_text_file(path)
+
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', read_or_die)
+    with pytest.raises(KeyboardInterrupt):
+        aggregate_code(str(project), TEXT_EN, output_filename='dump.txt', **options)
+    assert (project / 'dump.txt.ckpt').exists()
+
+    monkeypatch.setattr('projectdump.aggregator.read_text_file', read_text_file)
+    capsys.readouterr()
+    assert aggregate_code(str(project), TEXT_EN, output_filename='dump.txt', resume=True, **dict(options, **changed))
+    assert 'Cannot resume (the checkpoint was made with different options)' in capsys.readouterr().out
+
+
+def test_own_outputs_are_never_dumped_again(tmp_path, capsys):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'notes.txt').write_text("plain notes\n")
+    (project / 'run.sh').write_text("echo hi\n")
+    dump_path = str(project / 'dump.md')
+
+    # No tech detected: every file that is not excluded is dumped, .md included
+    assert aggregate_code(str(project), TEXT_EN, output_filename='dump.md')
+    size = os.path.getsize(dump_path)
+    os.rename(dump_path, str(project / 'old_dump.txt'))
+    assert aggregate_code(str(project), TEXT_EN, output_filename='dump.md',
+                          emit=[parse_emit_spec('text:dump.md'), parse_emit_spec('jsonl:dump.jsonl')])
+    assert aggregate_code(str(project), TEXT_EN, output_filename='dump.md')
+    assert os.path.getsize(dump_path) == size
+    assert sorted(rel_path for rel_path, _, _ in list_files(dump_path)) == ['notes.txt', 'run.sh']
+    assert 'Left out 5 projectdump output file(s) found in the project' in capsys.readouterr().out
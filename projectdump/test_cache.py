@@ -0,0 +1,90 @@
+import os
+import time
+
+from projectdump.aggregator import aggregate_code
+from projectdump.cache import detect_project_tech_cached, load_listing_snapshot, save_listing_snapshot
+from projectdump.constants import TEXT_EN
+from projectdump.filters import ExcludeMatcher, get_exclude_patterns
+from projectdump.scanner import ListingCache, scan_project
+
+
+def _raw_listings(project_path):
+    raw_listings = {}
+    scan_project(project_path, ExcludeMatcher(*get_exclude_patterns(project_path)), raw_listings=raw_listings)
+    return raw_listings
+
+
+def test_tech_detection_is_cached_until_indicators_change(tmp_path):
+    (tmp_path / 'main.py').write_text("print('hi')\n")
+    project_path = str(tmp_path)
+
+    assert detect_project_tech_cached(project_path, _raw_listings(project_path)) == (['python'], False)
+    assert detect_project_tech_cached(project_path, _raw_listings(project_path)) == (['python'], True)
+    assert detect_project_tech_cached(project_path, _raw_listings(project_path), redetect=True) == (['python'], False)
+
+    (tmp_path / 'package.json').write_text("{}\n")
+    techs, from_cache = detect_project_tech_cached(project_path, _raw_listings(project_path))
+    assert not from_cache
+    assert techs == ['javascript', 'python']
+
+
+def test_tech_detection_ignores_excluded_directories(tmp_path):
+    (tmp_path / 'main.py').write_text("print('hi')\n")
+    (tmp_path / '.dumpignore').write_text("vendor/\n")
+    (tmp_path / 'vendor').mkdir()
+    project_path = str(tmp_path)
+    assert detect_project_tech_cached(project_path, _raw_listings(project_path)) == (['python'], False)
+
+    # A manifest the scan never sees changes neither the key nor the detection
+    (tmp_path / 'vendor' / 'go.mod').write_text("module vendored\n")
+    assert detect_project_tech_cached(project_path, _raw_listings(project_path)) == (['python'], True)
+    assert detect_project_tech_cached(project_path, _raw_listings(project_path), redetect=True) == (['python'], False)
+
+
+def test_listing_snapshot_reuses_unchanged_directories(tmp_path):
+    project = tmp_path / 'proj'
+    (project / 'src' / 'pkg').mkdir(parents=True)
+    (project / 'src' / 'pkg' / 'mod.py').write_text("x = 1\n")
+    (project / 'naïve.py').write_text("y = 2\n")
+    (project / 'empty').mkdir()
+    (project / '..gen').mkdir()
+    old = time.time() - 60
+    for path in (project, project / 'src', project / 'src' / 'pkg', project / 'empty', project / '..gen'):
+        os.utime(path, (old, old))
+    project_path = str(project)
+    matcher = ExcludeMatcher(set(), set())
+
+    listings = ListingCache()
+    scan = scan_project(project_path, matcher, listings)
+    save_listing_snapshot(project_path, listings)
+
+    loaded = load_listing_snapshot(project_path)
+    assert loaded.listings == listings.listings
+    assert scan_project(project_path, matcher, loaded) == scan
+    assert (loaded.hits, loaded.misses) == (5, 0)
+
+    # A new entry changes its directory mtime, only that directory is listed again
+    (project / 'src' / 'new.py').write_text("z = 3\n")
+    reloaded = load_listing_snapshot(project_path)
+    rescan = scan_project(project_path, matcher, reloaded)
+    assert (reloaded.hits, reloaded.misses) == (4, 1)
+    assert 'new.py' in [entry.name for entry in rescan['src']]
+
+
+def test_in_place_edit_is_sized_from_the_file(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('PROJECTDUMP_CACHE_DIR', str(tmp_path / 'cache'))
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'a.py').write_text("x = 1\n")
+    (project / 'b.py').write_text("y = 2\n")
+    old = time.time() - 60
+    os.utime(project, (old, old))
+    dump_path = str(tmp_path / 'dump.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path)
+
+    # Growing a.py in place leaves the directory mtime, and so the saved listing, unchanged
+    (project / 'a.py').write_text("x = 1\n" * 1000)
+    os.utime(project, (old, old))
+    capsys.readouterr()
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, max_output_bytes=1000)
+    assert 'Dropped to stay under 1000 bytes: 1 file(s) (6000 bytes)' in capsys.readouterr().out
@@ -0,0 +1,102 @@
+import os
+
+from projectdump.aggregator import aggregate_code
+from projectdump.closure import resolve_closure
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import list_files
+from projectdump.filters import ExcludeMatcher, get_exclude_patterns
+
+
+def make_files(root, files):
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def closure(project, *entries):
+    matcher = ExcludeMatcher(*get_exclude_patterns(str(project)))
+    return [p.replace(os.sep, '/') for p in resolve_closure(str(project), [os.path.normpath(e) for e in entries],
+                                                           matcher)]
+
+
+def test_python_closure(tmp_path):
+    make_files(tmp_path, {
+        'services/api/main.py': "import json\nfrom app import routes\nfrom app.store.models import User\n",
+        'services/api/app/__init__.py': "",
+        'services/api/app/routes.py': "from . import helpers\nfrom .store import session\n",
+        'services/api/app/helpers.py': "def helper():\n    from shared.text import slug\n",
+        'services/api/app/store/__init__.py': "",
+        'services/api/app/store/models.py': "",
+        'services/api/app/store/session.py': "",
+        'services/api/app/unused.py': "",
+        'src/shared/text.py': "",
+        'node_modules/app/routes.py': "",
+        'broken.py': "def (",
+    })
+    assert closure(tmp_path, 'services/api/main.py') == [
+        'services/api/app/__init__.py', 'services/api/app/helpers.py', 'services/api/app/routes.py',
+        'services/api/app/store/__init__.py', 'services/api/app/store/models.py', 'services/api/app/store/session.py',
+        'services/api/main.py', 'src/shared/text.py',
+    ]
+    assert closure(tmp_path, 'broken.py') == ['broken.py']
+
+
+def test_js_and_go_closure(tmp_path):
+    make_files(tmp_path, {
+        'web/src/index.ts': "import { a } from './a.js';\nimport React from 'react';\nexport * from \"./components\";\n"
+                            "const lazy = () => import('./lazy');\n",
+        'web/src/a.ts': "const b = require('../lib/b');\n",
+        'web/lib/b.js': "",
+        'web/src/components/index.tsx': "import './Button';\n",
+        'web/src/components/Button.tsx': "",
+        'web/src/lazy.js': "",
+        'web/src/orphan.ts': "",
+        'app.js': "import './..gen/api.js';\n",
+        '..gen/api.js': "",
+        'go/go.mod': "module example.com/svc\n\ngo 1.21\n",
+        'go/cmd/server/main.go': 'package main\n\nimport (\n\t"fmt"\n\tstore "example.com/svc/internal/store"\n)\n',
+        'go/cmd/server/flags.go': "package main\n",
+        'go/cmd/server/main_test.go': "package main\n",
+        'go/internal/store/store.go': 'package store\n\nimport "example.com/svc/internal/util"\n',
+        'go/internal/util/util.go': "package util\n",
+        'go/internal/unused/unused.go': "package unused\n",
+    })
+    # lib/ is excluded by default: neither dumped nor followed
+    assert closure(tmp_path, 'web/src/index.ts') == [
+        'web/src/a.ts', 'web/src/components/Button.tsx', 'web/src/components/index.tsx', 'web/src/index.ts',
+        'web/src/lazy.js',
+    ]
+    # A directory named like a parent is still in the project
+    assert closure(tmp_path, 'app.js') == ['..gen/api.js', 'app.js']
+    assert closure(tmp_path, 'go/cmd/server/main.go') == [
+        'go/cmd/server/flags.go', 'go/cmd/server/main.go', 'go/internal/store/store.go', 'go/internal/util/util.go',
+    ]
+
+
+def test_dump_with_entry(tmp_path, capsys):
+    project = tmp_path / 'proj'
+    make_files(project, {
+        'main.py': "from pkg import core\n",
+        'pkg/__init__.py': "",
+        'pkg/core.py': "VALUE = 1\n",
+        'pkg/other.py': "UNRELATED = 1\n",
+        'tools/script.py': "",
+    })
+    dump_path = str(tmp_path / 'dump.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, entries=['main.py'])
+    assert [rel_path for rel_path, _, _ in list_files(dump_path)] == [
+        'main.py', os.path.join('pkg', '__init__.py'), os.path.join('pkg', 'core.py')]
+    with open(dump_path, encoding='utf-8') as f:
+        dump = f.read()
+    assert 'other.py' not in dump and 'tools' not in dump
+    assert 'Entry mode: 3 file(s) reachable from 1 entry file(s)' in capsys.readouterr().out
+
+    assert not aggregate_code(str(project), TEXT_EN, output_filename=dump_path, entries=['missing.py'])
+    assert 'Entry file(s) not found in the project: missing.py' in capsys.readouterr().out
+    assert not aggregate_code(str(project), TEXT_EN, output_filename=dump_path, entries=['../proj/../dump.txt'])
+    assert 'Entry file(s) not found in the project: ' + os.path.join('..', 'dump.txt') in capsys.readouterr().out
+
+    make_files(project, {'..gen/api.py': "URL = '/api'\n"})
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, entries=['..gen/api.py'])
+    assert [rel_path for rel_path, _, _ in list_files(dump_path)] == [os.path.join('..gen', 'api.py')]
@@ -0,0 +1,39 @@
+import os
+
+import pytest
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import DumpIndexError, extract_file, list_files
+
+
+def _make_project(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / 'mod.py').write_text("x = '```'\n")
+    (tmp_path / 'main.py').write_text("print('héllo')\n")
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize('output_format', ['text', 'jsonl'])
+def test_extract_and_ls_through_index(tmp_path, output_format):
+    project_path = _make_project(tmp_path)
+    assert aggregate_code(project_path, TEXT_EN, output_filename='dump.out', output_format=output_format)
+    dump_path = os.path.join(project_path, 'dump.out')
+
+    listed = {rel_path: size for rel_path, size, _ in list_files(dump_path)}
+    assert listed == {'main.py': 16, os.path.join('pkg', 'mod.py'): 10}
+    assert extract_file(dump_path, 'pkg/mod.py') == "x = '```'\n"
+    assert extract_file(dump_path, 'main.py') == "print('héllo')\n"
+
+    with pytest.raises(DumpIndexError):
+        extract_file(dump_path, 'missing.py')
+
+
+def test_stale_index_is_rejected(tmp_path):
+    project_path = _make_project(tmp_path)
+    assert aggregate_code(project_path, TEXT_EN, output_filename='dump.out')
+    with open(os.path.join(project_path, 'dump.out'), 'a') as f:
+        f.write("appended")
+
+    with pytest.raises(DumpIndexError):
+        list_files(os.path.join(project_path, 'dump.out'))
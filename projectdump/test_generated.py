@@ -0,0 +1,58 @@
+import os
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import list_files
+from projectdump.generated import generated_by_content, generated_by_name
+
+
+def test_generated_names_and_headers():
+    assert generated_by_name('vendor.MIN.js') == '*.min.js'
+    assert generated_by_name('api_pb2.py') == '*_pb2.py'
+    assert generated_by_name('minimal.js') is None
+
+    assert generated_by_content("// Code generated by protoc-gen-go. DO NOT EDIT.\npackage api\n", '.go')[0] == 'header'
+    assert generated_by_content("# Generated by Django 4.2 on 2024-01-01\n", '.py')[0] == 'header'
+    assert generated_by_content('"""A tree can be generated by the parser."""\n', '.py') is None
+    assert generated_by_content("# Auto-generated file, do not modify\n", '.py') == ('header', 'Auto-generated')
+    assert generated_by_content("/*\n * This file was automatically generated.\n */\n", '.c') == (
+        'header', 'This file was automatically generated')
+    assert generated_by_content('"""Generated by sqlc v1.20."""\n', '.py') == ('header', 'Generated by')
+
+    # The phrases in docstrings, code or the middle of a comment are not generator markers
+    models = ('"""\nDatabase models.\n\nPrimary keys are auto-generated by the database.\nDo not edit rows by hand.\n'
+              '"""\nfrom django.db import models\n')
+    assert generated_by_content(models, '.py') is None
+    assert generated_by_content("IDS = 'autogenerated'  # ids are auto-generated\n", '.py') is None
+
+
+def test_minified_detection_needs_long_lines_in_web_assets():
+    bundle = "var a=1;" * 2000
+    assert generated_by_content(bundle, '.js')[0] == 'minified'
+    assert generated_by_content(bundle, '.md') is None
+    assert generated_by_content("const a = 1;\n" * 500, '.js') is None
+    # One long line in a short file is not enough
+    assert generated_by_content("x = '" + "a" * 300 + "'\n", '.js') is None
+
+
+def test_generated_files_are_skipped_or_summarized(tmp_path, capsys):
+    project = tmp_path / 'proj'
+    (project / 'static').mkdir(parents=True)
+    (project / 'app.js').write_text("console.log('hi');\n")
+    (project / 'static' / 'vendor.min.js').write_text("!function(){}();\n")
+    (project / 'static' / 'bundle.js').write_text("var a=1;" * 20000)  # sniffed before the full read
+    (project / 'api.js').write_text("// @generated by openapi-generator\nexport const api = {};\n")
+    dump_path = str(tmp_path / 'dump.txt')
+
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path)
+    assert [rel_path for rel_path, _, _ in list_files(dump_path)] == ['app.js']
+    summary = capsys.readouterr().out
+    assert 'Generated/minified files skipped: 3' in summary
+    assert os.path.join('static', 'vendor.min.js') + ' (name matches *.min.js)' in summary
+
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, generated='summary')
+    with open(dump_path, encoding='utf-8') as f:
+        assert '### api.js\n```\n# Skipped: header "@generated by"' in f.read()
+
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, generated='keep')
+    assert len(list_files(dump_path)) == 4
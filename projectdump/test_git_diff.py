@@ -0,0 +1,60 @@
+import os
+import subprocess
+
+import pytest
+
+from projectdump.git_diff import GitDiffError, get_changed_files, add_directory_neighbours
+from projectdump.tree_generator import generate_tree_from_paths
+
+
+def _git(cwd, *args):
+    subprocess.run(['git', *args], cwd=cwd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+
+
+def _make_repo(tmp_path):
+    _git(tmp_path, 'init', '-q')
+    _git(tmp_path, 'config', 'user.email', 'test@example.com')
+    _git(tmp_path, 'config', 'user.name', 'test')
+    (tmp_path / 'src').mkdir()
+    (tmp_path / 'src' / 'a.py').write_text("a = 1\n")
+    (tmp_path / 'src' / 'b.py').write_text("b = 1\n")
+    (tmp_path / 'main.py').write_text("print('hi')\n")
+    _git(tmp_path, 'add', '-A')
+    _git(tmp_path, 'commit', '-q', '-m', 'init')
+
+
+def test_changed_files_since_revision(tmp_path):
+    _make_repo(tmp_path)
+    (tmp_path / 'src' / 'a.py').write_text("a = 2\n")
+    (tmp_path / 'new.py').write_text("n = 1\n")
+    os.remove(tmp_path / 'main.py')
+
+    changed = get_changed_files(str(tmp_path), since='HEAD')
+    assert changed == ['new.py', os.path.join('src', 'a.py')]
+
+
+def test_changed_files_range_and_neighbours(tmp_path):
+    _make_repo(tmp_path)
+    (tmp_path / 'src' / 'b.py').write_text("b = 2\n")
+    _git(tmp_path, 'commit', '-q', '-am', 'change b')
+
+    changed = get_changed_files(str(tmp_path), diff_range='HEAD~1..HEAD')
+    assert changed == [os.path.join('src', 'b.py')]
+
+    with_neighbours = add_directory_neighbours(str(tmp_path), changed)
+    assert with_neighbours == [os.path.join('src', 'a.py'), os.path.join('src', 'b.py')]
+
+
+def test_revisions_are_never_git_options(tmp_path):
+    _make_repo(tmp_path)
+    output = tmp_path / 'out.txt'
+    with pytest.raises(GitDiffError, match='invalid revision'):
+        get_changed_files(str(tmp_path), since=f'--output={output}')
+    with pytest.raises(GitDiffError, match='invalid revision'):
+        get_changed_files(str(tmp_path), diff_range='-p')
+    assert not output.exists()
+
+
+def test_tree_from_paths():
+    tree = generate_tree_from_paths('/x/proj', [os.path.join('src', 'b.py'), 'main.py'])
+    assert tree == "proj/\n├── main.py\n└── src/\n    └── b.py"
@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+from projectdump.detector import detect_project_tech
+from projectdump.dump_index import extract_file
+from projectdump.notebook import NotebookError, notebook_to_source
+from projectdump.stats import count_file
+
+NOTEBOOK = {
+    'nbformat': 4,
+    'metadata': {'kernelspec': {'language': 'python', 'name': 'python3'}},
+    'cells': [
+        {'cell_type': 'markdown', 'source': ['# Analysis\n', 'Load the data']},
+        {'cell_type': 'code', 'source': ['import pandas as pd\n', 'df = pd.read_csv("x.csv")'],
+         'outputs': [{'output_type': 'display_data', 'data': {'image/png': 'iVBOR' * 1000}}], 'execution_count': 1},
+        {'cell_type': 'code', 'source': '', 'outputs': []},
+        {'cell_type': 'raw', 'source': 'ignored'},
+    ],
+}
+
+
+def test_notebook_keeps_code_cells_only():
+    source, lang_hint = notebook_to_source(json.dumps(NOTEBOOK))
+    assert lang_hint == 'py'
+    assert source == '# %%\nimport pandas as pd\ndf = pd.read_csv("x.csv")\n\n# %%\n'
+
+    with_markdown, _ = notebook_to_source(json.dumps(NOTEBOOK), include_markdown=True)
+    assert with_markdown.startswith('# %% [markdown]\n# # Analysis\n# Load the data\n\n# %%\nimport pandas')
+
+    with pytest.raises(NotebookError):
+        notebook_to_source('{"not": "a notebook"')
+
+
+def test_notebooks_are_detected_and_dumped_without_outputs(tmp_path):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'analysis.ipynb').write_text(json.dumps(NOTEBOOK))
+    assert detect_project_tech(str(project)) == ['jupyter', 'python']
+
+    dump_path = str(tmp_path / 'dump.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path)
+    assert extract_file(dump_path, 'analysis.ipynb') == notebook_to_source(json.dumps(NOTEBOOK))[0]
+    with open(dump_path, encoding='utf-8') as f:
+        assert '```py\n# %%\nimport pandas' in f.read()
+
+
+@pytest.mark.parametrize('content', [
+    '{"cells": [1]}',
+    '{"cells": [{"cell_type": "code", "source": 3}]}',
+    '{"cells": [{"cell_type": "code", "source": ["x", 1]}]}',
+    '{"worksheets": [[]]}',
+    '{"worksheets": [{"cells": {}}]}',
+])
+def test_malformed_notebooks_are_dumped_as_is(tmp_path, content):
+    with pytest.raises(NotebookError):
+        notebook_to_source(content)
+
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'analysis.ipynb').write_text(content)
+    (project / 'main.py').write_text("print('hi')\n")
+    dump_path = str(tmp_path / 'dump.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path)
+    assert extract_file(dump_path, 'analysis.ipynb') == content
+    assert count_file(str(project / 'analysis.ipynb'), '.ipynb')[0] == len(content)
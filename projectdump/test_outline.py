@@ -0,0 +1,184 @@
+import json
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+from projectdump.outline import OutlineCache, outline_content
+
+PYTHON_SOURCE = '''"""Billing helpers."""
+import os
+from .models import (
+    Invoice,
+    Payment,
+)
+
+try:
+    import ujson as json
+except ImportError:
+    import json
+
+TAX_RATE = 0.2
+_ROUNDING = 2
+RATES = {
+    'fr': 0.2,
+    'de': 0.19,
+    'it': 0.22,
+}
+logger = None
+
+
+@cached
+def total(invoice: Invoice,
+          discount: float = 0) -> float:
+    """Total of an invoice, taxes included.
+
+    Longer explanation.
+    """
+    amount = sum(line.price for line in invoice.lines)
+    return round(amount * (1 + TAX_RATE) - discount, _ROUNDING)
+
+
+class Ledger(Base):
+    currency: str = 'EUR'
+
+    def add(self, payment):
+        self.payments.append(payment)
+
+    async def sync(self):
+        """Push to the bank."""
+        await self.client.push(self.payments)
+
+
+class Empty:
+    pass
+'''
+
+PYTHON_OUTLINE = '''"""Billing helpers."""
+import os
+from .models import (
+    Invoice,
+    Payment,
+)
+import ujson as json
+import json
+TAX_RATE = 0.2
+_ROUNDING = 2
+RATES = {
+    ...
+
+@cached
+def total(invoice: Invoice,
+          discount: float = 0) -> float:
+    """Total of an invoice, taxes included."""
+    ...
+
+class Ledger(Base):
+    currency: str = 'EUR'
+    def add(self, payment):
+        ...
+    async def sync(self):
+        """Push to the bank."""
+        ...
+
+class Empty:
+    ...
+'''
+
+
+def test_python_outline():
+    assert outline_content(PYTHON_SOURCE, 'py') == PYTHON_OUTLINE
+    assert outline_content('def broken(:\n', 'py') is None
+    assert outline_content('# title\n', 'md') is None
+
+
+def test_python_signatures_end_at_their_colon():
+    source = ("def g(): return 1\n"
+              "class E: pass\n"
+              "def k(\n    a,  # first: arg\n    b,\n) -> int:\n    # setup\n    return a\n"
+              "class F(Base):\n    # members\n    def m(self): return 2\n")
+    assert outline_content(source, 'py') == (
+        "def g(): ...\n\nclass E: ...\n\ndef k(\n    a,  # first: arg\n    b,\n) -> int:\n    ...\n\n"
+        "class F(Base):\n    def m(self): ...\n")
+
+
+def test_line_outlines():
+    typescript = ("import { Foo } from './foo';\nexport * from './bar';\n\nexport const MAX = 10;\n\n"
+                  "export default class Widget extends Base {\n  private count = 0;\n"
+                  "  async load(id: string): Promise<void> {\n    if (id) {\n      const x = await fetch(id);\n"
+                  "    }\n  }\n}\n")
+    assert outline_content(typescript, 'ts') == (
+        "import { Foo } from './foo';\nexport * from './bar';\nexport const MAX = 10;\n"
+        "export default class Widget extends Base {\n  private count = 0;\n"
+        "  async load(id: string): Promise<void> {\n")
+    go = ('package main\n\nimport (\n\t"fmt"\n\tstore "example.com/svc/store"\n)\n\nconst Version = "1"\n\n'
+          'func (s *Server) Name() string {\n\tvar x = 1\n\treturn "x"\n}\n')
+    assert outline_content(go, 'go') == ('package main\nimport (\n\t"fmt"\n\tstore "example.com/svc/store"\n'
+                                         'const Version = "1"\nfunc (s *Server) Name() string {\n')
+
+
+def test_line_outlines_stay_on_their_line():
+    # Calls are not declarations, and do not swallow the declarations after them
+    go = 'package main\n\nfunc run() {\n\twritePerson(w, p)\n}\n\nfunc main() {\n\trun()\n}\n'
+    assert outline_content(go, 'go') == 'package main\nfunc run() {\nfunc main() {\n'
+    # Long whitespace runs and many call lines were scanned again from every line start
+    assert outline_content('x' + ' ' * 20000 + 'y(\n' + 'foo(x)\n' * 10000 + 'x' + '\n' * 20000, 'js') == ''
+    assert outline_content('f(x) :a\n' * 5000, 'ts') == ''
+
+
+def test_outline_cache_keeps_used_entries():
+    outlines = OutlineCache()
+    assert outlines.get(PYTHON_SOURCE, 'py') == PYTHON_OUTLINE
+    outlines.get('X = 1\n', 'py')
+    outlines.finish()
+    outlines = OutlineCache(outlines.entries)
+    assert outlines.get(PYTHON_SOURCE, 'py') == PYTHON_OUTLINE
+    assert outlines.hits == 1
+    outlines.finish()
+    assert len(outlines.entries) == 1
+
+
+def test_dump_with_outline(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv('PROJECTDUMP_CACHE_DIR', str(tmp_path / 'cache'))
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'billing.py').write_text(PYTHON_SOURCE)
+    (project / 'small.py').write_text("def tiny():\n    return 1\n")
+    (project / 'legacy.py').write_text("print 'python 2'\n" * 20)
+    dump_path = str(tmp_path / 'dump.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, outline=200)
+    with open(dump_path, encoding='utf-8') as f:
+        dump = f.read()
+    assert "### billing.py\n```py outline\n" + PYTHON_OUTLINE + "\n```" in dump
+    assert "### small.py\n```py\ndef tiny():\n    return 1\n" in dump
+    # Files that don't parse are dumped in full
+    assert "print 'python 2'\n" * 20 in dump
+    assert 'Outlines: 1 file(s) reduced' in capsys.readouterr().out
+
+    jsonl_path = str(tmp_path / 'dump.jsonl')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=jsonl_path, output_format='jsonl', outline=0)
+    with open(jsonl_path, encoding='utf-8') as f:
+        records = {record['path']: record for record in map(json.loads, f) if record['type'] == 'file'}
+    assert records['billing.py']['outline'] and records['billing.py']['content'] == PYTHON_OUTLINE
+    assert 'outline' not in records['legacy.py']
+    out = capsys.readouterr().out
+    # billing.py and legacy.py (no outline) were outlined by the first run, only small.py is parsed
+    assert 'Outlines: 2 file(s) reduced' in out and '2 outline(s) from cache' in out
+
+
+def test_files_without_outline_are_dumped_in_full(tmp_path, monkeypatch):
+    monkeypatch.setenv('PROJECTDUMP_CACHE_DIR', str(tmp_path / 'cache'))
+    project = tmp_path / 'proj'
+    project.mkdir()
+    script = 'print("hello")\n' * 10
+    config = "module.exports = {\n  mode: 'production',\n  entry: './src/index.js',\n};\n"
+    (project / 'script.py').write_text(script)
+    (project / 'webpack.config.js').write_text(config)
+    (project / 'package.json').write_text('{}')
+    assert outline_content(script, 'py') == '' and outline_content(config, 'js') == ''
+
+    dump_path = str(tmp_path / 'dump.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, outline=0)
+    with open(dump_path, encoding='utf-8') as f:
+        dump = f.read()
+    assert "### script.py\n```py\n" + script in dump
+    assert "### webpack.config.js\n```js\n" + config in dump
+    assert ' outline\n' not in dump
@@ -0,0 +1,96 @@
+import json
+import os
+
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import list_files
+from projectdump.packages import find_package_roots, split_packages
+
+
+def make_monorepo(root):
+    for rel_path, content in {
+        'package.json': '{"workspaces": ["services/*"]}',
+        'index.js': "console.log('root');\n",
+        'services/api/pyproject.toml': '[project]\nname = "api"\n',
+        'services/api/app.py': "print('api')\n",
+        'services/api/plugins/auth/setup.py': "from setuptools import setup\n",
+        'services/api/plugins/auth/auth.py': "TOKEN_TTL = 60\n",
+        'services/web/package.json': '{"name": "web"}',
+        'services/web/src/app.js': "export default 1;\n",
+        'node_modules/dep/package.json': '{}',
+    }.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def test_find_package_roots(tmp_path):
+    make_monorepo(tmp_path)
+    assert find_package_roots(str(tmp_path)) == [
+        '', os.path.join('services', 'api'), os.path.join('services', 'api', 'plugins', 'auth'),
+        os.path.join('services', 'web'),
+    ]
+
+
+def test_split_packages_writes_one_dump_per_package(tmp_path):
+    project = tmp_path / 'mono'
+    make_monorepo(project)
+    output_dir = str(project / 'dumps')
+
+    packages, index_path = split_packages(str(project), TEXT_EN, output_dir, workers=2)
+    assert all(ok for _, ok, _, _ in packages)
+    with open(index_path, encoding='utf-8') as f:
+        index = json.load(f)
+    assert [(p['path'], p['dump'], p['files']) for p in index['packages']] == [
+        ('.', '_root.txt', 1),
+        ('services/api', 'services__api.txt', 1),
+        ('services/api/plugins/auth', 'services__api__plugins__auth.txt', 2),
+        ('services/web', 'services__web.txt', 1),
+    ]
+    # Nested packages are only in their own dump
+    assert [rel_path for rel_path, _, _ in list_files(os.path.join(output_dir, 'services__api.txt'))] == ['app.py']
+    assert 'python' in index['packages'][1]['techs']
+
+    # The dumps directory is not picked up by the root package on the next run
+    packages, _ = split_packages(str(project), TEXT_EN, output_dir, workers=1)
+    assert [rel_path for rel_path, _, _ in list_files(os.path.join(output_dir, '_root.txt'))] == ['index.js']
+
+
+def test_dumps_directory_named_like_a_parent_is_pruned(tmp_path):
+    project = tmp_path / 'mono'
+    make_monorepo(project)
+    output_dir = str(project / '..dumps')
+
+    for _ in range(2):
+        split_packages(str(project), TEXT_EN, output_dir, workers=1)
+    # Not even in the root package's tree
+    with open(os.path.join(output_dir, '_root.txt'), encoding='utf-8') as f:
+        assert '..dumps' not in f.read()
+
+
+def test_workspaces_and_root_dumpignore(tmp_path):
+    project = tmp_path / 'mono'
+    for rel_path, content in {
+        'package.json': '{"workspaces": ["packages/*"]}',
+        '.dumpignore': 'big.py\nsvc/fixtures/*\n',
+        'packages/a/package.json': '{"name": "a"}',
+        'packages/a/index.js': "export default 1;\n",
+        'lib/b/package.json': '{"name": "b"}',
+        'lib/b/index.js': "export default 2;\n",
+        'svc/pyproject.toml': '[project]\nname = "svc"\n',
+        'svc/app.py': "print('svc')\n",
+        'svc/big.py': "DATA = 1\n",
+        'svc/fixtures/sample.py': "SAMPLE = 1\n",
+    }.items():
+        path = project / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+    # packages/ and lib/ are excluded from dumps by default, not from the package search
+    assert find_package_roots(str(project)) == [
+        '', os.path.join('lib', 'b'), os.path.join('packages', 'a'), 'svc']
+
+    output_dir = str(project / 'dumps')
+    packages, _ = split_packages(str(project), TEXT_EN, output_dir, workers=1)
+    assert all(ok for _, ok, _, _ in packages)
+    assert [rel_path for rel_path, _, _ in list_files(os.path.join(output_dir, 'packages__a.txt'))] == ['index.js']
+    # The root .dumpignore also applies inside packages
+    assert [rel_path for rel_path, _, _ in list_files(os.path.join(output_dir, 'svc.txt'))] == ['app.py']
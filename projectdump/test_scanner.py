@@ -0,0 +1,101 @@
+import os
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import list_files
+from projectdump.filters import ExcludeMatcher, IncludeMatcher
+from projectdump.scanner import iter_scan_files, scan_project
+from projectdump.tree_generator import generate_tree_from_scan
+
+
+def _make_linked_project(tmp_path):
+    project = tmp_path / 'proj'
+    (project / 'src').mkdir(parents=True)
+    (project / 'src' / 'a.py').write_text("a = 1\n")
+    os.link(project / 'src' / 'a.py', project / 'src' / 'hard.py')
+    os.symlink(project / 'src', project / 'src' / 'loop')
+    os.symlink('src', project / 'alias')
+    return str(project)
+
+
+def test_symlink_loops_terminate_when_following(tmp_path):
+    project_path = _make_linked_project(tmp_path)
+    matcher = ExcludeMatcher(set(), set())
+
+    followed = scan_project(project_path, matcher, follow_symlinks=True)
+    # The src directory keeps its real path, though the 'alias' symlink comes first in tree order
+    assert 'src' in followed
+    assert 'alias' not in followed
+    assert os.path.join('src', 'loop') not in followed
+    assert [rel for _, _, rel, _ in iter_scan_files(project_path, followed)] == [
+        os.path.join('src', 'a.py'), os.path.join('src', 'hard.py'),
+    ]
+
+    not_followed = scan_project(project_path, matcher)
+    assert set(not_followed) == {'', 'src'}
+    assert generate_tree_from_scan(project_path, not_followed) == (
+        "proj/\n├── alias/\n└── src/\n    ├── a.py\n    ├── hard.py\n    └── loop/"
+    )
+    assert [rel for _, _, rel, _ in iter_scan_files(project_path, not_followed)] == [
+        os.path.join('src', 'a.py'), os.path.join('src', 'hard.py'),
+    ]
+
+
+def test_real_path_is_kept_over_a_shallower_symlink(tmp_path):
+    project = tmp_path / 'proj'
+    (project / 'lib' / 'vendor' / 'pkg').mkdir(parents=True)
+    (project / 'lib' / 'vendor' / 'pkg' / 'p.py').write_text("p = 1\n")
+    os.symlink(os.path.join('lib', 'vendor', 'pkg'), project / 'pkg')
+
+    followed = scan_project(str(project), ExcludeMatcher(set(), set()), follow_symlinks=True)
+    assert os.path.join('lib', 'vendor', 'pkg') in followed
+    assert 'pkg' not in followed
+    # A symlink to an excluded directory is still walked
+    followed = scan_project(str(project), ExcludeMatcher({'lib'}, set()), follow_symlinks=True)
+    assert [rel for _, _, rel, _ in iter_scan_files(str(project), followed)] == [os.path.join('pkg', 'p.py')]
+
+
+def test_linked_copies_are_dumped_once(tmp_path):
+    project_path = _make_linked_project(tmp_path)
+    for follow_symlinks in (False, True):
+        assert aggregate_code(project_path, TEXT_EN, output_filename=str(tmp_path / 'dump.txt'),
+                              follow_symlinks=follow_symlinks)
+        assert len(list_files(str(tmp_path / 'dump.txt'))) == 1
+
+
+def test_parallel_scan_matches_serial_scan(tmp_path):
+    project_path = _make_linked_project(tmp_path)
+    for i in range(20):
+        sub = tmp_path / 'proj' / f'pkg{i}' / 'nested'
+        sub.mkdir(parents=True)
+        (sub / 'mod.py').write_text("x = 1\n")
+    matcher = ExcludeMatcher({'pkg3'}, set())
+
+    for follow_symlinks in (False, True):
+        serial = scan_project(project_path, matcher, follow_symlinks=follow_symlinks)
+        parallel = scan_project(project_path, matcher, follow_symlinks=follow_symlinks, workers=8)
+        assert parallel == serial
+    assert 'pkg3' not in serial
+
+
+def test_include_only_walks_requested_subtrees(tmp_path, monkeypatch):
+    project = tmp_path / 'proj'
+    for rel in ('services/payments/api.py', 'services/payments/notes.txt', 'services/billing/b.py',
+                'libs/common/util.py', 'libs/other/o.py', 'build/payments/gen.py', 'README.md'):
+        (project / rel).parent.mkdir(parents=True, exist_ok=True)
+        (project / rel).write_text("x = 1\n")
+    include = IncludeMatcher(['services/payments/**/*.py', 'libs/common', 'README.md'])
+    assert include.roots == ['README.md', os.path.join('libs', 'common'), os.path.join('services', 'payments')]
+
+    listed = []
+    real_scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path='.': listed.append(os.path.relpath(path, project)) or real_scandir(path))
+    scan = scan_project(str(project), ExcludeMatcher({'build', 'libs'}, set()), include=include)
+    assert sorted(listed) == [os.path.join('libs', 'common'), os.path.join('services', 'payments')]
+    assert [rel for _, _, rel, _ in iter_scan_files(str(project), scan)] == [
+        'README.md', os.path.join('libs', 'common', 'util.py'), os.path.join('services', 'payments', 'api.py'),
+    ]
+    assert generate_tree_from_scan(str(project), scan) == (
+        "proj/\n├── README.md\n├── libs/\n│   └── common/\n│       └── util.py\n"
+        "└── services/\n    └── payments/\n        └── api.py"
+    )
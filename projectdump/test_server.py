@@ -0,0 +1,33 @@
+import os
+import threading
+
+from projectdump.server import DumpServer, request_dump
+
+
+def test_server_dumps_with_warm_caches(tmp_path):
+    project = tmp_path / 'proj'
+    project.mkdir()
+    (project / 'main.py').write_text("print('hi')\n")
+    socket_path = str(tmp_path / 'pd.sock')
+
+    server = DumpServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        # Output outside the project so the second scan sees unchanged directories
+        request = {'project_path': str(project), 'output': str(tmp_path / 'dump.txt')}
+        first = request_dump(socket_path, request)
+        second = request_dump(socket_path, request)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert first['ok'] and second['ok']
+    assert 'main.py' in second['messages']
+    cache = server.projects[str(project)]
+    # The second dump reused the directory listing and the file content
+    assert cache.listings.hits >= 1
+    assert cache.listings.name_changes == 1
+    assert str(project / 'main.py') in server.contents.entries
+    assert "print('hi')" in (tmp_path / 'dump.txt').read_text()
+    assert os.stat(socket_path).st_mode & 0o077 == 0
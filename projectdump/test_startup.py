@@ -0,0 +1,66 @@
+import importlib.util
+import os
+import subprocess
+import sys
+
+import pytest
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUILD_SCRIPT = os.path.join(REPO_ROOT, 'tools', 'build_single_file.py')
+
+# Never imported to parse the command line: only the command using them imports them
+HEAVY_MODULES = {
+    'projectdump.aggregator', 'projectdump.cache', 'projectdump.filters', 'projectdump.scanner',
+    'projectdump.packages', 'projectdump.server', 'projectdump.stats', 'projectdump.trigram_index',
+    'projectdump.git_diff', 'ast', 'tokenize', 'concurrent.futures', 'socketserver', 'subprocess',
+}
+
+
+def imported_modules(code):
+    """Modules imported by `python -X importtime -c code`, in a fresh interpreter"""
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], env=env,
+                            capture_output=True, text=True, check=True)
+    return {line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines() if line.startswith('import time:')}
+
+
+def test_cli_import_leaves_the_engine_unloaded():
+    assert not HEAVY_MODULES & imported_modules('import projectdump.cli')
+    assert not {name for name in imported_modules('import projectdump') if name.startswith('projectdump.')}
+    # The stats command shares the filters with the dump, not the dump engine
+    assert 'projectdump.aggregator' not in imported_modules('import projectdump.stats')
+
+
+def test_lazy_package_exports():
+    import projectdump
+    assert projectdump.aggregate_code is aggregate_code
+    with pytest.raises(AttributeError):
+        projectdump.no_such_name
+
+
+@pytest.mark.skipif(not os.path.exists(BUILD_SCRIPT), reason='tools/ is not shipped with the package')
+def test_single_file_build_dumps_like_the_package(tmp_path):
+    spec = importlib.util.spec_from_file_location('build_single_file', BUILD_SCRIPT)
+    build = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(build)
+    script = str(tmp_path / 'projectdump_onefile.py')
+    build.build_single_file(script)
+
+    project = tmp_path / 'proj'
+    (project / 'src').mkdir(parents=True)
+    (project / 'src' / 'app.py').write_text("# entry point\nprint('hello')\n")
+    (project / 'README.md').write_text("# demo\n")
+    expected = str(tmp_path / 'expected.txt')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=expected, strip=frozenset({'comments'}))
+
+    version = subprocess.run([sys.executable, script, '--version'], capture_output=True, text=True, check=True)
+    assert version.stdout.strip() == 'projectdump 1.0.1'
+    # Run outside the repository so only the generated script can provide the package
+    dump = str(tmp_path / 'onefile.txt')
+    subprocess.run([sys.executable, script, str(project), '-o', dump, '--strip', 'comments'], cwd=str(tmp_path),
+                   capture_output=True, check=True)
+    with open(expected, 'rb') as f_expected, open(dump, 'rb') as f_dump:
+        assert f_dump.read() == f_expected.read()
@@ -0,0 +1,37 @@
+import json
+import os
+
+from projectdump.cli import main
+from projectdump.constants import TEXT_EN
+from projectdump.stats import collect_stats, format_stats_table
+
+
+def _make_project(tmp_path):
+    project = tmp_path / 'proj'
+    (project / 'pkg').mkdir(parents=True)
+    (project / 'pkg' / 'big.py').write_text("x = 1\n" * 100)
+    (project / 'main.py').write_text("print('hi')")  # no trailing newline
+    (project / 'api_pb2.py').write_text("# generated\n")
+    (project / 'notes.txt').write_text("not a python file\n")
+    return str(project)
+
+
+def test_stats_counts_what_a_dump_would_contain(tmp_path):
+    report = collect_stats(_make_project(tmp_path), top=1)
+    assert report['techs'] == ['python']
+    assert report['extensions'] == [
+        {'extension': '.py', 'files': 2, 'bytes': 611, 'lines': 101, 'tokens': 150 + 2, 'techs': ['python']},
+    ]
+    assert report['total'] == {'files': 2, 'bytes': 611, 'lines': 101, 'tokens': 152}
+    assert report['largest'] == [{'path': os.path.join('pkg', 'big.py'), 'bytes': 600, 'lines': 100}]
+    assert report['skipped'] == {'generated': 1, 'large': 0, 'duplicates': 0}
+
+    table = format_stats_table(report, TEXT_EN)
+    assert '.py            2    611    101      152  python' in table
+
+
+def test_stats_subcommand_prints_json(tmp_path, capsys):
+    project_path = _make_project(tmp_path)
+    assert main(['stats', project_path, '--json', '--generated', 'keep']) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report['total']['files'] == 3
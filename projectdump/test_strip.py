@@ -0,0 +1,73 @@
+from projectdump.strip import parse_strip_options, strip_content
+
+ALL = frozenset({'comments', 'blank', 'docstrings'})
+
+
+def test_python_comments_docstrings_and_blank_lines():
+    source = (
+        '#!/usr/bin/env python\n'
+        '"""Module doc."""\n'
+        'import os  # trailing\n'
+        '\n'
+        '# full line comment\n'
+        'def f():\n'
+        '    """Only statement, kept so the body stays valid."""\n'
+        '\n'
+        'def g():\n'
+        '    """Removed."""\n'
+        '    s = """keep # this\n'
+        '\n'
+        'and this blank line"""\n'
+        '    return s\n'
+    )
+    expected = (
+        '#!/usr/bin/env python\n'
+        'import os\n'
+        'def f():\n'
+        '    """Only statement, kept so the body stays valid."""\n'
+        'def g():\n'
+        '    s = """keep # this\n'
+        '\n'
+        'and this blank line"""\n'
+        '    return s\n'
+    )
+    assert strip_content(source, 'py', ALL) == expected
+    compile(strip_content(source, 'py', ALL), 'x.py', 'exec')
+
+
+def test_c_style_comments_keep_strings():
+    source = (
+        '/**\n'
+        ' * Header\n'
+        ' */\n'
+        'const url = "http://example.com"; // trailing\n'
+        "const s = '/* not a comment */';\n"
+        'let x = a /* inline */ + b;\n'
+    )
+    assert strip_content(source, 'js', frozenset({'comments'})) == (
+        'const url = "http://example.com";\n'
+        "const s = '/* not a comment */';\n"
+        'let x = a  + b;\n'
+    )
+
+
+def test_hash_comments_for_shell_and_yaml():
+    shell = '#!/bin/sh\n# comment\necho "$#" ${#x} # count\n'
+    assert strip_content(shell, 'sh', frozenset({'comments'})) == '#!/bin/sh\necho "$#" ${#x}\n'
+
+    yaml = 'url: http://host/#frag\n\n\nkey: "a # b"  # note\n'
+    assert strip_content(yaml, 'yml', frozenset({'comments', 'blank'})) == 'url: http://host/#frag\nkey: "a # b"\n'
+
+
+def test_unknown_language_only_loses_blank_lines():
+    assert strip_content('a // b\n\n# c\n', 'txt', ALL) == 'a // b\n# c\n'
+
+
+def test_parse_strip_options():
+    assert parse_strip_options('comments, blank') == {'comments', 'blank'}
+    try:
+        parse_strip_options('comments,bogus')
+    except ValueError as e:
+        assert 'bogus' in str(e)
+    else:
+        raise AssertionError("unknown option accepted")
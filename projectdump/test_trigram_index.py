@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+from projectdump.aggregator import aggregate_code
+from projectdump.constants import TEXT_EN
+from projectdump.dump_index import DumpIndexError
+from projectdump.trigram_index import build_trigram_index, grep_dump, load_trigram_index, required_trigrams
+
+
+def _trigram(text):
+    a, b, c = text.encode('utf-8')
+    return a << 16 | b << 8 | c
+
+
+def test_required_trigrams_only_come_from_mandatory_literals():
+    assert required_trigrams('abcd') == {_trigram('abc'), _trigram('bcd')}
+    assert required_trigrams(r'ab\wcd') == set()
+    assert required_trigrams('(?:xyz)?abc|def') == set()
+    assert required_trigrams('(?:xyz)+') == {_trigram('xyz')}
+    assert required_trigrams('^Abc$') == {_trigram('abc')}
+    # 'k' and 'i' also match non-ASCII letters (KELVIN SIGN, dotted I) when ignoring case
+    assert required_trigrams('(?i)kelvin') == {_trigram('elv')}
+
+
+@pytest.mark.parametrize('output_format', ['text', 'jsonl'])
+def test_grep_with_index_matches_full_scan(tmp_path, output_format):
+    project = tmp_path / 'proj'
+    (project / 'pkg').mkdir(parents=True)
+    (project / 'pkg' / 'handlers.py').write_text("def order_handler():\n    pass\n\ndef Payment_Handler():\n    pass\n")
+    (project / 'main.py').write_text("from pkg.handlers import order_handler\norder_handler()\n")
+    dump_path = str(tmp_path / 'dump.out')
+    assert aggregate_code(str(project), TEXT_EN, output_filename=dump_path, output_format=output_format)
+
+    with pytest.raises(DumpIndexError):
+        list(grep_dump(dump_path, 'handler'))
+    assert build_trigram_index(dump_path)[1:] == (2, len(load_trigram_index(dump_path).keys))
+
+    for pattern, ignore_case in (('order_handler', False), (r'def \w+_handler', True), ('missing', False)):
+        with_index = list(grep_dump(dump_path, pattern, ignore_case))
+        assert with_index == list(grep_dump(dump_path, pattern, ignore_case, use_index=False))
+    assert list(grep_dump(dump_path, r'def \w+_handler', ignore_case=True)) == [
+        (os.path.join('pkg', 'handlers.py'), 1, 'def order_handler():'),
+        (os.path.join('pkg', 'handlers.py'), 4, 'def Payment_Handler():'),
+    ]
+
+    with open(dump_path, 'a') as f:
+        f.write("\n")
+    with pytest.raises(DumpIndexError):
+        load_trigram_index(dump_path)
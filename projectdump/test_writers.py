@@ -0,0 +1,53 @@
+import io
+import json
+
+from projectdump.writers import TEXT_SIGNATURE, TextDumpWriter, JsonlDumpWriter
+
+
+def test_text_writer_matches_joined_lines():
+    out = io.BytesIO()
+    writer = TextDumpWriter(out)
+    writer.write_header('/proj', ['python'], 'proj/\n└── a.py')
+    offset, length, _, _ = writer.write_file('a.py', 'py', 'print("é")\n')
+
+    expected_lines = [
+        TEXT_SIGNATURE, "# " + "=" * 50, "# Path: /proj", "# Detected tech: python", "# " + "=" * 50, "",
+        "## DIRECTORY STRUCTURE", "```", "proj/\n└── a.py", "```", "",
+        "## FILE CONTENTS", "",
+        "### a.py", "```py", 'print("é")\n', "```", "",
+    ]
+    expected = '\n'.join(expected_lines)
+    assert out.getvalue() == expected.encode('utf-8')
+    assert writer.char_count == len(expected)
+    assert writer.line_count == len(expected.splitlines())
+    assert out.getvalue()[offset:offset + length] == 'print("é")\n'.encode('utf-8')
+
+
+def test_jsonl_writer_records_and_offsets():
+    out = io.BytesIO()
+    writer = JsonlDumpWriter(out)
+    writer.write_header('/proj', ['python'], 'proj/')
+    content = "s = '''\n```\n'''\n"
+    offset, length, size, sha256 = writer.write_file('a.py', 'py', content)
+
+    data = out.getvalue()
+    lines = data.decode('utf-8').splitlines()
+    assert len(lines) == 2
+    record = json.loads(data[offset:offset + length])
+    assert record['path'] == 'a.py'
+    assert record['offset'] == offset
+    assert record['content'] == content
+    assert record['size'] == size == len(content.encode('utf-8'))
+    assert record['sha256'] == sha256
+
+
+def test_section_size_predicts_written_bytes():
+    for writer_class in (TextDumpWriter, JsonlDumpWriter):
+        out = io.BytesIO()
+        writer = writer_class(out)
+        writer.write_header('/proj', [], 'proj/')
+        for rel_path, content in (('a.py', 'x = "é\\t"\n'), ('dir/b.md', ''), ('c', 'no newline')):
+            expected = writer.section_size(rel_path, 'py', content)
+            before = len(out.getvalue())
+            writer.write_file(rel_path, 'py', content)
+            assert len(out.getvalue()) - before == expected
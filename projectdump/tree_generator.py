@@ -1,42 +1,58 @@
 import os
-from .filters import should_exclude_path, should_exclude_file # Import the filter functions
+from .filters import ExcludeMatcher
+from .scanner import scan_project
 
 def generate_directory_tree(project_path_root: str, exclude_dir_patterns: set, exclude_file_patterns: set):
+    scan = scan_project(project_path_root, ExcludeMatcher(exclude_dir_patterns, exclude_file_patterns))
+    return generate_tree_from_scan(project_path_root, scan)
+
+def generate_tree_from_scan(project_path_root: str, scan):
+    """Render the tree of a scanner.scan_project result (exclusions are already applied)"""
     tree_lines = [f"{os.path.basename(project_path_root.rstrip(os.sep))}/"]
-    _build_tree_recursive(project_path_root, "", tree_lines, project_path_root, exclude_dir_patterns, exclude_file_patterns, True)
+    _build_tree_recursive(scan, "", "", tree_lines)
     return "\n".join(tree_lines)
 
-def _build_tree_recursive(current_path, prefix, tree_lines, project_root, exclude_dirs, exclude_files, is_last_call_for_level):
-    try:
-        items = sorted(os.listdir(current_path))
-    except PermissionError:
+def _build_tree_recursive(scan, rel_dir, prefix, tree_lines):
+    renderable_entries = scan.get(rel_dir)
+    if renderable_entries is None:
         tree_lines.append(f"{prefix}└── [Permission Denied]") # Or use a generic prefix
         return
 
-    # Filter and collect items to render
-    renderable_entries = []
-    for name in items:
-        full_item_path = os.path.join(current_path, name)
-        relative_item_path = os.path.relpath(full_item_path, project_root)
-        
-        is_dir = os.path.isdir(full_item_path)
-        if is_dir:
-            if not should_exclude_path(relative_item_path, exclude_dirs):
-                renderable_entries.append({'name': name, 'is_dir': True, 'path': full_item_path})
-        elif os.path.isfile(full_item_path):
-             if not should_exclude_file(name, relative_item_path, exclude_files):
-                renderable_entries.append({'name': name, 'is_dir': False, 'path': full_item_path})
-    
     for i, entry in enumerate(renderable_entries):
         is_last_entry = (i == len(renderable_entries) - 1)
-        
+
         connector = "└── " if is_last_entry else "├── "
-        line = f"{prefix}{connector}{entry['name']}"
-        
-        if entry['is_dir']:
+        line = f"{prefix}{connector}{entry.name}"
+
+        if entry.is_dir:
             line += "/"
         tree_lines.append(line)
-        
-        if entry['is_dir']:
+
+        child_rel_dir = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+        if entry.is_dir and child_rel_dir in scan:
             new_prefix = prefix + ("    " if is_last_entry else "│   ")
-            _build_tree_recursive(entry['path'], new_prefix, tree_lines, project_root, exclude_dirs, exclude_files, is_last_entry)
\ No newline at end of file
+            _build_tree_recursive(scan, child_rel_dir, new_prefix, tree_lines)
+
+def generate_tree_from_paths(project_path_root: str, rel_paths):
+    """Render a tree that only contains the given files and their ancestor directories"""
+    root_node = {}
+    for rel_path in rel_paths:
+        node = root_node
+        parts = rel_path.replace(os.sep, "/").split("/")
+        for part in parts[:-1]:
+            node = node.setdefault(part + "/", {})
+        node.setdefault(parts[-1], None)
+
+    tree_lines = [f"{os.path.basename(project_path_root.rstrip(os.sep))}/"]
+    _render_path_tree(root_node, "", tree_lines)
+    return "\n".join(tree_lines)
+
+def _render_path_tree(node, prefix, tree_lines):
+    # Directory keys carry a trailing "/" so sorting matches the os.listdir order used above
+    names = sorted(node, key=lambda n: n.rstrip("/"))
+    for i, name in enumerate(names):
+        is_last_entry = (i == len(names) - 1)
+        connector = "└── " if is_last_entry else "├── "
+        tree_lines.append(f"{prefix}{connector}{name}")
+        if node[name] is not None:
+            _render_path_tree(node[name], prefix + ("    " if is_last_entry else "│   "), tree_lines)
@@ -0,0 +1,201 @@
+import mmap
+import os
+import re
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+
+try:
+    from re import _constants as sre_constants, _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants
+    import sre_parse
+
+from projectdump.dump_index import DumpIndexError, iter_file_contents, load_index
+
+TRIGRAM_SUFFIX = '.tri'
+
+# Header: magic, byte order, dump size, file count, trigram count, posting count, path blob length
+# (padded to 8 bytes so the columns that follow stay aligned)
+_MAGIC = b'PDTRI001'
+_HEADER = struct.Struct('<8sB7xQQQQQ')
+_BYTEORDER = 0 if sys.byteorder == 'little' else 1
+
+# ASCII letters that also match non-ASCII characters under re.IGNORECASE (KELVIN SIGN, long s, dotted I...)
+_UNSAFE_IGNORECASE = set('IKSiks')
+
+_REPEATS = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+if hasattr(sre_constants, 'POSSESSIVE_REPEAT'):
+    _REPEATS.add(sre_constants.POSSESSIVE_REPEAT)
+
+
+def trigram_path_for(dump_path):
+    """Return the trigram index path of a dump (dump path + '.tri')"""
+    return dump_path + TRIGRAM_SUFFIX
+
+
+def _trigrams(data):
+    """Distinct trigrams of ASCII-lowercased bytes, as 24-bit integers"""
+    data = data.lower()
+    return {a << 16 | b << 8 | c for a, b, c in set(zip(data, data[1:], data[2:]))}
+
+
+def build_trigram_index(dump_path):
+    """
+    Write the trigram posting index of a dump: for every trigram of the (ASCII
+    lowercased) file contents, the sorted ids of the files containing it.
+    Stored as three arrays (posting offsets, sorted trigrams, file ids) that are
+    memory-mapped as is when loaded. Returns (index path, file count, trigram count).
+    """
+    index = load_index(dump_path)
+    paths = []
+    postings = {}  # trigram -> [file ids]
+    for file_id, (rel_path, content) in enumerate(iter_file_contents(dump_path, index)):
+        paths.append(rel_path)
+        for trigram in _trigrams(content.encode('utf-8')):
+            postings.setdefault(trigram, []).append(file_id)
+
+    keys = array('I', sorted(postings))
+    offsets = array('Q', [0])
+    file_ids = array('I')
+    for trigram in keys:
+        file_ids.extend(postings[trigram])
+        offsets.append(len(file_ids))
+    blob = '\0'.join(paths).encode('utf-8', errors='surrogateescape')
+
+    tri_path = trigram_path_for(dump_path)
+    tmp_path = tri_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(_MAGIC, _BYTEORDER, index['dump_size'], len(paths), len(keys), len(file_ids), len(blob)))
+        for column in (offsets, keys, file_ids):
+            column.tofile(f)
+        f.write(blob)
+    os.replace(tmp_path, tri_path)
+    return tri_path, len(paths), len(keys)
+
+
+class TrigramIndex:
+    """
+    A loaded trigram index, answering which files may contain a set of trigrams.
+    keys/offsets/file_ids are views on the mapped file, only the postings looked up are read.
+    """
+
+    def __init__(self, paths, keys, offsets, file_ids):
+        self.paths = paths
+        self.keys = keys
+        self.offsets = offsets
+        self.file_ids = file_ids
+
+    def candidates(self, trigrams):
+        """Paths of the files containing every trigram (all paths if trigrams is empty)"""
+        result = None
+        # Rarest trigram first, so the intersection shrinks as fast as possible
+        for start, end in sorted(self._posting_ranges(trigrams), key=lambda r: r[1] - r[0]):
+            ids = set(self.file_ids[start:end])
+            result = ids if result is None else result & ids
+            if not result:
+                return []
+        if result is None:
+            return list(self.paths)
+        return [self.paths[file_id] for file_id in sorted(result)]
+
+    def _posting_ranges(self, trigrams):
+        for trigram in trigrams:
+            i = bisect_left(self.keys, trigram)
+            if i == len(self.keys) or self.keys[i] != trigram:
+                yield 0, 0
+            else:
+                yield self.offsets[i], self.offsets[i + 1]
+
+
+def load_trigram_index(dump_path):
+    """Map the trigram index of dump_path, raising DumpIndexError if it is missing or stale"""
+    tri_path = trigram_path_for(dump_path)
+    try:
+        with open(tri_path, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except FileNotFoundError:
+        raise DumpIndexError(f"No trigram index found for {dump_path} (run `projectdump index {dump_path}`)")
+    except ValueError:
+        raise DumpIndexError(f"Invalid trigram index {tri_path}")
+
+    try:
+        magic, byteorder, dump_size, file_count, key_count, posting_count, blob_len = _HEADER.unpack_from(data)
+    except struct.error:
+        raise DumpIndexError(f"Invalid trigram index {tri_path}")
+    if magic != _MAGIC or byteorder != _BYTEORDER:
+        raise DumpIndexError(f"Unsupported trigram index {tri_path}")
+    if dump_size != os.path.getsize(dump_path):
+        raise DumpIndexError(f"Trigram index {tri_path} is stale, run `projectdump index {dump_path}`")
+
+    view = memoryview(data)
+    pos = _HEADER.size
+    columns = []
+    for typecode, count in (('Q', key_count + 1), ('I', key_count), ('I', posting_count)):
+        end = pos + struct.calcsize(typecode) * count
+        if end > len(data):
+            raise DumpIndexError(f"Truncated trigram index {tri_path}")
+        columns.append(view[pos:end].cast(typecode))
+        pos = end
+    offsets, keys, file_ids = columns
+    paths = bytes(view[pos:pos + blob_len]).decode('utf-8', errors='surrogateescape').split('\0') if file_count else []
+    return TrigramIndex(paths, keys, offsets, file_ids)
+
+
+def required_trigrams(pattern, flags=0):
+    """
+    Trigrams that every match of the regex pattern must contain: those of the literal
+    runs of its top-level sequence (and of groups/repeats that must match at least once).
+    Alternations, classes and optional parts contribute nothing, so the result is
+    always safe to intersect on, just less selective for complex patterns.
+    """
+    parsed = sre_parse.parse(pattern, flags)
+    runs = []
+    _collect_literal_runs(parsed, bool(parsed.state.flags & re.IGNORECASE), runs)
+    trigrams = set()
+    for run in runs:
+        trigrams |= _trigrams(run.encode('utf-8'))
+    return trigrams
+
+
+def _collect_literal_runs(parsed, ignore_case, runs):
+    run = []
+    for op, av in parsed:
+        if op == sre_constants.LITERAL:
+            char = chr(av)
+            if ignore_case and (char in _UNSAFE_IGNORECASE or not char.isascii()):
+                runs.append(''.join(run))
+                run = []
+            else:
+                run.append(char)
+            continue
+        if op == sre_constants.AT:
+            continue  # anchors match no characters, the run goes on
+        runs.append(''.join(run))
+        run = []
+        if op == sre_constants.SUBPATTERN:
+            add_flags, del_flags = av[1], av[2]
+            sub_ignore_case = (ignore_case or bool(add_flags & re.IGNORECASE)) and not del_flags & re.IGNORECASE
+            _collect_literal_runs(av[3], sub_ignore_case, runs)
+        elif op in _REPEATS and av[0] >= 1:
+            _collect_literal_runs(av[2], ignore_case, runs)
+    runs.append(''.join(run))
+
+
+def grep_dump(dump_path, pattern, ignore_case=False, use_index=True):
+    """
+    Yield (rel_path, line_number, line) for every line of the dumped files matching the
+    regex pattern. With a trigram index only the files that can match are read.
+    """
+    flags = re.IGNORECASE if ignore_case else 0
+    regex = re.compile(pattern, flags)
+    index = load_index(dump_path)
+    rel_paths = None
+    if use_index:
+        rel_paths = load_trigram_index(dump_path).candidates(required_trigrams(pattern, flags))
+
+    for rel_path, content in iter_file_contents(dump_path, index, rel_paths):
+        for line_number, line in enumerate(content.splitlines(), 1):
+            if regex.search(line):
+                yield rel_path, line_number, line
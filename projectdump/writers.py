@@ -0,0 +1,230 @@
+import hashlib
+import json
+
+# Output formats accepted by aggregate_code / --format
+OUTPUT_FORMATS = ('text', 'jsonl')
+
+# Info string word after the language of outlined sections (```py outline), the
+# JSONL records of outlined files have "outline": true
+OUTLINE_MARK = 'outline'
+
+# First line of every text dump and generator of every JSONL header record, so a dump
+# left in a project is recognized (and skipped) by the next run
+TEXT_SIGNATURE = "# SOURCE CODE DUMP (projectdump)"
+DUMP_GENERATOR = 'projectdump'
+
+
+class _StreamingWriter:
+    """Checkpoint support shared by the writers: their state is their counters"""
+
+    def checkpoint_state(self):
+        """Counters needed to go on writing once the dump is truncated back to self.offset"""
+        return {key: value for key, value in vars(self).items() if key != 'f'}
+
+    def restore_state(self, state):
+        vars(self).update(state)
+
+
+class TextDumpWriter(_StreamingWriter):
+    """
+    Streams the classic markdown-like dump (`### path` + fenced block) to a binary file.
+    The output is byte for byte what joining all the lines with '\\n' used to produce,
+    but nothing is buffered beyond the current file.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.offset = 0       # bytes written so far
+        self.char_count = 0   # characters written so far
+        self.newline_count = 0
+        self._first_line = True
+        self._ends_with_newline = False
+
+    def _write_line(self, line, data=None):
+        # Lines are separated (not terminated) by '\n', exactly like '\n'.join(lines)
+        if not self._first_line:
+            self.f.write(b'\n')
+            self._count('\n', 1)
+        self._first_line = False
+        if data is None:
+            data = line.encode('utf-8')
+        self.f.write(data)
+        self._count(line, len(data))
+
+    def _count(self, line, nbytes):
+        self.offset += nbytes
+        self.char_count += len(line)
+        self.newline_count += line.count('\n')
+        if line:
+            self._ends_with_newline = line.endswith('\n')
+
+    def write_header(self, project_path, detected_techs, tree):
+        self._write_line(TEXT_SIGNATURE)
+        self._write_line("# " + "="*50)
+        self._write_line(f"# Path: {project_path}")
+        self._write_line(f"# Detected tech: {', '.join(detected_techs) if detected_techs else 'Unknown'}")
+        self._write_line("# " + "="*50)
+        self._write_line("")
+        self._write_line("## DIRECTORY STRUCTURE")
+        self._write_line("```")
+        self._write_line(tree)
+        self._write_line("```")
+        self._write_line("")
+        self._write_line("## FILE CONTENTS")
+        self._write_line("")
+
+    def write_file(self, rel_path, lang_hint, content, outline=False):
+        """
+        Write one file section and return its index entry (offset, length, size, sha256),
+        offset/length locating the raw content bytes inside the dump.
+        outline marks content that is an outline of the file (outline.outline_content).
+        """
+        data = content.encode('utf-8')
+        self._write_line(f"### {rel_path}")
+        self._write_line(self._fence(lang_hint, outline))
+        start = self.offset + (0 if self._first_line else 1)
+        self._write_line(content, data)
+        self._write_line("```")
+        self._write_line("")
+        return start, len(data), len(data), hashlib.sha256(data).hexdigest()
+
+    def section_size(self, rel_path, lang_hint, content, outline=False):
+        """Number of bytes write_file would add to the dump, without writing anything"""
+        separator = 0 if self._first_line else 1
+        return (separator + len(f"### {rel_path}".encode('utf-8')) + 1
+                + len(self._fence(lang_hint, outline).encode('utf-8'))
+                + 1 + len(content.encode('utf-8')) + 1 + len("```") + 1)
+
+    @staticmethod
+    def _fence(lang_hint, outline):
+        return "```" + lang_hint + (" " + OUTLINE_MARK if outline else "")
+
+    def write_error(self, rel_path, error):
+        for line in self._note_lines(rel_path, f"Error reading file: {error}"):
+            self._write_line(line)
+
+    def error_size(self, rel_path, error):
+        """Number of bytes write_error would add to the dump"""
+        return self._lines_size(self._note_lines(rel_path, f"Error reading file: {error}"))
+
+    def write_skipped(self, rel_path, reason):
+        for line in self._note_lines(rel_path, f"Skipped: {reason}"):
+            self._write_line(line)
+
+    def skipped_size(self, rel_path, reason):
+        """Number of bytes write_skipped would add to the dump"""
+        return self._lines_size(self._note_lines(rel_path, f"Skipped: {reason}"))
+
+    @staticmethod
+    def _note_lines(rel_path, note):
+        return [f"### {rel_path}", f"```\n# {note}\n```", ""]
+
+    def _lines_size(self, lines):
+        separator = 0 if self._first_line else 1
+        return separator + sum(len(line.encode('utf-8')) for line in lines) + len(lines) - 1
+
+    @property
+    def line_count(self):
+        # Same as len(content.splitlines()) for '\n' separated output
+        if self._first_line or self._ends_with_newline:
+            return self.newline_count
+        return self.newline_count + 1
+
+
+class JsonlDumpWriter(_StreamingWriter):
+    """
+    Streams one JSON object per line: a header record with the project info and tree,
+    then one record per file. Records never span lines, so a dump can be split on
+    '\\n' and loaded in parallel without any markdown parsing.
+    """
+
+    def __init__(self, f):
+        self.f = f
+        self.offset = 0
+        self.char_count = 0
+        self.line_count = 0
+
+    def _write_record(self, record):
+        line = json.dumps(record, ensure_ascii=False) + '\n'
+        data = line.encode('utf-8')
+        self.f.write(data)
+        self.offset += len(data)
+        self.char_count += len(line)
+        self.line_count += 1
+        return len(data)
+
+    def write_header(self, project_path, detected_techs, tree):
+        self._write_record({
+            'type': 'header',
+            'generator': DUMP_GENERATOR,
+            'path': project_path,
+            'techs': list(detected_techs),
+            'tree': tree,
+        })
+
+    def write_file(self, rel_path, lang_hint, content, outline=False):
+        """
+        Write one file record and return its index entry (offset, length, size, sha256),
+        offset/length locating the whole JSON record inside the dump.
+        outline marks content that is an outline of the file (outline.outline_content).
+        """
+        start = self.offset
+        data = content.encode('utf-8')
+        sha256 = hashlib.sha256(data).hexdigest()
+        length = self._write_record(self._file_record(start, rel_path, lang_hint, content, data, sha256, outline))
+        return start, length, len(data), sha256
+
+    def section_size(self, rel_path, lang_hint, content, outline=False):
+        """Number of bytes write_file would add to the dump, without writing anything"""
+        data = content.encode('utf-8')
+        return self._record_size(self._file_record(self.offset, rel_path, lang_hint, content, data, '0' * 64, outline))
+
+    @staticmethod
+    def _file_record(start, rel_path, lang_hint, content, data, sha256, outline):
+        record = {
+            'type': 'file',
+            'path': rel_path,
+            'offset': start,  # byte offset of this record in the dump
+            'lang': lang_hint,
+            'size': len(data),
+            'sha256': sha256,
+            'content': content,
+        }
+        if outline:
+            record[OUTLINE_MARK] = True
+        return record
+
+    def write_error(self, rel_path, error):
+        self._write_record(self._error_record(rel_path, error))
+
+    def error_size(self, rel_path, error):
+        """Number of bytes write_error would add to the dump"""
+        return self._record_size(self._error_record(rel_path, error))
+
+    def write_skipped(self, rel_path, reason):
+        self._write_record(self._skipped_record(rel_path, reason))
+
+    def skipped_size(self, rel_path, reason):
+        """Number of bytes write_skipped would add to the dump"""
+        return self._record_size(self._skipped_record(rel_path, reason))
+
+    @staticmethod
+    def _error_record(rel_path, error):
+        return {'type': 'error', 'path': rel_path, 'error': str(error)}
+
+    @staticmethod
+    def _skipped_record(rel_path, reason):
+        return {'type': 'skipped', 'path': rel_path, 'reason': reason}
+
+    @staticmethod
+    def _record_size(record):
+        return len((json.dumps(record, ensure_ascii=False) + '\n').encode('utf-8'))
+
+
+def create_writer(output_format, f):
+    """Return the dump writer for output_format, streaming into the binary file f"""
+    if output_format == 'jsonl':
+        return JsonlDumpWriter(f)
+    if output_format == 'text':
+        return TextDumpWriter(f)
+    raise ValueError(f"Unknown output format: {output_format}")
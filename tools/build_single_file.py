@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Generate the single-file build of projectdump from the package.
+
+  python tools/build_single_file.py                      # writes dist/projectdump_onefile.py
+  python tools/build_single_file.py -o /tmp/projectdump.py
+  python tools/build_single_file.py --hidden-imports     # stdlib modules, for PyInstaller
+
+The script holds every module of the package (tests left out), as source and as code
+compiled by the generating interpreter, and imports them from memory on demand exactly
+like the installed package: same engine, same messages, same lazy imports. On another
+Python version the modules are compiled from their source instead.
+
+`build.sh` builds the PyInstaller binary from it. Modules imported from memory are
+invisible to PyInstaller's analysis, hence --hidden-imports.
+"""
+import argparse
+import ast
+import binascii
+import marshal
+import os
+import sys
+import zlib
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = 'projectdump'
+DEFAULT_OUTPUT = os.path.join('dist', 'projectdump_onefile.py')
+
+TEMPLATE = '''#!/usr/bin/env python3
+# projectdump {version} single-file build, generated by tools/build_single_file.py.
+# Do not edit: change the package and generate it again.
+import binascii
+import marshal
+import sys
+import zlib
+from importlib.machinery import ModuleSpec
+
+# Bytecode version of the interpreter that generated this file (its .pyc cache tag)
+_CACHE_TAG = {cache_tag!r}
+# Marshalled dicts of module name -> zlib compressed code object / source, in base64:
+# one long string literal is much faster for Python to compile than the escaped bytes
+_CODE_PAYLOAD = {code_payload!r}
+_SOURCE_PAYLOAD = {source_payload!r}
+
+_CODE = marshal.loads(binascii.a2b_base64(_CODE_PAYLOAD))
+_sources = None
+
+
+def _get_source(fullname):
+    global _sources
+    if _sources is None:
+        _sources = marshal.loads(binascii.a2b_base64(_SOURCE_PAYLOAD))
+    return zlib.decompress(_sources[fullname]).decode('utf-8')
+
+
+def _module_filename(fullname):
+    name = '__init__' if fullname == {package!r} else fullname.rpartition('.')[2]
+    return {filename_prefix!r} + name + '.py'
+
+
+class _SingleFileImporter:
+    """Finder and loader of the projectdump modules stored in this file"""
+
+    def find_spec(self, fullname, path=None, target=None):
+        if fullname not in _CODE:
+            return None
+        return ModuleSpec(fullname, self, origin=_module_filename(fullname), is_package=fullname == {package!r})
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        if sys.implementation.cache_tag == _CACHE_TAG:
+            code = marshal.loads(zlib.decompress(_CODE[module.__name__]))
+        else:
+            # Another Python version: compile the source (on every run, there is no cache)
+            code = compile(_get_source(module.__name__), _module_filename(module.__name__), 'exec',
+                           dont_inherit=True)
+        exec(code, module.__dict__)
+
+    def get_source(self, fullname):
+        # Lets linecache (tracebacks) find the lines of modules that are not on disk
+        return _get_source(fullname)
+
+
+if not any(isinstance(finder, _SingleFileImporter) for finder in sys.meta_path):
+    sys.meta_path.insert(0, _SingleFileImporter())
+
+if __name__ == '__main__':
+    if getattr(sys, 'frozen', False):
+        # --split-packages worker processes of the PyInstaller binary
+        import multiprocessing
+        multiprocessing.freeze_support()
+    from projectdump.cli import main
+    sys.exit(main())
+'''
+
+
+def package_modules(package_dir):
+    """(module name, source) of the package modules, tests and pytest hooks left out"""
+    modules = []
+    for filename in sorted(os.listdir(package_dir)):
+        stem, ext = os.path.splitext(filename)
+        if ext != '.py' or stem.startswith('test_') or stem == 'conftest':
+            continue
+        with open(os.path.join(package_dir, filename), 'r', encoding='utf-8') as f:
+            source = f.read()
+        modules.append((PACKAGE if stem == '__init__' else f'{PACKAGE}.{stem}', source))
+    return modules
+
+
+def stdlib_imports(modules):
+    """Top level names of the modules imported by the package, projectdump itself excluded"""
+    names = set()
+    for module_name, source in modules:
+        for node in ast.walk(ast.parse(source, module_name)):
+            if isinstance(node, ast.Import):
+                names.update(alias.name for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and not node.level:
+                names.add(node.module)
+    return sorted(name for name in names if name.split('.')[0] != PACKAGE)
+
+
+def package_version(modules):
+    for node in ast.parse(dict(modules)[PACKAGE]).body:
+        if isinstance(node, ast.Assign) and any(getattr(t, 'id', None) == '__version__' for t in node.targets):
+            return ast.literal_eval(node.value)
+    return 'unknown'
+
+
+def _base64(data):
+    return binascii.b2a_base64(data, newline=False).decode('ascii')
+
+
+def build_single_file(output_path, package_dir=os.path.join(ROOT, PACKAGE)):
+    """Write the single-file build to output_path, returning the number of modules it holds"""
+    modules = package_modules(package_dir)
+    # Code objects keep the file name they are compiled with: a path that doesn't exist,
+    # named after the script, so tracebacks read the lines from get_source
+    filename_prefix = f'<{os.path.basename(output_path)}>/{PACKAGE}/'
+    codes, sources = {}, {}
+    for module_name, source in modules:
+        name = '__init__' if module_name == PACKAGE else module_name.rpartition('.')[2]
+        code = compile(source, filename_prefix + name + '.py', 'exec', dont_inherit=True)
+        codes[module_name] = zlib.compress(marshal.dumps(code), 9)
+        sources[module_name] = zlib.compress(source.encode('utf-8'), 9)
+    content = TEMPLATE.format(version=package_version(modules), cache_tag=sys.implementation.cache_tag, package=PACKAGE,
+                              code_payload=_base64(marshal.dumps(codes)),
+                              source_payload=_base64(marshal.dumps(sources)), filename_prefix=filename_prefix)
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='\n') as f:
+        f.write(content)
+    os.chmod(tmp_path, 0o755)
+    os.replace(tmp_path, output_path)
+    return len(modules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('-o', '--output', default=os.path.join(ROOT, DEFAULT_OUTPUT),
+                        help=f'Path of the generated script (default: {DEFAULT_OUTPUT})')
+    parser.add_argument('--hidden-imports', action='store_true',
+                        help='Print the modules imported by the package, one per line, instead of building')
+    args = parser.parse_args()
+
+    if args.hidden_imports:
+        print('\n'.join(stdlib_imports(package_modules(os.path.join(ROOT, PACKAGE)))))
+        return 0
+    count = build_single_file(args.output)
+    print(f"Wrote {args.output} ({count} modules)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())